@@ -0,0 +1,31 @@
+"""
+Chooses the graphics backend used by the Board classes.  Set the
+BOGGLE_BACKEND environment variable before the first import to pick one:
+
+    tk        graphics.py, with the batching GraphWin from tkbackend.py
+              (needs a display)
+    headless  headless.py (no window; see that module)
+    auto      tk if a display is available, otherwise headless (default)
+
+The chosen module's names (GraphWin, Point, Text, Rectangle, ...) are
+re-exported, so `from backend import *` replaces `from graphics import *`.
+"""
+
+import os
+
+BACKEND = os.environ.get('BOGGLE_BACKEND', 'auto')
+
+if BACKEND == 'headless':
+    from headless import *
+elif BACKEND == 'tk':
+    from tkbackend import *
+elif BACKEND == 'auto':
+    try:
+        from tkbackend import *
+        BACKEND = 'tk'
+    except Exception:
+        # no tkinter, or no display to open the Tk root on
+        from headless import *
+        BACKEND = 'headless'
+else:
+    raise ImportError("unknown BOGGLE_BACKEND {!r}".format(BACKEND))
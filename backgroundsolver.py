@@ -0,0 +1,104 @@
+"""
+Solves boards on a worker thread and hands the results back to the thread
+that owns the window, so the game can show the board's possible score
+without ever blocking a click.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# one worker thread shared by every game in the process
+_executor = ThreadPoolExecutor(max_workers=1,
+                               thread_name_prefix='boggle-solver')
+
+# how often (ms) the window thread checks for a finished solve
+POLL_MS = 20
+
+
+class BackgroundSolver:
+    """A BackgroundSolver runs one solve at a time for a window:
+       *  _win is the GraphWin whose event loop receives the results
+       *  _solver is the BoggleSolver used on the worker thread
+       *  _cancel is the Event that cancels the running solve
+       *  _future is the Future of the latest solve, the only one whose
+          result is ever delivered
+       *  _callback receives the result of _future
+       *  _polling is True while a poll is scheduled with _win.after
+
+    The worker never touches Tk: results are picked up by a timer on the
+    window's thread (or by wait), and callbacks run there.
+
+    >>> from headless import GraphWin
+    >>> from lexicon import Lexicon
+    >>> from bogglesolver import BoggleSolver
+    >>> background = BackgroundSolver(GraphWin(), BoggleSolver(Lexicon(["TIN"])))
+    >>> results = []
+    >>> background.submit([["T", "I"], ["N", "E"]], results.append)
+    >>> background.submit([["T", "E"], ["I", "N"]], results.append)
+    >>> background.wait()
+    >>> results
+    [{'TIN': (1, [(0, 0), (1, 0), (1, 1)])}]
+    """
+
+    __slots__ = ['_win', '_solver', '_cancel', '_future', '_callback',
+                 '_polling']
+
+    def __init__(self, win, solver):
+        self._win = win
+        self._solver = solver
+        self._cancel = threading.Event()
+        self._future = None
+        self._callback = None
+        self._polling = False
+
+    def submit(self, letters, callback):
+        """
+        Starts solving letters (a list of columns of faces) and cancels any
+        solve still running for an earlier board.  When the solve finishes,
+        callback is called on the window's thread with the words found (see
+        BoggleSolver.solve).
+        """
+        self._cancel.set()
+        self._cancel = threading.Event()
+        self._future = _executor.submit(self._solver.solve, letters,
+                                        self._cancel)
+        self._callback = callback
+        if not self._polling:
+            self._polling = True
+            self._win.after(POLL_MS, self.__poll)
+
+    def __deliver(self):
+        """
+        Passes the latest result to its callback, once.
+        """
+        future = self._future
+        self._future = None
+        words = future.result()
+        if words is not None:
+            self._callback(words)
+
+    def __poll(self):
+        self._polling = False
+        if self._future is None or self._win.isClosed():
+            return
+        if self._future.done():
+            self.__deliver()
+        else:
+            self._polling = True
+            self._win.after(POLL_MS, self.__poll)
+
+    def wait(self, timeout=None):
+        """
+        Blocks until the latest solve finishes and delivers its result now,
+        on the calling thread.
+        """
+        if self._future is not None:
+            self._future.result(timeout)
+            self.__deliver()
+
+    def cancel(self):
+        """
+        Cancels the running solve, if any; its callback will not be called.
+        """
+        self._cancel.set()
+        self._future = None
@@ -0,0 +1,387 @@
+"""
+Solves large numbers of Boggle boards on a pool of worker processes and
+streams one result per board to a JSONL or CSV file as the work finishes.
+
+    python3 batchsolver.py --seeds 0 100000 --workers 8 --out boards.jsonl
+    python3 batchsolver.py --boards layouts.txt --out boards.csv
+    python3 batchsolver.py --seeds 0 100000 --store boards.db --out boards.jsonl
+
+Boards come either from a file of encoded layouts (one per line, see
+encodeBoard) or from a range of seeds, where seed s gives the board that
+BoggleBoard.shakeCubes shows after randomize(s).  With --store, boards
+already in the BoardStore are answered from it and newly solved boards are
+added to it.
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+
+from boardsizes import getBoardSize
+from boardstore import BoardStore, boardKey, solverFingerprint
+from boggledice import CUBES, rollCubes
+from lexicon import readLexicon
+from solverkernel import findWords
+
+
+def encodeBoard(faces):
+    """
+    Encodes a flat list of faces (column by column) as a str.
+
+    >>> encodeBoard(["Qu", "A", "T", "S"])
+    'QuATS'
+    """
+    return ''.join(faces)
+
+
+def decodeBoard(text):
+    """
+    Splits an encoded board back into its faces.  Every face starts with
+    an upper case letter, which may be followed by lower case letters.
+
+    >>> decodeBoard('QuATS')
+    ['Qu', 'A', 'T', 'S']
+    """
+    faces = []
+    for char in text.strip():
+        if char.islower() and faces:
+            faces[-1] += char
+        else:
+            faces.append(char)
+    return faces
+
+
+def seedBoards(start, stop, cubes=CUBES):
+    """
+    Yields a (seed, faces) tuple for every seed in range(start, stop).
+
+    >>> [seed for seed, faces in seedBoards(3, 5)]
+    [3, 4]
+    """
+    for seed in range(start, stop):
+        yield seed, rollCubes(cubes, random.Random(seed))
+
+
+def fileBoards(f):
+    """
+    Yields an (index, faces) tuple for every non-blank line of the open
+    file f.
+    """
+    index = 0
+    for line in f:
+        if line.strip():
+            yield index, decodeBoard(line)
+            index += 1
+
+
+# state of each worker process, set up once by initWorker
+_workerLexicon = None
+_workerBoardSize = None
+
+
+def initWorker(lexiconName, size):
+    """
+    Loads the lexicon used by workerSolve, which scores by the rules of
+    size x size boards; runs once in each worker process.
+    """
+    global _workerLexicon, _workerBoardSize
+    _workerLexicon = readLexicon(lexiconName)
+    _workerBoardSize = getBoardSize(size)
+
+
+def workerSolve(faces):
+    """
+    Solves faces (see solveFaces) with the lexicon loaded by initWorker.
+    """
+    return solveFaces(faces, _workerLexicon, _workerBoardSize)
+
+
+def solveFaces(faces, lexicon, boardSize=None):
+    """
+    Solves one square board given as a flat list of faces and returns a
+    tuple (word count, total score, sorted list of words), counting only
+    the words that score by the rules of boardSize (a BoardSize; default
+    4x4 Boggle).
+
+    >>> from lexicon import Lexicon
+    >>> solveFaces(["Qu", "T", "I", "N"], Lexicon(["QUIT", "TIN", "TINE"]))
+    (2, 2, ['QUIT', 'TIN'])
+    >>> solveFaces(["Qu", "T", "I", "N"], Lexicon(["QUIT", "TIN"]),
+    ...            getBoardSize(5))
+    (1, 1, ['QUIT'])
+    """
+    boardSize = boardSize or getBoardSize(4)
+    size = int(len(faces) ** 0.5)
+    words = sorted(findWords([face.upper() for face in faces], size, size,
+                             lexicon, minLength=boardSize.getMinWordLength()))
+    score = sum(boardSize.scoreWord(word) for word in words)
+    return len(words), score, words
+
+
+def runPool(tasks, function, report, workers=None, initializer=None,
+            initargs=(), maxPending=None, stop=None):
+    """
+    Calls function(*args) for every tuple args from the iterable tasks on a
+    pool of worker processes (default: one per core), each set up once by
+    initializer(*initargs), and passes every result to report in this
+    process as soon as it is ready, so results arrive in completion order.
+    At most maxPending tasks (default: two per worker) are queued at once,
+    so memory stays bounded however many tasks there are.  If given, stop
+    is called before each task is queued and each result reported; once it
+    returns True, no more tasks are queued and unreported results are
+    dropped.  workers=0 runs everything in this process, after calling
+    initializer here.
+
+    >>> results = []
+    >>> runPool([(2,), (3,), (4,)], abs, results.append, workers=0,
+    ...         stop=lambda: len(results) == 2)
+    >>> results
+    [2, 3]
+    """
+    if workers == 0:
+        if initializer is not None:
+            initializer(*initargs)
+        for args in tasks:
+            if stop is not None and stop():
+                break
+            report(function(*args))
+        return
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if maxPending is None:
+        maxPending = 2 * workers
+    tasks = iter(tasks)
+    pool = ProcessPoolExecutor(workers, initializer=initializer,
+                               initargs=initargs)
+    try:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < maxPending:
+                args = None if stop is not None and stop() else next(tasks, None)
+                if args is None:
+                    exhausted = True
+                else:
+                    pending.add(pool.submit(function, *args))
+            if pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if stop is None or not stop():
+                        report(future.result())
+            if stop is not None and stop():
+                break
+    finally:
+        # don't wait for tasks nobody needs any more
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _solveChunk(chunk):
+    """
+    Solves a chunk of (key, faces) tuples in a worker process.
+    """
+    results = []
+    for key, faces in chunk:
+        count, score, words = workerSolve(faces)
+        results.append((key, encodeBoard(faces), count, score, words))
+    return results
+
+
+class JsonlWriter:
+    """Writes batch results as one JSON object per line."""
+
+    __slots__ = ['_f']
+
+    def __init__(self, f):
+        self._f = f
+
+    def write(self, key, board, count, score, words):
+        self._f.write(json.dumps({"key": key, "board": board, "count": count,
+                                  "score": score, "words": words}) + '\n')
+
+
+class CsvWriter:
+    """Writes batch results as CSV rows, with the words separated by spaces."""
+
+    __slots__ = ['_writer']
+
+    def __init__(self, f):
+        self._writer = csv.writer(f)
+        self._writer.writerow(["key", "board", "count", "score", "words"])
+
+    def write(self, key, board, count, score, words):
+        self._writer.writerow([key, board, count, score, ' '.join(words)])
+
+
+class BatchStats:
+    """Throughput of a batch run: boards solved, how many of them were
+    answered from a BoardStore, and the seconds it took."""
+
+    __slots__ = ['_boards', '_seconds', '_stored']
+
+    def __init__(self, boards, seconds, stored=0):
+        self._boards = boards
+        self._seconds = seconds
+        self._stored = stored
+
+    def getBoards(self):
+        return self._boards
+
+    def getStored(self):
+        return self._stored
+
+    def getSeconds(self):
+        return self._seconds
+
+    def getBoardsPerSecond(self):
+        return self._boards / self._seconds if self._seconds else 0.0
+
+    def __str__(self):
+        return "{} boards ({} from the store) in {:.2f}s ({:.0f} boards/s)".format(
+            self._boards, self._stored, self._seconds,
+            self.getBoardsPerSecond())
+
+
+def solveBatch(boards, writer, workers=None, chunkSize=256, maxPending=None,
+               lexiconName='bogwords.txt', boardSize=4, progress=None,
+               store=None):
+    """
+    Solves every (key, faces) tuple from the iterator boards and passes
+    each result to writer.write as soon as its chunk finishes, so results
+    arrive in completion order rather than input order.  Returns the
+    BatchStats of the run.
+
+    Words are counted and scored by the rules of boardSize x boardSize
+    Boggle (see boardsizes).  Boards are handed to workers (default: one per core) in chunks of
+    chunkSize, and at most maxPending chunks (default: two per worker) are
+    queued at once (see runPool), so memory stays bounded however long
+    boards is.
+    workers=0 solves everything in this process.  If given, progress is
+    called with the BatchStats so far after each chunk.
+
+    If store (a writable BoardStore) is given, boards found in it under
+    the fingerprint of lexiconName and boardSize are not solved again, and
+    every board that is solved is added to it, where a BoggleServer playing
+    the same size finds it too.  Only this process touches the store.
+
+    >>> import io, os, tempfile
+    >>> out = io.StringIO()
+    >>> stats = solveBatch(seedBoards(0, 3), JsonlWriter(out), workers=0)
+    >>> stats.getBoards(), len(out.getvalue().splitlines())
+    (3, 3)
+    >>> store = BoardStore(os.path.join(tempfile.mkdtemp(), "boards.db"))
+    >>> stats = solveBatch(seedBoards(0, 3), JsonlWriter(out), workers=0,
+    ...                    store=store)
+    >>> stats = solveBatch(seedBoards(0, 4), JsonlWriter(out), workers=0,
+    ...                    store=store)
+    >>> stats.getBoards(), stats.getStored(), len(store)
+    (4, 3, 4)
+    >>> from lexiconregistry import getLexicon
+    >>> fingerprint = solverFingerprint(getLexicon("bogwords.txt"),
+    ...                                 getBoardSize(4))
+    >>> faces = next(seedBoards(0, 1))[1]
+    >>> store.get(fingerprint, faces) == solveFaces(faces, getLexicon("bogwords.txt"))
+    True
+    >>> store.close()
+    """
+    start = time.perf_counter()
+    solved = stored = 0
+    boards = iter(boards)
+    fingerprint = None
+    if store is not None:
+        fingerprint = solverFingerprint(readLexicon(lexiconName),
+                                        getBoardSize(boardSize))
+
+    def report(results, fromStore=False):
+        nonlocal solved, stored
+        for result in results:
+            writer.write(*result)
+        solved += len(results)
+        if fromStore:
+            stored += len(results)
+        elif store is not None and results:
+            store.putMany(fingerprint,
+                          [(decodeBoard(board), count, score, words)
+                           for key, board, count, score, words in results])
+        if progress is not None:
+            progress(BatchStats(solved, time.perf_counter() - start, stored))
+
+    def unsolved(chunk):
+        """
+        Reports the boards of chunk found in the store and returns the rest.
+        """
+        if store is None or not chunk:
+            return chunk
+        found = store.getMany(fingerprint, [faces for key, faces in chunk])
+        hits, misses = [], []
+        for key, faces in chunk:
+            result = found.get(boardKey(faces))
+            if result is None:
+                misses.append((key, faces))
+            else:
+                hits.append((key, encodeBoard(faces)) + result)
+        if hits:
+            report(hits, fromStore=True)
+        return misses
+
+    def chunks():
+        for chunk in iter(lambda: list(islice(boards, chunkSize)), []):
+            chunk = unsolved(chunk)
+            if chunk:
+                yield (chunk,)
+
+    runPool(chunks(), _solveChunk, report, workers, initWorker,
+            (lexiconName, boardSize), maxPending)
+    return BatchStats(solved, time.perf_counter() - start, stored)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--seeds', type=int, nargs=2, metavar=('START', 'STOP'))
+    source.add_argument('--boards', metavar='FILE')
+    parser.add_argument('--out', default='-',
+                        help='output file; .csv writes CSV, anything else JSONL')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk', type=int, default=256)
+    parser.add_argument('--depth', type=int, default=None,
+                        help='maximum number of chunks queued at once')
+    parser.add_argument('--lexicon', default='bogwords.txt')
+    parser.add_argument('--store', metavar='DB',
+                        help='BoardStore of solved boards to reuse and extend')
+    parser.add_argument('--store-size', type=int, default=None,
+                        help='most boards to keep in the store')
+    args = parser.parse_args()
+
+    out = sys.stdout if args.out == '-' else open(args.out, 'w', newline='')
+    writer = CsvWriter(out) if args.out.endswith('.csv') else JsonlWriter(out)
+    boardFile = None
+    store = None
+    if args.store:
+        store = BoardStore(args.store, args.store_size)
+    if args.seeds:
+        boards = seedBoards(*args.seeds)
+    else:
+        boardFile = open(args.boards)
+        boards = fileBoards(boardFile)
+    try:
+        stats = solveBatch(boards, writer, args.workers, args.chunk, args.depth,
+                           args.lexicon, store=store)
+    finally:
+        if store is not None:
+            store.close()
+        if boardFile is not None:
+            boardFile.close()
+        if out is not sys.stdout:
+            out.close()
+    print(stats, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Times BoggleBoard.shakeCubes, BoggleBoard.resetColors and
+BoggleGame.doOneClick with drawing batches turned off and on.  With the Tk
+backend (needs a display) it reports milliseconds per call; the headless
+backend has nothing to time, but counts the window flushes each call would
+cause.
+
+    python3 benchdrawing.py [--repeat 50]
+"""
+
+import argparse
+import time
+
+from backend import BACKEND, GraphWin
+from bogglegameEC import BoggleGame
+
+
+def measure(win, action, repeat):
+    """
+    Calls action repeat times and returns (ms per call, flushes per call).
+    Flushes are only counted by the headless backend.
+    """
+    flushes = getattr(win, 'flushes', 0)
+    start = time.perf_counter()
+    for i in range(repeat):
+        action()
+    elapsed = time.perf_counter() - start
+    return (elapsed * 1000 / repeat,
+            (getattr(win, 'flushes', 0) - flushes) / repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    win = GraphWin("Boggle", 400, 400)
+    game = BoggleGame(win)
+    board = game._board
+    # select a four letter path, then end the word on its last letter
+    path = [(0, 0), (1, 0), (1, 1), (0, 1), (0, 1)]
+    clicks = [board.getCellCenter(col, row) for col, row in path]
+
+    def selectAndReset():
+        for point in clicks[:-1]:
+            game.doOneClick(point)
+        board.resetColors()
+        game.endWord()
+
+    def clickWord():
+        for point in clicks:
+            game.doOneClick(point)
+
+    actions = [("shakeCubes", board.shakeCubes),
+               ("resetColors", selectAndReset),
+               ("doOneClick x5", clickWord)]
+    print("backend: {}".format(BACKEND))
+    print("{:>14} {:>9} {:>12} {:>12}".format("action", "batching",
+                                              "ms/call", "flushes/call"))
+    for name, action in actions:
+        for batching in (False, True):
+            win.batching = batching
+            ms, flushes = measure(win, action, args.repeat)
+            print("{:>14} {:>9} {:>12.3f} {:>12.1f}".format(
+                name, "on" if batching else "off", ms, flushes))
+    win.close()
+
+
+if __name__ == "__main__":
+    main()
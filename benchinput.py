@@ -0,0 +1,110 @@
+"""
+Measures click-to-paint latency: the time from a click arriving at the
+window until doOneClick has run and the window has been repainted.  The
+same synthetic clicks (posted with event_generate at random moments) are
+handled once by the old getMouse polling loop and once by GameLoop.
+Needs the Tk backend, so run it on a machine with a display.
+
+    python3 benchinput.py [--clicks 40]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from backend import BACKEND, GraphWin
+from bogglegameEC import BoggleGame
+from eventloop import GameLoop
+
+
+def clickCells(board, count, rng):
+    """
+    Returns count (x, y) window positions of random grid cells.
+    """
+    size = board.getSize()
+    return [(board.getXInset() + size * rng.randrange(4) + size // 2,
+             board.getYInset() + size * rng.randrange(4) + size // 2)
+            for i in range(count)]
+
+
+def pollingLatencies(win, game, positions, rng):
+    """
+    Returns the latency (ms) of each click handled by a getMouse loop.
+    """
+    latencies = []
+    for x, y in positions:
+        posted = []
+
+        def post(x=x, y=y):
+            posted.append(time.perf_counter())
+            win.event_generate('<Button-1>', x=x, y=y, when='tail')
+
+        win.after(rng.randrange(1, 200), post)
+        point = win.getMouse()
+        game.doOneClick(point)
+        win.update_idletasks()
+        latencies.append((time.perf_counter() - posted[0]) * 1000)
+    return latencies
+
+
+def eventLatencies(win, game, positions, rng):
+    """
+    Returns the latency (ms) of each click handled by a GameLoop.
+    """
+    latencies = []
+    remaining = list(positions)
+    posted = []
+
+    def onClick(point):
+        game.doOneClick(point)
+        win.update_idletasks()
+        latencies.append((time.perf_counter() - posted[-1]) * 1000)
+        if remaining:
+            loop.schedule(rng.randrange(1, 200), post)
+        else:
+            loop.stop()
+        return True
+
+    def post():
+        x, y = remaining.pop()
+        posted.append(time.perf_counter())
+        win.event_generate('<Button-1>', x=x, y=y, when='tail')
+
+    loop = GameLoop(win, onClick)
+    loop.schedule(1, post)
+    loop.run()
+    return latencies
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    print("{:>8} {:>9.2f} {:>9.2f} {:>9.2f}".format(
+        name, statistics.mean(latencies), statistics.median(latencies),
+        latencies[-1]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clicks', type=int, default=40)
+    args = parser.parse_args()
+    if BACKEND != 'tk':
+        sys.exit("benchinput.py needs the Tk backend and a display")
+
+    rng = random.Random(0)
+    print("{:>8} {:>9} {:>9} {:>9}".format("loop", "mean ms", "p50 ms",
+                                          "max ms"))
+    win = GraphWin("Boggle", 400, 400)
+    game = BoggleGame(win)
+    positions = clickCells(game._board, args.clicks, rng)
+    report("polling", pollingLatencies(win, game, positions, rng))
+    win.close()
+
+    win = GraphWin("Boggle", 400, 400)
+    game = BoggleGame(win)
+    report("events", eventLatencies(win, game, positions, rng))
+
+
+if __name__ == "__main__":
+    main()
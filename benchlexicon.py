@@ -0,0 +1,79 @@
+"""
+Compares the cold-start time and resident memory of the ways the lexicon can
+be loaded: the original set of words, the Lexicon trie, and a compiled
+lexicon opened with MappedLexicon.  Each load runs in a fresh interpreter.
+
+    python3 benchlexicon.py [bogwords.txt]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from lexicon import readLexicon
+from lexiconfile import compileLexicon, MappedLexicon
+
+
+def residentKB():
+    """
+    Returns the resident set size of this process in kB (Linux only).
+    """
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1])
+    return 0
+
+
+def readSet(lexiconName):
+    """
+    Loads the word list the way BoggleGame originally did.
+    """
+    validWords = set()
+    with open(lexiconName) as f:
+        for line in f:
+            validWords.add(line.strip().upper())
+    return validWords
+
+
+LOADERS = {"set": readSet, "trie": readLexicon, "mapped": MappedLexicon}
+
+
+def measureOne(kind, lexiconName):
+    """
+    Loads the lexicon with LOADERS[kind], runs one query so the mapped
+    file is actually touched, and prints a JSON record of the load time
+    and the growth in resident memory.
+    """
+    before = residentKB()
+    start = time.perf_counter()
+    lexicon = LOADERS[kind](lexiconName)
+    "QUIET" in lexicon
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"kind": kind, "ms": elapsed * 1000,
+                      "rssKB": residentKB() - before}))
+
+
+def main():
+    lexiconName = sys.argv[1] if len(sys.argv) > 1 else 'bogwords.txt'
+    compiled = os.path.join(tempfile.mkdtemp(), 'lexicon.lex')
+    compileLexicon(readLexicon(lexiconName), compiled)
+    print("{:>8} {:>10} {:>10}".format("loader", "ms", "RSS kB"))
+    for kind in LOADERS:
+        source = compiled if kind == "mapped" else lexiconName
+        output = subprocess.check_output([sys.executable, __file__, '--one',
+                                          kind, source])
+        result = json.loads(output)
+        print("{:>8} {:>10.2f} {:>10}".format(kind, result["ms"],
+                                             result["rssKB"]))
+    print("compiled file: {} bytes".format(os.path.getsize(compiled)))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == '--one':
+        measureOne(sys.argv[2], sys.argv[3])
+    else:
+        main()
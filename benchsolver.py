@@ -0,0 +1,59 @@
+"""
+Benchmarks the solver on boards of each size, rolled from that size's dice
+(see boardsizes), and prints the average and worst time to solve and score
+one board, which is what a game waits for before showing the possible score.
+
+    python3 benchsolver.py --boards 500 --sizes 4 5 6
+"""
+
+import argparse
+import random
+import time
+
+from boardsizes import getBoardSize
+from boggledice import rollCubes, toColumns
+from lexicon import readLexicon
+
+
+def benchSize(lexicon, size, boards, seed=0):
+    """
+    Solves boards random size x size boards and returns a tuple of
+    (milliseconds per board, worst milliseconds, average words per board).
+    One more board is solved first, untimed, so compiling the lexicon for
+    the size's dice isn't counted as a solve.
+    """
+    boardSize = getBoardSize(size)
+    solver = boardSize.makeSolver(lexicon)
+    rng = random.Random(seed)
+    layouts = [toColumns(rollCubes(boardSize.getCubes(), rng), size)
+               for i in range(boards + 1)]
+    solver.solve(layouts.pop())
+    words = 0
+    worst = 0.0
+    start = time.perf_counter()
+    for letters in layouts:
+        solveStart = time.perf_counter()
+        words += len(solver.solve(letters))
+        worst = max(worst, time.perf_counter() - solveStart)
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / boards, worst * 1000, words / boards
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--boards', type=int, default=200)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[4, 5, 6])
+    parser.add_argument('--lexicon', default='bogwords.txt')
+    args = parser.parse_args()
+
+    lexicon = readLexicon(args.lexicon)
+    print("{:>5} {:>12} {:>12} {:>12}".format("size", "ms/board", "worst ms",
+                                               "words/board"))
+    for size in args.sizes:
+        ms, worst, words = benchSize(lexicon, size, args.boards)
+        print("{:>5} {:>12.3f} {:>12.3f} {:>12.1f}".format(
+            "{0}x{0}".format(size), ms, worst, words))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+The benchmark suite: times the hot spots of the game on the headless
+backend, writes the results as JSON with a description of the machine, and
+compares them with a baseline, failing if anything got slower.
+
+    python3 benchsuite.py                      # run and compare with the baseline
+    python3 benchsuite.py --out results.json --threshold 0.5
+    python3 benchsuite.py --only solve shakeCubes
+    python3 benchsuite.py --update-baseline    # after an intended change
+
+The exit status is 1 if a benchmark's fastest run is more than its
+threshold (a fraction: 0.25, or --threshold for every benchmark) slower than
+its baseline's.  Other load on the machine only ever makes a run slower, so
+the fastest of many runs is the steadiest measure of the code itself;
+medians and trimmed means are recorded too, for reading.  A benchmark that
+looks slower is measured again (--confirm times) before it counts as a
+regression, so one slow spell on a shared machine does not fail the run.
+Baselines are only comparable on similar machines; the metadata saved with
+each run records what the numbers were measured on.
+"""
+
+import os
+os.environ.setdefault('BOGGLE_BACKEND', 'headless')
+
+import argparse
+import datetime
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+
+from backend import BACKEND, GraphWin
+from boggleboard import BoggleBoard
+from boggledice import rollCubes, toColumns
+from clickstream import syntheticClicks
+from bogglegameEC import BoggleGame
+from boardsizes import getBoardSize
+from brandom import randomize
+from lexicon import readLexicon
+from lexiconregistry import getLexicon
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'benchbaseline.json')
+LEXICON = 'bogwords.txt'
+
+
+def timeCalls(action, runs):
+    """
+    Calls action once untimed, to warm up caches and the allocator after
+    whatever ran before, then runs times more, and returns the list of
+    seconds each of those calls took.  As in timeit, the garbage collector
+    is off while a call runs, and what the call returns is freed only after
+    it is timed, so a benchmark that builds something big is not charged for
+    tearing down the last one.
+
+    >>> len(timeCalls(lambda: None, 3))
+    3
+    """
+    times = []
+    action()
+    enabled = gc.isenabled()
+    gc.collect()
+    try:
+        for i in range(runs):
+            gc.disable()
+            start = time.perf_counter()
+            result = action()
+            times.append(time.perf_counter() - start)
+            if enabled:
+                gc.enable()
+            del result
+    finally:
+        if enabled:
+            gc.enable()
+    return times
+
+
+def benchLexiconLoad(runs):
+    """
+    Reads the word list into a Lexicon trie.
+    """
+    return timeCalls(lambda: readLexicon(LEXICON), runs)
+
+
+def benchBoardConstruction(runs):
+    """
+    Builds a 4x4 BoggleBoard on a new headless window.
+    """
+    randomize(0)
+    return timeCalls(lambda: BoggleBoard(GraphWin("Boggle", 400, 400)), runs)
+
+
+def benchShakeCubes(runs):
+    """
+    Shakes the cubes of one board.
+    """
+    randomize(0)
+    board = BoggleBoard(GraphWin("Boggle", 400, 400))
+    return timeCalls(board.shakeCubes, runs)
+
+
+def benchIsAdjacent(runs):
+    """
+    Tests every ordered pair of letters on a board for adjacency.
+    """
+    randomize(0)
+    board = BoggleBoard(GraphWin("Boggle", 400, 400))
+    letters = [letter for column in board._grid for letter in column]
+
+    def allPairs():
+        for letter in letters:
+            for other in letters:
+                letter.isAdjacent(other)
+    return timeCalls(allPairs, runs)
+
+
+def benchDoOneClick(runs):
+    """
+    Plays a synthetic click stream, timing each click.
+    """
+    randomize(0)
+    game = BoggleGame(GraphWin("Boggle", 400, 400), LEXICON,
+                      backgroundSolve=False)
+    clicks = iter(syntheticClicks(game.getBoard(), runs + 1))
+    # wait for the compiled lexicon the first click would otherwise wait on
+    game.getSelectionStatus()
+    return timeCalls(lambda: game.doOneClick(next(clicks)), runs)
+
+
+def benchSolve(runs):
+    """
+    Finds and scores every word on one seeded 4x4 board.
+    """
+    solver = getBoardSize(4).makeSolver(getLexicon(LEXICON))
+    boards = iter([toColumns(rollCubes(rng=random.Random(seed)), 4)
+                   for seed in range(runs + 1)])
+    return timeCalls(lambda: solver.solve(next(boards)), runs)
+
+
+# name -> (benchmark function, runs, allowed slowdown); solve's speed
+# depends on where the compiled lexicon's nodes land in memory, which
+# differs from one process to the next by up to a third
+BENCHMARKS = {"lexiconLoad": (benchLexiconLoad, 15, 0.25),
+              "boardConstruction": (benchBoardConstruction, 200, 0.25),
+              "shakeCubes": (benchShakeCubes, 500, 0.25),
+              "isAdjacent": (benchIsAdjacent, 200, 0.25),
+              "doOneClick": (benchDoOneClick, 2000, 0.25),
+              "solve": (benchSolve, 300, 0.5)}
+
+
+def summarize(times):
+    """
+    Returns the median, trimmed mean (of the runs between the 25th and 75th
+    percentiles), 95th percentile and minimum of a list of seconds, in
+    milliseconds.
+
+    >>> summarize([0.001, 0.003, 0.002, 0.010])
+    {'runs': 4, 'medianMs': 3.0, 'trimmedMs': 2.5, 'p95Ms': 10.0, 'minMs': 1.0}
+    """
+    ordered = sorted(times)
+    count = len(ordered)
+    middle = ordered[count // 4:count - count // 4]
+    return {"runs": count,
+            "medianMs": round(ordered[count // 2] * 1000, 6),
+            "trimmedMs": round(sum(middle) / len(middle) * 1000, 6),
+            "p95Ms": round(ordered[min(count - 1, int(count * 0.95))] * 1000, 6),
+            "minMs": round(ordered[0] * 1000, 6)}
+
+
+def environment():
+    """
+    Returns a dictionary describing the machine and tree the suite ran on.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True,
+                                cwd=os.path.dirname(BASELINE)).stdout.strip()
+    except OSError:
+        commit = ''
+    return {"python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpus": os.cpu_count(),
+            "backend": BACKEND,
+            "commit": commit,
+            "time": datetime.datetime.now(datetime.timezone.utc).isoformat(
+                timespec='seconds')}
+
+
+def runSuite(names=None, scale=1.0, progress=None, repeat=5):
+    """
+    Runs the named benchmarks (default: all) with their runs multiplied by
+    scale, and returns the results document: {"environment": ...,
+    "results": {name: summary}}.  The whole suite is run repeat times over
+    and each benchmark's round with the fastest run kept, as timeit.repeat
+    does; spreading the rounds out in time lets every benchmark catch a
+    quiet spell on the machine.  progress, if given, is called with each
+    benchmark's name and summary once its last round finishes.
+    """
+    names = names or list(BENCHMARKS)
+    results = {}
+    for round in range(max(1, repeat)):
+        for name in names:
+            benchmark, runs, allowed = BENCHMARKS[name]
+            summary = summarize(benchmark(max(1, int(runs * scale))))
+            if (name not in results
+                    or summary["minMs"] < results[name]["minMs"]):
+                results[name] = summary
+    if progress is not None:
+        for name in names:
+            progress(name, results[name])
+    return {"environment": environment(), "results": results}
+
+
+def compareResults(results, baseline, threshold=None):
+    """
+    Compares the fastest runs in two results documents and returns a list
+    of (name, baseline ms, current ms, ratio, regressed) tuples, one for
+    each benchmark in both.  A benchmark regressed if its fastest run grew
+    by more than threshold (a fraction of the baseline; by default, the
+    benchmark's own allowed slowdown in BENCHMARKS).
+
+    >>> old = {"results": {"solve": {"minMs": 1.0}, "gone": {"minMs": 1.0}}}
+    >>> new = {"results": {"solve": {"minMs": 1.5}}}
+    >>> compareResults(new, old, threshold=0.25)
+    [('solve', 1.0, 1.5, 1.5, True)]
+    >>> compareResults(new, old)[0][-1]
+    False
+    >>> compareResults(new, old, threshold=0.6)[0][-1]
+    False
+    """
+    rows = []
+    for name, summary in results["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        allowed = BENCHMARKS[name][2] if threshold is None else threshold
+        ratio = summary["minMs"] / before["minMs"] if before["minMs"] else 1.0
+        rows.append((name, before["minMs"], summary["minMs"], ratio,
+                     ratio > 1 + allowed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS),
+                        help='run only these benchmarks')
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help='multiply the number of runs of every benchmark')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='rounds of the suite to run, keeping the fastest of each')
+    parser.add_argument('--out', help='write the results (JSON) here')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--threshold', type=float, default=None,
+                        help='allowed slowdown of the fastest run, as a '
+                             'fraction, for every benchmark')
+    parser.add_argument('--confirm', type=int, default=2,
+                        help='times to measure a slower benchmark again')
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='save the results as the new baseline')
+    args = parser.parse_args()
+
+    def progress(name, summary):
+        print("{:>18} {:>10.4f} ms min {:>10.4f} ms trimmed {:>10.4f} ms median "
+              "{:>10.4f} ms p95 ({} runs)".format(
+                  name, summary["minMs"], summary["trimmedMs"],
+                  summary["medianMs"], summary["p95Ms"], summary["runs"]))
+
+    results = runSuite(args.only, args.scale, progress, args.repeat)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2)
+            f.write('\n')
+        print("baseline written to {}".format(args.baseline))
+        return 0
+    if not os.path.exists(args.baseline):
+        print("no baseline at {}; nothing to compare".format(args.baseline))
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    for attempt in range(args.confirm):
+        suspects = [name for name, before, now, ratio, regressed
+                    in compareResults(results, baseline, args.threshold)
+                    if regressed]
+        if not suspects:
+            break
+        print("measuring {} again".format(' '.join(suspects)))
+        again = runSuite(suspects, args.scale, progress, args.repeat)
+        for name in suspects:
+            if again["results"][name]["minMs"] < results["results"][name]["minMs"]:
+                results["results"][name] = again["results"][name]
+
+    regressions = 0
+    print()
+    print("{:>18} {:>12} {:>12} {:>8}".format("benchmark", "baseline ms",
+                                             "current ms", "ratio"))
+    for name, before, now, ratio, regressed in compareResults(
+            results, baseline, args.threshold):
+        print("{:>18} {:>12.4f} {:>12.4f} {:>7.2f}x{}".format(
+            name, before, now, ratio, "  REGRESSION" if regressed else ""))
+        regressions += regressed
+    if regressions:
+        print("{} benchmark(s) slower than the baseline by more than allowed".format(
+            regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,8 @@ for setting and getting text to/from various locations outside of the grid.  It
 also draws an exit and reset button and provides methods for checking for mouse
 clicks inside of those regions.'''
 
-from graphics import *
+from backend import *
+from instrument import span
 
 class Board:
     # _win: graphical window on which we will draw our board
@@ -67,15 +68,22 @@ class Board:
         text.draw(self._win)
         return rect
 
+    def __gridRight(self):
+        return self._xInset + self._size * self._cols
+
+    def __gridBottom(self):
+        return self._yInset + self._size * self._rows
+
     def __drawTextAreas(self):
         """Draw the text areas to the right/lower/upper side of main grid"""
+        centerX = self._xInset + self._size * self._cols / 2
         # draw main text area (right of grid)
-        self._textArea = self.__makeTextArea(Point(self._xInset * self._rows + self._size * 2,
+        self._textArea = self.__makeTextArea(Point(self.__gridRight() + self._size,
                                                    self._yInset + 50), 14)
         #draw the text area below grid
-        self._lowerWord = self.__makeTextArea(Point(160, 275))
+        self._lowerWord = self.__makeTextArea(Point(centerX, self.__gridBottom() + 25))
         #draw the text area above grid
-        self._upperWord = self.__makeTextArea(Point(160, 25), color="red")
+        self._upperWord = self.__makeTextArea(Point(centerX, self._yInset / 2), color="red")
 
     def __drawGrid(self):
         """Creates a row x col grid, filled with empty squares"""
@@ -95,11 +103,12 @@ class Board:
                 #           "{},{}".format(x,y)).draw(win)
 
     def __drawButtons(self):
-        """Create reset and exit buttons"""
-        p1 = Point(50, 300); p2 = Point(130, 350)
+        """Create reset and exit buttons below the lower text area"""
+        top = self.__gridBottom() + 50
+        p1 = Point(self._xInset, top); p2 = Point(self._xInset + 80, top + 50)
         self._resetButton = self._makeRect(p1, p2, text="RESET")
-        p3 = Point(170, 300); p4 = Point(250, 350)
-        self._exitButton = self._makeRect(p3, p4, text="EXIT")        
+        p3 = Point(self._xInset + 120, top); p4 = Point(self._xInset + 200, top + 50)
+        self._exitButton = self._makeRect(p3, p4, text="EXIT")
 
     def drawBoard(self):
         """Create the board with the grid, text areas, and buttons"""
@@ -128,6 +137,15 @@ class Board:
             col = int((pX - self._xInset) / self._size)
         return (col, row)
 
+    # convert grid position to the Point at the center of that square
+    def getCellCenter(self, col, row):
+        '''
+        Converts a grid position (col, row) to the window location (Point)
+        at the center of that square.
+        '''
+        return Point(self._xInset + self._size * col + self._size / 2,
+                     self._yInset + self._size * row + self._size / 2)
+
     # check for click inside specific rectangular region
     def __inRect(self, point, rect):
         '''
@@ -149,9 +167,9 @@ class Board:
         '''
         ptX = point.getX()
         ptY = point.getY()
-        maxY = self._size * (self._rows + 1)
-        maxX = self._size * (self._cols + 1)
-        return ptX <= maxX and ptY <= maxY and ptX >= self._xInset and ptY >= self._yInset
+        maxY = self.__gridBottom()
+        maxX = self.__gridRight()
+        return ptX < maxX and ptY < maxY and ptX >= self._xInset and ptY >= self._yInset
 
     # clicked in exit button?
     def inExit(self, point):
@@ -167,6 +185,14 @@ class Board:
         '''
         return self.__inRect(point, self._resetButton)
 
+    # where the text area on the right is drawn
+    def getTextAreaAnchor(self):
+        '''
+        Returns the Point the text area to the right of the grid is
+        centered on.
+        '''
+        return self._textArea.getAnchor()
+
     # set text to text area on right
     def getStringFromTextArea(self):
         '''
@@ -179,7 +205,8 @@ class Board:
         '''
         Sets text to text area to right of grid. Overwrites existing text.
         '''
-        self._textArea.setText(text)
+        with span('Board.setStringToTextArea'):
+            self._textArea.setText(text)
 
     # add text to text area below grid
     def getStringFromLowerText(self):
@@ -194,7 +221,15 @@ class Board:
         '''
         Set text to text area below grid.  Overwrites existing text.
         '''
-        self._lowerWord.setText( text )
+        with span('Board.setStringToLowerText'):
+            self._lowerWord.setText( text )
+
+    # set the color of the text area below grid
+    def setLowerTextColor(self, color):
+        '''
+        Set the color of the text below grid.
+        '''
+        self._lowerWord.setTextColor(color)
 
     # add text to text area above grid
     def getStringFromUpperText(self):
@@ -208,7 +243,8 @@ class Board:
         '''
         Set text to text area above grid. Overwrites existing text.
         '''
-        self._upperWord.setText(text)
+        with span('Board.setStringToUpperText'):
+            self._upperWord.setText(text)
 
 if __name__ == "__main__":
     win = GraphWin("Board", 400, 400)
@@ -0,0 +1,99 @@
+"""
+Generates Boggle boards in bulk with NumPy, without creating any graphics
+objects.  Boards are rows of a uint8 array holding face ids (see FACES), one
+column per cube position in the same column-by-column order that
+BoggleBoard.shakeCubes fills the grid.
+
+    python3 boardgen.py --boards 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from boggledice import CUBES
+
+# face id -> face; every face on the standard dice is in this alphabet
+FACES = [chr(ord('A') + i) for i in range(26)] + ["Qu"]
+FACE_IDS = {face: i for i, face in enumerate(FACES)}
+
+
+def decodeBoard(row):
+    """
+    Converts one row of face ids back to a list of faces.
+
+    >>> decodeBoard(np.array([16, 26, 0], dtype=np.uint8))
+    ['Q', 'Qu', 'A']
+    """
+    return [FACES[faceId] for faceId in row]
+
+
+class BoardGenerator:
+    """A BoardGenerator rolls many boards at once from a set of dice:
+       *  _rng is the dedicated numpy Generator the boards are drawn from
+       *  _cubeFaces is a (cubes, faces) uint8 array of face ids
+
+    Each board is a uniformly random permutation of the cubes with a
+    uniformly random face showing on each cube, which is the distribution
+    of BoggleBoard.shakeCubes (the boards themselves differ, since
+    shakeCubes draws from brandom rather than from _rng).
+
+    >>> gen = BoardGenerator(seed=1)
+    >>> boards = gen.generate(5)
+    >>> boards.shape, boards.dtype
+    ((5, 16), dtype('uint8'))
+    >>> bool((BoardGenerator(seed=1).generate(5) == boards).all())
+    True
+    """
+
+    __slots__ = ['_rng', '_cubeFaces']
+
+    def __init__(self, seed=None, cubes=CUBES):
+        self._rng = np.random.default_rng(seed)
+        self._cubeFaces = np.array([[FACE_IDS[face] for face in cube]
+                                    for cube in cubes], dtype=np.uint8)
+
+    def generate(self, n):
+        """
+        Returns an (n, cubes) uint8 array of n new boards.
+        """
+        numCubes, numFaces = self._cubeFaces.shape
+        order = np.tile(np.arange(numCubes, dtype=np.intp), (n, 1))
+        self._rng.permuted(order, axis=1, out=order)
+        picks = self._rng.integers(0, numFaces, size=(n, numCubes),
+                                   dtype=np.intp)
+        return self._cubeFaces[order, picks]
+
+    def batches(self, total, batchSize=65536):
+        """
+        Yields arrays of at most batchSize boards until total boards have
+        been generated, so huge runs never hold every board in memory.
+
+        >>> [len(b) for b in BoardGenerator(0).batches(10, 4)]
+        [4, 4, 2]
+        """
+        while total > 0:
+            n = min(batchSize, total)
+            yield self.generate(n)
+            total -= n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--boards', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    gen = BoardGenerator(args.seed)
+    start = time.perf_counter()
+    for batch in gen.batches(args.boards):
+        pass
+    elapsed = time.perf_counter() - start
+    print("{} boards in {:.3f}s ({:.0f} boards/s)".format(
+        args.boards, elapsed, args.boards / elapsed))
+    print(decodeBoard(gen.generate(1)[0]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+The state of a Boggle board kept apart from its drawing: which tile shows in
+each cell and which cells are selected.  Game logic, solvers and tests read
+and change the model; views (such as BoggleBoard) subscribe to it and redraw
+only the cells that changed.
+"""
+
+from solverkernel import neighborTable
+
+# the tile id of a cell that has not been filled yet
+EMPTY = 255
+
+# what a view shows a cell as (see getState)
+UNSELECTED = 0
+SELECTED = 1
+CURRENT = 2
+
+
+class BoardModel:
+    """A BoardModel is a grid of tiles and a selection on it:
+       *  _rows, _cols are the size of the grid; cells are numbered column
+          by column (cell = col * rows + row), as in solverkernel
+       *  _alphabet is the TileAlphabet numbering the tiles (see
+          tilealphabet); a tile id is its token id
+       *  _tiles is a bytearray holding the tile id of each cell
+       *  _names maps every possible tile id (0 to 255) to the face shown
+          for it, '' for EMPTY
+       *  _tileIds maps each face as shown ("Qu") and as normalized ("QU")
+          to its tile id, so a shake needs no normalizing
+       *  _selected is an int with the bit of every selected cell set
+       *  _path is the list of the selected cells in the order they were
+          selected; the last one is the current cell
+       *  _neighbors is the grid's neighbor table
+       *  _listeners are the functions called with the list of the cells
+          that changed after each change
+
+    >>> from tilealphabet import TileAlphabet
+    >>> model = BoardModel(2, 2, TileAlphabet(["Qu", "I", "T", "N"]))
+    >>> model.setFaces(["Qu", "T", "I", "N"])
+    >>> model.getLetters(), model.getTile(0)
+    ([['Qu', 'T'], ['I', 'N']], 0)
+    >>> changes = []
+    >>> model.subscribe(changes.append)
+    >>> model.select(0); model.select(3)
+    >>> model.getPath(), model.getState(0), model.getState(3), changes
+    ([0, 3], 1, 2, [[0], [0, 3]])
+    >>> model.isAdjacent(3, 1), model.isSelected(1)
+    (True, False)
+    >>> model.clearSelection(); model.hasSelection(), changes[-1]
+    (False, [0, 3])
+    """
+
+    __slots__ = ['_rows', '_cols', '_alphabet', '_tiles', '_names', '_tileIds',
+                 '_selected',
+                 '_path', '_neighbors', '_listeners']
+
+    def __init__(self, rows, cols, alphabet):
+        if len(alphabet) >= EMPTY:
+            raise ValueError("a board model holds at most {} kinds of tile, "
+                             "not {}".format(EMPTY, len(alphabet)))
+        self._rows = rows
+        self._cols = cols
+        self._alphabet = alphabet
+        self._tiles = bytearray([EMPTY]) * (rows * cols)
+        self._names = ([alphabet.getName(tile) for tile in range(len(alphabet))]
+                       + [''] * (EMPTY + 1 - len(alphabet)))
+        self._tileIds = {}
+        for tile in range(len(alphabet)):
+            self._tileIds[alphabet.getFace(tile)] = tile
+            self._tileIds[alphabet.getName(tile)] = tile
+        self._selected = 0
+        self._path = []
+        self._neighbors = neighborTable(rows, cols)
+        self._listeners = []
+
+    def getRows(self):
+        return self._rows
+
+    def getCols(self):
+        return self._cols
+
+    def getAlphabet(self):
+        return self._alphabet
+
+    def getCell(self, col, row):
+        return col * self._rows + row
+
+    def getPosition(self, cell):
+        """
+        Returns the (col, row) of cell.
+        """
+        return divmod(cell, self._rows)
+
+    # change notification
+    def subscribe(self, listener):
+        """
+        Makes listener be called with the list of changed cells after every
+        change to the tiles or the selection.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def __changed(self, cells):
+        for listener in self._listeners:
+            listener(cells)
+
+    # tiles
+    def getTiles(self):
+        """
+        Returns the tile ids of the cells, in cell order, as bytes.
+        """
+        return bytes(self._tiles)
+
+    def getTile(self, cell):
+        return self._tiles[cell]
+
+    def getFace(self, cell):
+        """
+        Returns the face of cell as written on the die ("Qu"), or '' if
+        the cell is empty.
+        """
+        return self._names[self._tiles[cell]]
+
+    def getFaces(self):
+        """
+        Returns the list of faces, in cell order.
+        """
+        names = self._names
+        return [names[tile] for tile in self._tiles]
+
+    def getLetters(self):
+        """
+        Returns the faces as a list of columns of str, so
+        getLetters()[col][row] is the face at (col, row).
+        """
+        faces = self.getFaces()
+        rows = self._rows
+        return [faces[col * rows:(col + 1) * rows] for col in range(self._cols)]
+
+    def __tileOf(self, face):
+        tile = self._tileIds.get(face)
+        if tile is None:
+            tile = self._alphabet.getToken(face)
+        if tile is None:
+            raise ValueError("no die shows {!r}".format(face))
+        return tile
+
+    def setFace(self, cell, face):
+        """
+        Shows face (str) in cell.  Raises ValueError if no die shows it.
+        """
+        tile = self.__tileOf(face)
+        if self._tiles[cell] != tile:
+            self._tiles[cell] = tile
+            self.__changed([cell])
+
+    def setFaces(self, faces):
+        """
+        Shows faces (a list of str, in cell order) on the whole grid, as a
+        shake does.  Raises ValueError if no die shows one of them.
+        """
+        try:
+            tiles = bytearray([self._tileIds[face] for face in faces])
+        except KeyError:
+            tiles = bytearray([self.__tileOf(face) for face in faces])
+        if len(tiles) != len(self._tiles):
+            raise ValueError("{} faces for {} cells".format(len(tiles),
+                                                            len(self._tiles)))
+        old = self._tiles
+        changed = [cell for cell in range(len(tiles)) if tiles[cell] != old[cell]]
+        self._tiles = tiles
+        if changed:
+            self.__changed(changed)
+
+    # selection
+    def getPath(self):
+        return list(self._path)
+
+    def getPathLength(self):
+        return len(self._path)
+
+    def getLastCell(self):
+        """
+        Returns the most recently selected cell, or None.
+        """
+        return self._path[-1] if self._path else None
+
+    def hasSelection(self):
+        return self._selected != 0
+
+    def isSelected(self, cell):
+        return self._selected >> cell & 1 == 1
+
+    def getState(self, cell):
+        """
+        Returns how cell is shown: CURRENT for the last selected cell,
+        SELECTED for the others on the path and UNSELECTED otherwise.
+        """
+        if not self._selected >> cell & 1:
+            return UNSELECTED
+        return CURRENT if cell == self._path[-1] else SELECTED
+
+    def isAdjacent(self, cell, other):
+        """
+        Returns True if other is one of the (up to 8) cells touching cell.
+        """
+        return other in self._neighbors[cell]
+
+    def select(self, cell):
+        """
+        Adds cell to the end of the selection.  The caller checks that it
+        is adjacent to the last cell and not already selected.
+        """
+        changed = [cell]
+        if self._path:
+            changed.insert(0, self._path[-1])
+        self._path.append(cell)
+        self._selected |= 1 << cell
+        self.__changed(changed)
+
+    def setPath(self, cells):
+        """
+        Makes cells (a list) the selection, as if each was selected in turn.
+        """
+        changed = set(self._path) | set(cells)
+        self._path = list(cells)
+        self._selected = 0
+        for cell in cells:
+            self._selected |= 1 << cell
+        if changed:
+            self.__changed(sorted(changed))
+
+    def clearSelection(self):
+        """
+        Deselects every cell.
+        """
+        if self._path:
+            changed = sorted(self._path)
+            self._path = []
+            self._selected = 0
+            self.__changed(changed)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,115 @@
+"""
+The sizes of Boggle that can be played: standard 4x4 Boggle, 5x5 Big Boggle
+and 6x6 Super Big Boggle.  Each size has its own dice, shortest scoring word
+and score table; everything that depends only on the size is built once and
+shared by every board, game and solver of that size.
+"""
+
+from boggledice import CUBES, BIG_CUBES, SUPER_CUBES
+from bogglesolver import BoggleSolver, SCORE_DICT, LONG_WORD_SCORE
+from solverkernel import neighborTable
+from tilealphabet import TileAlphabet
+
+
+class BoardSize:
+    """A BoardSize describes one size of Boggle:
+       *  _size is the number of rows (and columns) of the square grid
+       *  _cubes are the dice, one per cell
+       *  _alphabet is the TileAlphabet of the dice' faces
+       *  _minWordLength is the length of the shortest word that scores
+       *  _scoreDict maps word lengths to points; longer words are worth
+          LONG_WORD_SCORE
+       *  _scores is the score of every word length up to the longest a
+          board can spell, looked up by scoreWord
+
+    >>> big = getBoardSize(5)
+    >>> big.getCells(), big.getMinWordLength()
+    (25, 4)
+    >>> big.scoreWord("CAT"), big.scoreWord("CATS"), big.scoreWord("QUESTIONS")
+    (0, 1, 11)
+    """
+
+    __slots__ = ['_size', '_cubes', '_alphabet', '_minWordLength', '_scoreDict',
+                 '_scores']
+
+    def __init__(self, size, cubes, minWordLength, scoreDict):
+        if len(cubes) != size * size:
+            raise ValueError("a {0}x{0} board needs {1} dice, not {2}".format(
+                size, size * size, len(cubes)))
+        self._size = size
+        self._cubes = cubes
+        self._alphabet = TileAlphabet.fromCubes(cubes)
+        self._minWordLength = minWordLength
+        self._scoreDict = scoreDict
+        longest = sum(len(max(cube, key=len)) for cube in cubes)
+        self._scores = tuple(0 if length < minWordLength
+                             else scoreDict.get(length, LONG_WORD_SCORE)
+                             for length in range(longest + 1))
+        # build the adjacency table now, rather than on the first solve
+        neighborTable(size, size)
+
+    def getSize(self):
+        return self._size
+
+    def getCells(self):
+        return self._size * self._size
+
+    def getCubes(self):
+        return self._cubes
+
+    def getAlphabet(self):
+        return self._alphabet
+
+    def getMinWordLength(self):
+        return self._minWordLength
+
+    def getScoreDict(self):
+        return self._scoreDict
+
+    def scoreWord(self, word):
+        """
+        Returns the points word (str) is worth on a board of this size, 0 if
+        it is too short to count.
+        """
+        length = len(word)
+        if length < len(self._scores):
+            return self._scores[length]
+        return LONG_WORD_SCORE
+
+    def makeSolver(self, lexicon):
+        """
+        Returns a BoggleSolver that finds and scores the words on boards of
+        this size, walking lexicon one tile of these dice at a time.
+        """
+        return BoggleSolver(lexicon, self._scoreDict, self._minWordLength,
+                            self._alphabet)
+
+
+BIG_SCORE_DICT = {4: 1, 5: 2, 6: 3, 7: 5}
+
+BOARD_SIZES = {4: BoardSize(4, CUBES, 3, SCORE_DICT),
+               5: BoardSize(5, BIG_CUBES, 4, BIG_SCORE_DICT),
+               6: BoardSize(6, SUPER_CUBES, 4, BIG_SCORE_DICT)}
+
+
+def getBoardSize(size):
+    """
+    Returns the BoardSize of size x size Boggle.
+
+    >>> getBoardSize(6).getCells()
+    36
+    >>> getBoardSize(7)
+    Traceback (most recent call last):
+    ...
+    ValueError: no 7x7 Boggle; sizes are 4, 5, 6
+    """
+    boardSize = BOARD_SIZES.get(size)
+    if boardSize is None:
+        raise ValueError("no {0}x{0} Boggle; sizes are {1}".format(
+            size, ', '.join(str(s) for s in sorted(BOARD_SIZES))))
+    return boardSize
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,215 @@
+"""
+A persistent store of solved boards, so a board solved once is never solved
+again by any later run or process.
+
+Boards are kept in an SQLite database in WAL mode, which lets any number of
+processes read while one writes.  Each board is stored under boardKey, the
+encoding of its canonical orientation (see boardsymmetry), and the
+fingerprint of the lexicon and scoring it was solved with (see
+solverFingerprint), with its word count, total score and words; a board
+solved with another lexicon or score table is a different entry.  A store
+opened with maxEntries evicts the least recently used boards once it grows
+past that many.
+
+    python3 boardstore.py boards.db        # prints the number of boards
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+
+from boardsymmetry import canonicalForm
+from lexicon import lexiconWords
+
+# SQLite limits the number of parameters in one statement
+_BATCH = 500
+
+# solutionCount holds the number of rows of solutions, kept by triggers,
+# so checking the size limit doesn't count the table; boards are stored
+# with an upsert rather than INSERT OR REPLACE, whose deletes would not
+# fire the delete trigger
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    fingerprint TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    words TEXT NOT NULL,
+    lastUsed REAL NOT NULL,
+    PRIMARY KEY (fingerprint, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS solutionsByUse ON solutions (lastUsed);
+CREATE TABLE IF NOT EXISTS solutionCount (n INTEGER NOT NULL);
+INSERT INTO solutionCount SELECT count(*) FROM solutions
+    WHERE NOT EXISTS (SELECT 1 FROM solutionCount);
+CREATE TRIGGER IF NOT EXISTS countInsert AFTER INSERT ON solutions
+    BEGIN UPDATE solutionCount SET n = n + 1; END;
+CREATE TRIGGER IF NOT EXISTS countDelete AFTER DELETE ON solutions
+    BEGIN UPDATE solutionCount SET n = n - 1; END;
+"""
+
+
+def solverFingerprint(lexicon, boardSize):
+    """
+    Returns a short str identifying what a solver with lexicon (a Lexicon
+    or MappedLexicon) finds on a board scored by the rules of boardSize (a
+    boardsizes.BoardSize): a hash of the words, the score table and the
+    shortest scoring word.  Boards are stored under it, so a store never
+    answers with the words of another lexicon or the scores of another
+    size, and every tool scoring by the same size shares its boards.
+
+    >>> from lexicon import Lexicon
+    >>> from boardsizes import getBoardSize
+    >>> words = Lexicon(["TIN", "TINE"])
+    >>> standard = getBoardSize(4)
+    >>> fingerprint = solverFingerprint(words, standard)
+    >>> fingerprint == solverFingerprint(Lexicon(["TINE", "TIN"]), standard)
+    True
+    >>> fingerprint == solverFingerprint(words, getBoardSize(5))
+    False
+    """
+    digest = hashlib.sha1('\n'.join(lexiconWords(lexicon)).encode('utf-8'))
+    digest.update(repr((sorted(boardSize.getScoreDict().items()),
+                        boardSize.getMinWordLength())).encode())
+    return digest.hexdigest()[:16]
+
+
+def boardKey(faces):
+    """
+    Returns the key a square board (a flat list of faces, column by column)
+    is stored under, encoded as by batchsolver.encodeBoard.  Every rotation
+    and reflection of a board has the same key.
+
+    >>> boardKey(["A", "B", "C", "D"]) == boardKey(["C", "A", "D", "B"])
+    True
+    >>> boardKey(["Qu", "A", "T", "S"])
+    'AQuST'
+    """
+    size = int(len(faces) ** 0.5)
+    key, perm = canonicalForm([face.upper() for face in faces], size, size)
+    return ''.join([face.capitalize() for face in key])
+
+
+class BoardStore:
+    """A BoardStore maps boards, with the fingerprint of the solver that
+    solved them, to their (count, score, words) solutions:
+       *  _connection is the sqlite3 connection to the store's file
+       *  _maxEntries is the most boards kept, or None for no limit
+       *  _readOnly is True if this process only reads the store
+
+    Reads by a writable store refresh the boards' last use; read-only stores
+    never write, so they don't contend with the writer.
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), "boards.db")
+    >>> store = BoardStore(path, maxEntries=2)
+    >>> store.putMany("f1", [(["T", "I", "N", "E"], 2, 2, ["TIN", "TINE"]),
+    ...                      (["A", "B", "C", "D"], 0, 0, [])])
+    >>> store.get("f1", ["I", "E", "T", "N"]), store.get("f2", ["I", "E", "T", "N"])
+    ((2, 2, ['TIN', 'TINE']), None)
+    >>> store.put("f1", ["X", "Y", "Z", "W"], 0, 0, [])
+    >>> len(store), store.get("f1", ["A", "B", "C", "D"])
+    (2, None)
+    >>> reader = BoardStore(path, readOnly=True)
+    >>> sorted(reader.getMany("f1", [["T", "I", "N", "E"], ["A", "B", "C", "D"]]))
+    ['EINT']
+    >>> reader.close(); store.close()
+    """
+
+    __slots__ = ['_connection', '_maxEntries', '_readOnly']
+
+    def __init__(self, path, maxEntries=None, readOnly=False, timeout=30.0):
+        self._maxEntries = maxEntries
+        self._readOnly = readOnly
+        if readOnly:
+            self._connection = sqlite3.connect(
+                'file:{}?mode=ro'.format(os.path.abspath(path)), uri=True,
+                timeout=timeout)
+        else:
+            self._connection = sqlite3.connect(path, timeout=timeout)
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+            self._connection.executescript(_SCHEMA)
+
+    def getMany(self, fingerprint, boards):
+        """
+        Looks up every board (flat list of faces) in boards, as solved by
+        the solver with fingerprint (see solverFingerprint), and returns a
+        dictionary mapping the key (see boardKey) of each board found to its
+        (count, score, words) tuple.
+        """
+        keys = list({boardKey(faces) for faces in boards})
+        found = {}
+        for start in range(0, len(keys), _BATCH):
+            batch = keys[start:start + _BATCH]
+            rows = self._connection.execute(
+                'SELECT key, count, score, words FROM solutions WHERE '
+                'fingerprint = ? AND key IN ({})'.format(
+                    ','.join('?' * len(batch))), [fingerprint] + batch)
+            for key, count, score, words in rows:
+                found[key] = (count, score, words.split())
+        if found and not self._readOnly:
+            now = time.time()
+            with self._connection:
+                self._connection.executemany(
+                    'UPDATE solutions SET lastUsed = ? WHERE fingerprint = ? '
+                    'AND key = ?', [(now, fingerprint, key) for key in found])
+        return found
+
+    def get(self, fingerprint, faces):
+        """
+        Returns the (count, score, words) tuple stored for faces under
+        fingerprint, or None.
+        """
+        return self.getMany(fingerprint, [faces]).get(boardKey(faces))
+
+    def putMany(self, fingerprint, results):
+        """
+        Stores every (faces, count, score, words) tuple in results, as
+        solved by the solver with fingerprint, then evicts the least
+        recently used boards beyond maxEntries.
+        """
+        if self._readOnly:
+            raise sqlite3.OperationalError("board store is read-only")
+        now = time.time()
+        with self._connection:
+            self._connection.executemany(
+                'INSERT INTO solutions VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (fingerprint, key) DO UPDATE SET '
+                'count = excluded.count, score = excluded.score, '
+                'words = excluded.words, lastUsed = excluded.lastUsed',
+                [(fingerprint, boardKey(faces), count, score, ' '.join(words),
+                  now)
+                 for faces, count, score, words in results])
+            if self._maxEntries is not None:
+                excess = len(self) - self._maxEntries
+                if excess > 0:
+                    self._connection.execute(
+                        'DELETE FROM solutions WHERE (fingerprint, key) IN '
+                        '(SELECT fingerprint, key FROM solutions ORDER BY '
+                        'lastUsed LIMIT ?)', (excess,))
+
+    def put(self, fingerprint, faces, count, score, words):
+        """
+        Stores the solution of one board, as described in putMany.
+        """
+        self.putMany(fingerprint, [(faces, count, score, words)])
+
+    def __len__(self):
+        return self._connection.execute(
+            'SELECT n FROM solutionCount').fetchone()[0]
+
+    def close(self):
+        self._connection.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 2:
+        store = BoardStore(sys.argv[1], readOnly=True)
+        print(len(store), "boards")
+        store.close()
+    else:
+        from doctest import testmod
+        testmod()
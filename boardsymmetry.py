@@ -0,0 +1,164 @@
+"""
+Canonical board keys under the symmetries of the grid, and a solver cache
+keyed by them.  Rotating or reflecting a board doesn't change which words it
+holds, so all 8 orientations of a square board (4 of a non-square one) share
+one cache entry; cached paths are mapped back to the caller's orientation.
+"""
+
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def symmetries(rows, cols):
+    """
+    Returns a tuple of cell permutations, one per symmetry of a rows x cols
+    grid (cells numbered column by column).  Permutation perm moves the face
+    in cell perm[i] to cell i.  The identity comes first.
+
+    >>> len(symmetries(4, 4)), len(symmetries(2, 3))
+    (8, 4)
+    >>> symmetries(2, 2)[0]
+    (0, 1, 2, 3)
+    """
+    maps = [lambda c, r: (c, r),
+            lambda c, r: (cols - 1 - c, rows - 1 - r),
+            lambda c, r: (cols - 1 - c, r),
+            lambda c, r: (c, rows - 1 - r)]
+    if rows == cols:
+        n = rows
+        maps += [lambda c, r: (n - 1 - r, c),
+                 lambda c, r: (r, n - 1 - c),
+                 lambda c, r: (r, c),
+                 lambda c, r: (n - 1 - r, n - 1 - c)]
+    perms = []
+    for transform in maps:
+        perm = [0] * (rows * cols)
+        for col in range(cols):
+            for row in range(rows):
+                newCol, newRow = transform(col, row)
+                perm[newCol * rows + newRow] = col * rows + row
+        perms.append(tuple(perm))
+    return tuple(perms)
+
+
+def canonicalForm(faces, rows, cols):
+    """
+    Returns (key, perm): key is the smallest of the board's orientations
+    (a tuple of faces, column by column) and perm is the symmetry that
+    produces it, so key[i] == faces[perm[i]].
+
+    >>> board = ["A", "B", "C", "D"]
+    >>> rotated = ["C", "A", "D", "B"]
+    >>> canonicalForm(board, 2, 2)[0] == canonicalForm(rotated, 2, 2)[0]
+    True
+    """
+    best = None
+    for perm in symmetries(rows, cols):
+        key = tuple([faces[cell] for cell in perm])
+        if best is None or key < best[0]:
+            best = (key, perm)
+    return best
+
+
+class CachedSolver:
+    """A CachedSolver answers solve() like a BoggleSolver, but keeps the
+    results of recently solved boards in a bounded LRU cache keyed by the
+    board's canonical form:
+       *  _solver is the BoggleSolver that solves cache misses
+       *  _cache is an OrderedDict from canonical keys to results (in the
+          canonical orientation), least recently used first
+       *  _maxSize is the most entries _cache may hold
+       *  _hits, _misses count lookups
+       *  _lock makes the cache safe to share between threads
+
+    >>> from lexicon import Lexicon
+    >>> from bogglesolver import BoggleSolver
+    >>> solver = CachedSolver(BoggleSolver(Lexicon(["TIN"])), maxSize=10)
+    >>> solver.solve([["T", "I"], ["N", "E"]])
+    {'TIN': (1, [(0, 0), (0, 1), (1, 0)])}
+    >>> solver.solve([["N", "T"], ["E", "I"]])
+    {'TIN': (1, [(0, 1), (1, 1), (0, 0)])}
+    >>> solver.getStats()
+    {'hits': 1, 'misses': 1, 'size': 1, 'maxSize': 10, 'hitRate': 0.5}
+    """
+
+    __slots__ = ['_solver', '_cache', '_maxSize', '_hits', '_misses',
+                 '_lock']
+
+    def __init__(self, solver, maxSize=4096):
+        self._solver = solver
+        self._cache = OrderedDict()
+        self._maxSize = maxSize
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def getLexicon(self):
+        return self._solver.getLexicon()
+
+    def solve(self, letters, cancelled=None):
+        """
+        Returns the words on letters, as BoggleSolver.solve does, from the
+        cache when this board (in any orientation) was solved recently.
+        """
+        cols = len(letters)
+        rows = len(letters[0]) if cols else 0
+        faces = [face.upper() for column in letters for face in column]
+        key, perm = canonicalForm(faces, rows, cols)
+
+        with self._lock:
+            words = self._cache.get(key)
+            if words is not None:
+                self._cache.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+        if words is None:
+            columns = [list(key[i:i + rows]) for i in range(0, len(key), rows)]
+            words = self._solver.solve(columns, cancelled)
+            if words is None:
+                return None
+            with self._lock:
+                self._cache[key] = words
+                self._cache.move_to_end(key)
+                while len(self._cache) > self._maxSize:
+                    self._cache.popitem(last=False)
+
+        # canonical cell i holds the caller's cell perm[i]
+        result = {}
+        for word, (score, path) in words.items():
+            result[word] = (score, [divmod(perm[col * rows + row], rows)
+                                    for col, row in path])
+        return result
+
+    def solveBoard(self, board):
+        """
+        Returns every word on a BoggleBoard, as described in solve.
+        """
+        return self.solve(board.getLetters())
+
+    def getStats(self):
+        """
+        Returns a dictionary of the cache's hits, misses, size, maxSize and
+        hitRate (hits per lookup).
+        """
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {"hits": self._hits, "misses": self._misses,
+                    "size": len(self._cache), "maxSize": self._maxSize,
+                    "hitRate": self._hits / lookups if lookups else 0.0}
+
+    def clear(self):
+        """
+        Empties the cache and resets the statistics.
+        """
+        with self._lock:
+            self._cache.clear()
+            self._hits = self._misses = 0
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -2,50 +2,93 @@
 Extends the Board class with specific features required for Boggle
 """
 
-from graphics import *
+from backend import *
 from brandom import *
 from boggleletter import BoggleLetter
 from board import Board
+from boardmodel import BoardModel, UNSELECTED, SELECTED, CURRENT
+from boggledice import rollCubes
+from boardsizes import getBoardSize
+from instrument import span
+
+# width and height of the grid in pixels, whatever the board size
+GRID_PIXELS = 200
 
 class BoggleBoard(Board):
     """Boggle Board class implements the functionality of a Boggle board.
     It inherits from the Board class and extends it by creating a grid
-    of BoggleLetters, shaken appropriately to randomize play."""
-
-    __slots__ = ['_grid', "_cubes"]
-
-    def __init__(self, win):
-        super().__init__(win, rows=4, cols=4)
-
-        self._cubes =  [[ "A", "A", "C", "I", "O", "T" ],
-                        [ "T", "Y", "A", "B", "I", "L" ],
-                        [ "J", "M", "O", "Qu", "A", "B"],
-                        [ "A", "C", "D", "E", "M", "P" ],
-                        [ "A", "C", "E", "L", "S", "R" ],
-                        [ "A", "D", "E", "N", "V", "Z" ],
-                        [ "A", "H", "M", "O", "R", "S" ],
-                        [ "B", "F", "I", "O", "R", "X" ],
-                        [ "D", "E", "N", "O", "S", "W" ],
-                        [ "D", "K", "N", "O", "T", "U" ],
-                        [ "E", "E", "F", "H", "I", "Y" ],
-                        [ "E", "G", "I", "N", "T", "V" ],
-                        [ "E", "G", "K", "L", "U", "Y" ],
-                        [ "E", "H", "I", "N", "P", "S" ],
-                        [ "E", "L", "P", "S", "T", "U" ],
-                        [ "G", "I", "L", "R", "U", "W" ]]
+    of BoggleLetters, shaken appropriately to randomize play.  Boards may
+    be 4x4, 5x5 or 6x6 (see boardsizes); the grid takes the same space in
+    the window whatever its size.
+
+    The letters and the selection live in a BoardModel (see boardmodel),
+    which game logic reads and changes; the BoggleLetters only draw it.
+    The board subscribes to the model and redraws the cells that change,
+    remembering what each shows in _drawn so nothing is read back from
+    the graphics objects.
+
+    >>> win = GraphWin("Boggle", 400, 400)
+    >>> board = BoggleBoard(win)
+    >>> model = board.getModel()
+    >>> model.setFace(0, "Qu"); model.select(0); model.select(1)
+    >>> board._grid[0][0].getLetter(), board._grid[0][0].getTextColor()
+    ('Qu', 'green')
+    >>> board.resetColors(); board._grid[0][1].getTextColor()
+    'black'
+    >>> win.close()
+    """
+
+    __slots__ = ['_grid', "_cubes", "_shakeListener", "_boardSize", "_model",
+                 "_drawn"]
+
+    def __init__(self, win, boardSize=4):
+        boardSize = getBoardSize(boardSize)
+        size = boardSize.getSize()
+        super().__init__(win, rows=size, cols=size, size=GRID_PIXELS // size)
+
+        self._boardSize = boardSize
+        self._cubes = boardSize.getCubes()
+        self._shakeListener = None
+        self._model = BoardModel(size, size, boardSize.getAlphabet())
+        # (face, state) each cell is drawn with
+        self._drawn = [('', UNSELECTED)] * (size * size)
 
         self._grid=[]
-        colNum=4; rowNum=4
         
-        for col in range(rowNum):
+        for col in range(size):
             colList=[]
-            for row in range(colNum):
+            for row in range(size):
                 colList.append(BoggleLetter(board=self,col=col,row=row))
             self._grid.append(colList)
 
-        
+        self._model.subscribe(self.__redraw)
         self.shakeCubes()
 
+    def __redraw(self, cells):
+        """
+        Draws cells (a list of cell numbers) as the model now has them.
+        """
+        getFace = self._model.getFace
+        getState = self._model.getState
+        drawn = self._drawn
+        rows = self._rows
+        with self._win.batch():
+            for cell in cells:
+                face, state = getFace(cell), getState(cell)
+                drawnFace, drawnState = drawn[cell]
+                if face == drawnFace and state == drawnState:
+                    continue
+                letter = self._grid[cell // rows][cell % rows]
+                if face != drawnFace:
+                    letter.setLetter(face)
+                if state != drawnState:
+                    if state == UNSELECTED:
+                        letter.setTextColor('black')
+                        letter.setFillColor('white')
+                    else:
+                        letter.setLetterColor(state == CURRENT)
+                drawn[cell] = (face, state)
+
 
     def getBoggleLetterAtPoint(self, point):
         """
@@ -63,6 +106,11 @@ class BoggleBoard(Board):
         >>> board.getBoggleLetterAtPoint(pointIn_1_2) == board._grid[1][2]
         True
         >>> win.close()
+        >>> win = GraphWin("Boggle", 400, 400)
+        >>> big = BoggleBoard(win, 6)
+        >>> big.getBoggleLetterAtPoint(big.getCellCenter(5, 5)) == big._grid[5][5]
+        True
+        >>> win.close()
         """
         if self.inGrid(point):
             y,x=self.getPosition(point)
@@ -70,17 +118,51 @@ class BoggleBoard(Board):
         else:
             return None
 
+    def getCellAtPoint(self, point):
+        """
+        Returns the model's cell number (see boardmodel) of the square that
+        contains the given point in the window, or None if the point is
+        outside the grid.
+        """
+        if self.inGrid(point):
+            col, row = self.getPosition(point)
+            return self._model.getCell(col, row)
+        return None
+
+    def getModel(self):
+        """
+        Returns the BoardModel holding the letters and the selection.
+        """
+        return self._model
+
+    def getBoardSize(self):
+        """
+        Returns the BoardSize (dice, scoring) this board is played with.
+        """
+        return self._boardSize
+
+    def getLetters(self):
+        """
+        Returns the faces currently showing as a list of columns of str,
+        so getLetters()[col][row] is the letter at (col, row).
+        """
+        return self._model.getLetters()
+
+    def setShakeListener(self, listener):
+        """
+        Sets a function (taking no arguments) to be called every time the
+        cubes are shaken, or None to stop notifications.
+        """
+        self._shakeListener = listener
+
     def resetColors(self):
         """
         "Unclicks" all boggle letters on the board without changing any
-        other attributes.  (Change letter colors back to default values.)
+        other attributes: the model's selection is cleared, which changes
+        the colors of the selected letters back to the default.
         """
-        for row in self._grid:
-            for item in row:
-                if item.getTextColor()!='black':
-                    item.setTextColor('black')
-                if item.getFillColor()!='white':
-                    item.setFillColor('white')
+        with span('BoggleBoard.resetColors'):
+            self._model.clearSelection()
 
     def reset(self):
         """
@@ -88,42 +170,41 @@ class BoggleBoard(Board):
         clears all text areas (right, lower, upper) on board
         and resets the letters on board by calling shakeCubes.
         """
-        self.resetColors()
-        self.setStringToTextArea('')
-        self.setStringToLowerText('')
-        self.setStringToUpperText('')
-        self.shakeCubes()
+        with self._win.batch():
+            self.resetColors()
+            self.setStringToTextArea('')
+            self.setStringToLowerText('')
+            self.setStringToUpperText('')
+            self.shakeCubes()
 
     def shakeCubes(self):
         """
         Shakes the boggle board and sets letters as described by the handout.
         """
-        cubeList=[]
-        for cube in shuffled(self._cubes):
-            cubeList.append(cube[randomInt(0,5)])
-        c=0
-        for row in self._grid:
-            for item in row:
-                item.setLetter(cubeList[c])
-                c+=1
+        with span('BoggleBoard.shakeCubes'):
+            self._model.setFaces(rollCubes(self._cubes))
+        if self._shakeListener is not None:
+            self._shakeListener()
 
     def __str__(self):
         """
         Returns a string representation of this BoggleBoard
         """
+        colors = {UNSELECTED: 'black', SELECTED: 'green', CURRENT: 'blue'}
+        model = self._model
         board = ''
         for r in range(self._rows):
             for c in range(self._cols):
-                boggleLetter = self._grid[c][r]
-                color = boggleLetter.getTextColor()
-                letter = boggleLetter.getLetter()
-                board += '[{}:{}] '.format(letter,color)
+                cell = model.getCell(c, r)
+                board += '[{}:{}] '.format(model.getFace(cell),
+                                           colors[model.getState(cell)])
             board += '\n'
         return board
 
 
 if __name__ == "__main__":
     from doctest import testmod
+    from eventloop import GameLoop
     testmod()
 
     # # Uncomment this code when you are ready to test it!
@@ -137,11 +218,12 @@ if __name__ == "__main__":
     board = BoggleBoard(win)
     print(board)
     
-    keepGoing = True
-    while keepGoing:
-        pt = win.getMouse()
+    def onClick(pt):
         if board.inExit(pt):
-            keepGoing = False
+            return False
         elif board.inGrid(pt):
             (col, row) = board.getPosition(pt)
-            print("{} at {}".format(board._grid[col][row], (pt.getX(), pt.getY())))
\ No newline at end of file
+            print("{} at {}".format(board._grid[col][row], (pt.getX(), pt.getY())))
+        return True
+
+    GameLoop(win, onClick).run()
@@ -0,0 +1,128 @@
+"""
+The Boggle dice and the logic for rolling them, kept free of any graphics
+so boards can be generated without a window.
+"""
+
+from brandom import shuffled, randomInt
+
+CUBES = [[ "A", "A", "C", "I", "O", "T" ],
+         [ "T", "Y", "A", "B", "I", "L" ],
+         [ "J", "M", "O", "Qu", "A", "B"],
+         [ "A", "C", "D", "E", "M", "P" ],
+         [ "A", "C", "E", "L", "S", "R" ],
+         [ "A", "D", "E", "N", "V", "Z" ],
+         [ "A", "H", "M", "O", "R", "S" ],
+         [ "B", "F", "I", "O", "R", "X" ],
+         [ "D", "E", "N", "O", "S", "W" ],
+         [ "D", "K", "N", "O", "T", "U" ],
+         [ "E", "E", "F", "H", "I", "Y" ],
+         [ "E", "G", "I", "N", "T", "V" ],
+         [ "E", "G", "K", "L", "U", "Y" ],
+         [ "E", "H", "I", "N", "P", "S" ],
+         [ "E", "L", "P", "S", "T", "U" ],
+         [ "G", "I", "L", "R", "U", "W" ]]
+
+# the 25 dice of Big Boggle (5x5)
+BIG_CUBES = [[ "A", "A", "A", "F", "R", "S" ],
+             [ "A", "A", "E", "E", "E", "E" ],
+             [ "A", "A", "F", "I", "R", "S" ],
+             [ "A", "D", "E", "N", "N", "N" ],
+             [ "A", "E", "E", "E", "E", "M" ],
+             [ "A", "E", "E", "G", "M", "U" ],
+             [ "A", "E", "G", "M", "N", "N" ],
+             [ "A", "F", "I", "R", "S", "Y" ],
+             [ "B", "J", "K", "Qu", "X", "Z" ],
+             [ "C", "C", "N", "S", "T", "W" ],
+             [ "C", "E", "I", "I", "L", "T" ],
+             [ "C", "E", "I", "L", "P", "T" ],
+             [ "C", "E", "I", "P", "S", "T" ],
+             [ "D", "D", "L", "N", "O", "R" ],
+             [ "D", "H", "H", "L", "O", "R" ],
+             [ "D", "H", "H", "N", "O", "T" ],
+             [ "D", "H", "L", "N", "O", "R" ],
+             [ "E", "I", "I", "I", "T", "T" ],
+             [ "E", "M", "O", "T", "T", "T" ],
+             [ "E", "N", "S", "S", "S", "U" ],
+             [ "F", "I", "P", "R", "S", "Y" ],
+             [ "G", "O", "R", "R", "V", "W" ],
+             [ "H", "I", "P", "R", "R", "Y" ],
+             [ "N", "O", "O", "T", "U", "W" ],
+             [ "O", "O", "O", "T", "T", "U" ]]
+
+# the 36 dice of Super Big Boggle (6x6).  The original's three blank faces
+# (on the E I O die) can never be used in a word, so they are left out and
+# that die is rolled as E I O E I O.
+SUPER_CUBES = [[ "A", "A", "A", "F", "R", "S" ],
+               [ "A", "A", "E", "E", "E", "E" ],
+               [ "A", "A", "E", "E", "O", "O" ],
+               [ "A", "A", "F", "I", "R", "S" ],
+               [ "A", "B", "D", "E", "I", "O" ],
+               [ "A", "D", "E", "N", "N", "N" ],
+               [ "A", "E", "E", "E", "E", "M" ],
+               [ "A", "E", "E", "G", "M", "U" ],
+               [ "A", "E", "G", "M", "N", "N" ],
+               [ "A", "E", "I", "L", "M", "N" ],
+               [ "A", "E", "I", "N", "O", "U" ],
+               [ "A", "F", "I", "R", "S", "Y" ],
+               [ "An", "Er", "He", "In", "Qu", "Th" ],
+               [ "B", "B", "J", "K", "X", "Z" ],
+               [ "C", "C", "E", "N", "S", "T" ],
+               [ "C", "D", "D", "L", "N", "N" ],
+               [ "C", "E", "I", "I", "T", "T" ],
+               [ "C", "E", "I", "P", "S", "T" ],
+               [ "C", "F", "G", "N", "U", "Y" ],
+               [ "D", "D", "H", "N", "O", "T" ],
+               [ "D", "H", "H", "L", "O", "R" ],
+               [ "D", "H", "H", "N", "O", "W" ],
+               [ "D", "H", "L", "N", "O", "R" ],
+               [ "E", "H", "I", "L", "R", "S" ],
+               [ "E", "I", "I", "L", "S", "T" ],
+               [ "E", "I", "L", "P", "S", "T" ],
+               [ "E", "I", "O", "E", "I", "O" ],
+               [ "E", "M", "T", "T", "T", "O" ],
+               [ "E", "N", "S", "S", "S", "U" ],
+               [ "G", "O", "R", "R", "V", "W" ],
+               [ "H", "I", "R", "S", "T", "V" ],
+               [ "H", "O", "P", "R", "S", "T" ],
+               [ "I", "P", "R", "S", "Y", "Y" ],
+               [ "J", "K", "Qu", "W", "X", "Z" ],
+               [ "N", "O", "O", "T", "U", "W" ],
+               [ "O", "O", "O", "T", "T", "U" ]]
+
+
+def rollCubes(cubes=CUBES, rng=None):
+    """
+    Shuffles the cubes and rolls each one, returning the list of faces
+    in the order BoggleBoard.shakeCubes places them on the grid (column by
+    column).  With no rng the brandom functions are used, so the result is
+    exactly what shakeCubes would show; otherwise rng is a random.Random,
+    and seeding it with s gives the board shown after randomize(s).
+
+    >>> import random
+    >>> faces = rollCubes(rng=random.Random(7))
+    >>> len(faces), faces == rollCubes(rng=random.Random(7))
+    (16, True)
+    >>> from brandom import randomize
+    >>> randomize(7); faces == rollCubes()
+    True
+    """
+    if rng is None:
+        return [cube[randomInt(0, len(cube) - 1)] for cube in shuffled(cubes)]
+    mixed = list(cubes)
+    rng.shuffle(mixed)
+    return [cube[rng.randint(0, len(cube) - 1)] for cube in mixed]
+
+
+def toColumns(faces, rows):
+    """
+    Splits a flat list of faces (column by column) into a list of columns.
+
+    >>> toColumns(["A", "B", "C", "D", "E", "F"], 3)
+    [['A', 'B', 'C'], ['D', 'E', 'F']]
+    """
+    return [faces[i:i + rows] for i in range(0, len(faces), rows)]
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
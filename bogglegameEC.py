@@ -1,50 +1,222 @@
-"""Implements the logic of the game of boggle."""
+"""Implements the logic of the game of boggle.
 
-from graphics import GraphWin
+    python3 bogglegameEC.py [4|5|6]      # board size, 4x4 by default
+
+Words can be clicked out on the grid or typed: Return enters the typed
+word, BackSpace takes back a letter and Escape clears it.
+
+With BOGGLE_RECORD=file the game's clicks and key presses are recorded (see
+clickstream.py) so it can be replayed with replay.py.
+"""
+
+import os
+import sys
+
+from backend import GraphWin
 from boggleboard import BoggleBoard
 from boggleletter import BoggleLetter
 from brandom import randomize
+from lexiconregistry import loadLexiconAsync
+from lexicon import LexiconCursor
+from tilealphabet import getTokenLexiconAsync
+from typedentry import PathTracker
+from eventloop import GameLoop
+from wordlistview import WordListView
+from clickstream import ClickRecorder, newSeed
+from backgroundsolver import BackgroundSolver
+from bogglesolver import totalScore
+from instrument import span, profiled, isEnabled, report
 
 
 
 class BoggleGame:
 
-    __slots__ = [ "_validWords", "_board", "_foundWords", "_selectedLetters", "_score", "_maxScore", "_scoreDict" ]
+    __slots__ = [ "_validWords", "_board", "_foundWords", "_model", "_score", "_maxScore", "_scoreDict",
+                  "_background", "_possibleScore", "_cursor", "_currentWord", "_wordList",
+                  "_alphabet", "_tokenWords", "_tracker", "_typedCursor" ]
 
-    def __init__(self, win):
+    def __init__(self, win, lexiconName='bogwords.txt', backgroundSolve=True, boardSize=4):
         """
-        Create a new Boggle Game and load in our lexicon.
+        Create a new Boggle Game of the given board size (4, 5 or 6) and
+        load in our lexicon.  Unless backgroundSolve is False, every board is
+        also solved on a worker thread so the score can be shown out of the
+        board's possible score.
         """
-        # set up the set of valid words we can match
-        self._validWords = self.__readLexicon()
-        
+        # start loading the set of valid words we can match in the
+        # background, so the window is drawn without waiting on file I/O
+        pendingWords = loadLexiconAsync(lexiconName)
 
         # init other attributes here.
-        self._scoreDict={4:1,5:2,6:3,3:1,7:5}
         self._score=0
         self._maxScore=0
-        self._board=BoggleBoard(win)
-        self._foundWords=[]
-        self._selectedLetters=[]
-        self._validWords=[]
-        self._validWords=self.__readLexicon()
+        self._board=BoggleBoard(win, boardSize)
+        self._scoreDict=self._board.getBoardSize().getScoreDict()
+        # found words in the order they were found; a dict so checking for
+        # a repeat doesn't scan the list
+        self._foundWords={}
+        # the letters and the selected cells; the board draws them
+        self._model=self._board.getModel()
+        self._validWords=pendingWords.result()
+
+        # the selected word, and where it is in the lexicon compiled to
+        # the dice's tiles, grown one tile per click; the lexicon is
+        # compiled in the background while the window is drawn, and the
+        # cursor made on the first click
+        self._alphabet=self._board.getBoardSize().getAlphabet()
+        self._currentWord=''
+        self._tokenWords=getTokenLexiconAsync(self._validWords, self._alphabet)
+        self._cursor=None
+
+        # the paths spelling the typed word, made for each board on the
+        # first key press, and where it is in the lexicon, grown one letter
+        # per key
+        self._tracker=None
+        self._typedCursor=LexiconCursor(self._validWords)
+
+        # the found words, drawn a line at a time in the column right of the grid
+        self._wordList=WordListView(win, self._board.getTextAreaAnchor().getX(),
+                                    self._board.getYInset(), win.getHeight())
+
+        # solve each new board in the background for its possible score
+        self._possibleScore=None
+        self._background=None
+        if backgroundSolve:
+            solver=self._board.getBoardSize().makeSolver(self._validWords)
+            self._background=BackgroundSolver(win, solver)
+            self._board.setShakeListener(self.__solveBoard)
+            self.__solveBoard()
+
+    def __solveBoard(self):
+        """
+        Starts solving the current board, cancelling the solve of the
+        previous one if it is still running.
+        """
+        self._possibleScore=None
+        self._background.submit(self._board.getLetters(), self.__showPossibleScore)
 
-    def __readLexicon(self, lexiconName='bogwords.txt'):
+    def __showPossibleScore(self, words):
         """
-        A helper method to read the lexicon and return it as a set.
+        Receives the words on the board from the background solver (on the
+        window's thread) and shows the possible score.
         """
-        validWords = set()
-        with open(lexiconName) as f:
-          for line in f:
-            validWords.add(line.strip().upper())
+        self._possibleScore=totalScore(words)
+        self.showScore()
 
-        return validWords
+    def getPossibleScore(self):
+        """
+        Returns the total score of every word on the board, or None if the
+        board has not been solved yet.
+        """
+        return self._possibleScore
     
+    def getBoard(self):
+        return self._board
+
+    def getScore(self):
+        return self._score
+
+    def getMaxScore(self):
+        return self._maxScore
+
+    def getFoundWords(self):
+        return list(self._foundWords)
+
+    def getCurrentWord(self):
+        return self._currentWord
+
+    def getSelectionStatus(self):
+        """
+        Returns a tuple (isPrefix, completions) for the selected letters:
+        whether some word starts with them and how many words do.
+        """
+        cursor=self.__clickCursor()
+        return cursor.isPrefix(), cursor.countCompletions()
+
+    def __clickCursor(self):
+        """
+        Returns the cursor following the selected tiles, making it once the
+        compiled lexicon is ready (waiting for it if need be).
+        """
+        if self._cursor is None:
+            self._cursor=LexiconCursor(self._tokenWords.result())
+        return self._cursor
+
+    def __selectCell(self, cell):
+        """
+        Adds cell to the selection, moves the lexicon cursor over its tile
+        and shows the word so far with the number of words that complete
+        it, in red if none do.
+        """
+        self._model.select(cell)
+        self._currentWord+=self._model.getFace(cell)
+        with span('BoggleGame.lexicon'):
+            cursor=self.__clickCursor()
+            cursor.advanceToken(self._model.getTile(cell))
+            completions=cursor.countCompletions()
+        self._board.setStringToLowerText('{} ({})'.format(self._currentWord,completions))
+        self._board.setLowerTextColor('black' if completions else 'red')
+
+    def newBoard(self):
+        """
+        Shakes a new board and clears found words, score and selected letters.
+
+        >>> from backend import GraphWin, Point
+        >>> game = BoggleGame(GraphWin("Boggle", 400, 400), backgroundSolve=False)
+        >>> game.doOneClick(Point(90, 325)), game.getScore(), game.getFoundWords()
+        (True, 0, [])
+        >>> game.getBoard().getWin().close()
+        """
+        self._board.reset()
+        self._score=0; self._foundWords={}
+        self._wordList.clear()
+        self._currentWord=''
+        if self._cursor is not None:
+            self._cursor.reset()
+        self._typedCursor.reset()
+        self._tracker=None
+
+    def addWord(self, currentWord):
+        """
+        Scores currentWord (str, as spelled by the board's letters) and adds
+        it to the found words if it is a valid word, long enough for the
+        board's size, that has not been found yet.  Returns True if the word
+        was added.  The caller is responsible for checking that the word can
+        be spelled on the board.
+        """
+        boardSize=self._board.getBoardSize()
+        if len(currentWord)<boardSize.getMinWordLength():
+            return False
+        if currentWord.upper() in self._validWords and currentWord not in self._foundWords:
+            #Add current word to the list and score, display list
+            self._foundWords[currentWord]=None
+            self._score+=boardSize.scoreWord(currentWord)
+            self._wordList.append(currentWord)
+            return True
+        return False
+
+    def showScore(self):
+        """
+        Updates the max score and displays the current score (out of the
+        possible score, once the board is solved) and the max score.
+        """
+        if self._score>self._maxScore:
+            self._maxScore=self._score
+        if self._possibleScore is None:
+            score='{}'.format(self._score)
+        else:
+            score='{} / {}'.format(self._score,self._possibleScore)
+        self._board.setStringToUpperText('Current Score: {}, Max Score: {}'.format(score,self._maxScore))
+
     def endWord(self):
         """
         A helper method to reset the board to have no letters selected
         """
-        self._selectedLetters=[]
+        self._currentWord=''
+        if self._cursor is not None:
+            self._cursor.reset()
+        self._typedCursor.reset()
+        if self._tracker is not None:
+            self._tracker.reset()
         self._board.setStringToLowerText('')
         self._board.resetColors()
 
@@ -53,69 +225,200 @@ class BoggleGame:
         """
         Implements the logic for processing one click.
         Returns True if play should continue, and False if the game is over.
+        All of the click's drawing is batched into a single window update.
+        With instrumentation enabled, the click and the branch it took are
+        timed (doOneClick.exit, .reset, .select, .wordEnd, .cancel).
+        """
+        with span('BoggleGame.doOneClick'), self._board.getWin().batch():
+            return self.__processClick(point)
+
+    def __processClick(self, point):
+        """
+        Updates the game state and board for one click (see doOneClick).
         """
         # These steps are one way to think about the design, although
         # you are free to do things differently if you prefer.
 
         # step 1: check for exit button and return False if clicked
         if self._board.inExit(point):
-            return False
+            with span('doOneClick.exit'):
+                return False
         # step 2: check for reset button and reset board, found words, score and selected letters
         elif self._board.inReset(point):
-            self._board.reset()
-            self._selectedLetters=[]; self._score=0; self._foundWords=[]
+            with span('doOneClick.reset'):
+                self.newBoard()
         # step 3: check if click is on a cell in the grid
         elif self._board.inGrid(point):
-            # get BoggleLetter at point
-            letter=self._board.getBoggleLetterAtPoint(point)
+            model=self._model
+            # a click on the grid abandons a typed word, and the path of
+            # an entered one (a selection the cursor did not follow)
+            if ((self._tracker is not None and self._tracker.getText())
+                    or self.__clickCursor().getDepth()!=model.getPathLength()):
+                self.endWord()
+
+            # get the cell at point, and the last one selected
+            cell=self._board.getCellAtPoint(point)
+            last=model.getLastCell()
 
             # if this is the first letter in a word being constructed,
-            # add letter and display it on lower text of board, make letter blue
-            if self._selectedLetters==[]:
-                self._selectedLetters.append(letter)
-                self._board.setStringToLowerText(letter.getLetter())
-                letter.setLetterColor(True)
+            # select it (the board shows it blue) and display the word
+            if last is None:
+                with span('doOneClick.select'):
+                    self.__selectCell(cell)
 
             # else if adding a letter to a non-empty word, make sure it's adjacent, and not already selected,
-            # and update state
-            elif self._selectedLetters[len(self._selectedLetters)-1].isAdjacent(letter) and letter not in self._selectedLetters:
-                #Set previous letters to green, and current to blue
-                [let.setLetterColor(False) for let in self._selectedLetters]; letter.setLetterColor(True)
-
-                #Add the letter to list of selected letters and update lower text
-                self._selectedLetters.append(letter)
-                self._board.setStringToLowerText(''.join([letter.getLetter() for letter in self._selectedLetters]))
+            # and update state; the board turns the previous letter green
+            elif model.isAdjacent(last, cell) and not model.isSelected(cell):
+                with span('doOneClick.select'):
+                    self.__selectCell(cell)
             
             # else if clicked on same letter as last time, end word and check for validity
-            elif self._selectedLetters[len(self._selectedLetters)-1]==letter:
-                currentWord=''.join([letter.getLetter() for letter in self._selectedLetters])
-                if currentWord.upper() in self._validWords and currentWord not in self._foundWords:
-                    #Add current word to the list and score, display list, and end word
-                    self._foundWords.append(currentWord)
-                    self._score+=self._scoreDict.get(len(currentWord),11)
-                    self._board.setStringToTextArea('\n'.join(self._foundWords))
-                self.endWord()
+            elif last==cell:
+                with span('doOneClick.wordEnd'):
+                    #Add a valid new word to the list and score, and end word
+                    if self.__clickCursor().isWord():
+                        self.addWord(self.__clickCursor().getWord())
+                    self.endWord()
             # else if clicked anywhere else, reset the state to an empty word.
             else:
-                self.endWord()
-        if self._score>self._maxScore:
-            self._maxScore=self._score
+                with span('doOneClick.cancel'):
+                    self.endWord()
         #Display current score and max score
-        self._board.setStringToUpperText('Current Score: {}, Max Score: {}'.format(self._score,self._maxScore))
+        with span('BoggleGame.showScore'):
+            self.showScore()
         # return True to indicate we want to keep playing
         return True
 
+    def doOneKey(self, key):
+        """
+        Implements the logic for one key press (key is a Tk keysym such as
+        'a', 'Return' or 'BackSpace').  Letters are added to the typed word
+        and followed across the board as they arrive (see typedentry), so
+        Return accepts or rejects the word without searching the board;
+        the path of an accepted word is highlighted.  Returns True, as a
+        key never ends the game.
+
+        >>> from backend import GraphWin
+        >>> from lexicon import Lexicon
+        >>> from brandom import randomize
+        >>> randomize(3)
+        >>> win = GraphWin("Boggle", 400, 400)
+        >>> game = BoggleGame(win, backgroundSolve=False)
+        >>> game._validWords = Lexicon(["TIN", "QUIT"])
+        >>> game._typedCursor = LexiconCursor(game._validWords)
+        >>> model = game.getBoard().getModel()
+        >>> model.setFace(model.getCell(0, 0), "T")
+        >>> model.setFace(model.getCell(1, 1), "I")
+        >>> model.setFace(model.getCell(1, 0), "N")
+        >>> for key in ["t", "i", "x", "BackSpace", "n"]:
+        ...     _ = game.doOneKey(key)
+        >>> game.getBoard().getStringFromLowerText()
+        'TIN (1)'
+        >>> _ = game.doOneKey("Return"); game.getFoundWords(), game.getScore()
+        (['TIN'], 1)
+        >>> model.getPath() == [model.getCell(0, 0), model.getCell(1, 1), model.getCell(1, 0)]
+        True
+        >>> model.getLastCell() == model.getCell(1, 0)
+        True
+        >>> for key in ["q", "u", "i", "t", "Return"]:
+        ...     _ = game.doOneKey(key)
+        >>> game.getBoard().getStringFromLowerText()
+        'QUIT is not on the board'
+        >>> win.close()
+        """
+        with span('BoggleGame.doOneKey'), self._board.getWin().batch():
+            if len(key)==1 and key.isalpha():
+                self.__typeLetter(key.upper())
+            elif key=='BackSpace':
+                if self._tracker is not None and self._tracker.getText():
+                    self._tracker.back()
+                    self._typedCursor.back()
+                    self._currentWord=self._currentWord[:-1]
+                    self.__showTyped()
+            elif key in ('Return', 'KP_Enter'):
+                self.__enterTyped()
+            elif key=='Escape':
+                self.endWord()
+            with span('BoggleGame.showScore'):
+                self.showScore()
+        return True
+
+    def __typeLetter(self, char):
+        """
+        Adds char to the typed word, ending any word being clicked out.
+        """
+        if self._tracker is None:
+            self._tracker=PathTracker(self._board.getLetters())
+        if self._model.hasSelection() or not self._tracker.getText():
+            self.endWord()
+        with span('doOneKey.type'):
+            self._tracker.type(char)
+            self._typedCursor.advance(char)
+            self._currentWord+=char
+            self.__showTyped()
+
+    def __showTyped(self):
+        """
+        Shows the typed word with the number of words that complete it, in
+        red if none do or the board cannot spell it.
+        """
+        if not self._currentWord:
+            self._board.setStringToLowerText('')
+            return
+        completions=self._typedCursor.countCompletions()
+        self._board.setStringToLowerText('{} ({})'.format(self._currentWord,completions))
+        live=completions and self._tracker.isLive()
+        self._board.setLowerTextColor('black' if live else 'red')
+
+    def __enterTyped(self):
+        """
+        Adds the typed word if it is on the board, highlighting its path, or
+        says why it was not added.
+        """
+        if self._tracker is None or not self._tracker.getText():
+            return
+        with span('doOneKey.enter'):
+            word=self._currentWord
+            path=self._tracker.getPath()
+            isWord=self._typedCursor.isWord()
+            self.endWord()
+            if path is None:
+                self._board.setStringToLowerText('{} is not on the board'.format(word))
+            elif not isWord or not self.addWord(word):
+                self._board.setStringToLowerText('{} is not a new word'.format(word))
+            else:
+                self._model.setPath([self._model.getCell(col, row) for col, row in path])
+                return
+            self._board.setLowerTextColor('red')
+
 if __name__ == '__main__':
 
     # When you are ready to run on different boards,
     # insert a call to randomize() here.  BUT you will
     # find it much easier to test your code without
     # randomizing things!
-    randomize()
+    # the seed is kept so a recorded game can be replayed
+    seed = newSeed()
+    boardSize = int(sys.argv[1]) if len(sys.argv) > 1 else 4
     win = GraphWin("Boggle", 400, 400)
-    game = BoggleGame(win)
-    
-    keepGoing = True
-    while keepGoing:
-        point = win.getMouse()
-        keepGoing = game.doOneClick(point)
+    randomize(seed)
+    game = BoggleGame(win, boardSize=boardSize)
+
+    onClick = game.doOneClick
+    onKey = game.doOneKey
+    recordFile = recorder = None
+    if os.environ.get('BOGGLE_RECORD'):
+        recordFile = open(os.environ['BOGGLE_RECORD'], 'wb')
+        recorder = ClickRecorder(recordFile, seed, boardSize)
+        onClick = recorder.wrap(game.doOneClick)
+        onKey = recorder.wrapKeys(game.doOneKey)
+
+    # clicks and keys are dispatched to doOneClick and doOneKey as they
+    # happen until doOneClick returns False; BOGGLE_PROFILE=file profiles the whole session
+    with profiled(os.environ.get('BOGGLE_PROFILE')):
+        GameLoop(win, onClick, onKey).run()
+    if recorder is not None:
+        recorder.finish(game.getScore(), game.getFoundWords())
+        recordFile.close()
+    if isEnabled():
+        report()
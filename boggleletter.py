@@ -2,7 +2,7 @@
 Implements the functionality of a single letter squanre on the Boggle board.
 """
 
-from graphics import *
+from backend import *
 from board import Board
 
 class BoggleLetter:
@@ -0,0 +1,298 @@
+"""
+An asyncio server that hosts many headless Boggle games in one process.
+
+    python3 boggleserver.py --port 8765 [--store boards.db]
+
+Clients connect over TCP and send one JSON object per line; every request
+gets one JSON response line, echoing the request's "id" if it had one.
+A connection may drive any number of sessions.  Requests:
+
+    {"op": "open", "size": n}               -> {"session": s, "board": [...]}
+    {"op": "new", "session": s}             -> {"board": [...]}
+    {"op": "select", "session": s, "col": c, "row": r}
+                                            -> {"word": ..., "prefix": ...,
+                                                "completions": ..., "score": ...}
+    {"op": "submit", "session": s, "word": w}
+                                            -> {"accepted": ..., "score": ...}
+    {"op": "score", "session": s}           -> {"score": ..., "maxScore": ...,
+                                                "words": [...]}
+    {"op": "close", "session": s}           -> {}
+
+The optional "size" of a new session's board is 4 (the default), 5 or 6.
+Every response has "ok"; failed requests have "ok": false and an "error".
+Boards are lists of columns of faces, as returned by BoggleBoard.getLetters.
+With --store, every board the server solves is added to that BoardStore.
+"""
+
+import os
+os.environ.setdefault('BOGGLE_BACKEND', 'headless')
+
+import argparse
+import asyncio
+import json
+import sys
+import traceback
+
+from backend import GraphWin
+from bogglegameEC import BoggleGame
+from boardstore import BoardStore, solverFingerprint
+from boardsymmetry import CachedSolver
+from boardsizes import getBoardSize
+from bogglesolver import totalScore
+from lexiconregistry import getLexicon
+from tilealphabet import normalizeFace
+
+
+class BoggleSession:
+    """A BoggleSession is one player's game:
+       *  _game is a BoggleGame on a headless window
+       *  _paths maps each word on the current board to a path spelling it
+       *  _possibleScore is the total score of the words on the board
+    """
+
+    __slots__ = ['_game', '_paths', '_possibleScore']
+
+    def __init__(self, solver, lexiconName='bogwords.txt', boardSize=4):
+        self._game = BoggleGame(GraphWin("Boggle", 400, 400), lexiconName,
+                                backgroundSolve=False, boardSize=boardSize)
+        self.__solve(solver)
+
+    def __solve(self, solver):
+        words = solver.solveBoard(self._game.getBoard())
+        self._paths = {word: path for word, (score, path) in words.items()}
+        self._possibleScore = totalScore(words)
+
+    def getSolution(self):
+        """
+        Returns the current board as a flat list of faces and its (word
+        count, total score, sorted words), as kept in a BoardStore.
+        """
+        faces = [face for column in self._game.getBoard().getLetters()
+                 for face in column]
+        return faces, len(self._paths), self._possibleScore, sorted(self._paths)
+
+    def getGame(self):
+        return self._game
+
+    def newBoard(self, solver):
+        """
+        Shakes a new board and resets the score and found words.
+        """
+        self._game.newBoard()
+        self.__solve(solver)
+
+    def select(self, col, row):
+        """
+        Clicks the letter at (col, row), exactly as a player would.
+        """
+        self._game.doOneClick(self._game.getBoard().getCellCenter(col, row))
+
+    def submit(self, word):
+        """
+        Scores word (str, any case) if it can be spelled on the board and
+        has not been found yet.  Returns True if it was accepted.
+        """
+        word = normalizeFace(word)
+        if word not in self._paths:
+            return False
+        accepted = self._game.addWord(word)
+        self._game.showScore()
+        return accepted
+
+
+class BoggleServer:
+    """A BoggleServer answers line-delimited JSON requests for any number of
+    sessions, which all share one read-only lexicon:
+       *  _solvers maps each board size played to the solver that finds
+          every word on a session's board; it caches results by canonical
+          board, so rotated or mirrored repeats are free
+       *  _lexiconName is the lexicon file the games share
+       *  _sessions maps session ids (int) to BoggleSessions
+       *  _nextSession is the next session id to hand out
+       *  _store is the BoardStore solved boards are recorded in, or None
+       *  _fingerprints maps each board size played to the fingerprint its
+          boards are recorded under (see boardstore.solverFingerprint)
+
+    Requests can be handled directly, without a network:
+
+    >>> server = BoggleServer()
+    >>> session = server.handleRequest({"op": "open", "id": 1})
+    >>> session["ok"], session["id"], len(session["board"])
+    (True, 1, 4)
+    >>> s = session["session"]
+    >>> server.handleRequest({"op": "select", "session": s, "col": 0, "row": 0})["word"] != ""
+    True
+    >>> server.handleRequest({"op": "submit", "session": s, "word": "zzzz"})["accepted"]
+    False
+    >>> new = server.handleRequest({"op": "new", "session": s})
+    >>> new["ok"], len(new["board"])
+    (True, 4)
+    >>> server.handleRequest({"op": "score", "session": 99})
+    {'ok': False, 'error': 'no session 99'}
+    >>> server.handleRequest({"op": "select", "session": s, "col": 1})
+    {'ok': False, 'error': "missing field 'row'"}
+    >>> len(server.handleRequest({"op": "open", "size": 6})["board"])
+    6
+    >>> server.handleRequest({"op": "open", "size": 9})["error"]
+    'no 9x9 Boggle; sizes are 4, 5, 6'
+    >>> server.handleRequest({"op": "select", "session": s, "col": float("inf"),
+    ...                       "row": 0}, file=None)["error"]
+    'internal error: OverflowError: cannot convert float infinity to integer'
+    """
+
+    __slots__ = ['_solvers', '_lexiconName', '_sessions', '_nextSession',
+                 '_store', '_fingerprints']
+
+    def __init__(self, lexiconName='bogwords.txt', store=None):
+        self._solvers = {}
+        self._lexiconName = lexiconName
+        self._sessions = {}
+        self._nextSession = 1
+        self._store = store
+        self._fingerprints = {}
+
+    def getSessionCount(self):
+        return len(self._sessions)
+
+    def getSolverStats(self, boardSize=4):
+        return self.__solver(boardSize).getStats()
+
+    def __solver(self, boardSize):
+        solver = self._solvers.get(boardSize)
+        if solver is None:
+            solver = CachedSolver(getBoardSize(boardSize).makeSolver(
+                getLexicon(self._lexiconName)))
+            self._solvers[boardSize] = solver
+        return solver
+
+    def __session(self, request):
+        sessionId = request.get("session")
+        session = self._sessions.get(sessionId)
+        if session is None:
+            raise ValueError("no session {}".format(sessionId))
+        return session
+
+    def __record(self, session):
+        if self._store is not None:
+            boardSize = session.getGame().getBoard().getBoardSize()
+            fingerprint = self._fingerprints.get(boardSize.getSize())
+            if fingerprint is None:
+                fingerprint = self._fingerprints[boardSize.getSize()] = (
+                    solverFingerprint(getLexicon(self._lexiconName), boardSize))
+            self._store.putMany(fingerprint, [session.getSolution()])
+
+    def handleRequest(self, request, file=sys.stderr):
+        """
+        Handles one decoded request (dict) and returns the response (dict).
+        A request that fails unexpectedly gets an "internal error" response,
+        so one bad request can't end the other sessions on its connection;
+        its traceback is printed to file, unless file is None.
+        """
+        try:
+            response = self.__dispatch(request)
+            response["ok"] = True
+        except KeyError as e:
+            response = {"ok": False, "error": "missing field {}".format(e)}
+        except (ValueError, TypeError) as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e:
+            if file is not None:
+                traceback.print_exc(file=file)
+            response = {"ok": False, "error": "internal error: {}: {}".format(
+                type(e).__name__, e)}
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    def __dispatch(self, request):
+        op = request.get("op")
+        if op == "open":
+            boardSize = int(request.get("size", 4))
+            solver = self.__solver(boardSize)
+            sessionId = self._nextSession
+            self._nextSession += 1
+            session = BoggleSession(solver, self._lexiconName, boardSize)
+            self._sessions[sessionId] = session
+            self.__record(session)
+            return {"session": sessionId,
+                    "board": session.getGame().getBoard().getLetters()}
+        session = self.__session(request)
+        game = session.getGame()
+        board = game.getBoard()
+        if op == "new":
+            session.newBoard(self.__solver(board.getRows()))
+            self.__record(session)
+            return {"board": game.getBoard().getLetters()}
+        elif op == "select":
+            col, row = int(request["col"]), int(request["row"])
+            if not (0 <= col < board.getCols() and 0 <= row < board.getRows()):
+                raise ValueError("cell ({}, {}) is off the board".format(col, row))
+            session.select(col, row)
+            isPrefix, completions = game.getSelectionStatus()
+            return {"word": game.getCurrentWord(), "prefix": isPrefix,
+                    "completions": completions, "score": game.getScore()}
+        elif op == "submit":
+            accepted = session.submit(str(request["word"]))
+            return {"accepted": accepted, "score": game.getScore()}
+        elif op == "score":
+            return {"score": game.getScore(), "maxScore": game.getMaxScore(),
+                    "words": game.getFoundWords()}
+        elif op == "close":
+            del self._sessions[request["session"]]
+            return {}
+        raise ValueError("unknown op {!r}".format(op))
+
+    async def handleConnection(self, reader, writer):
+        """
+        Serves requests from one client connection until it closes.
+        """
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as e:
+                    response = {"ok": False, "error": str(e)}
+                else:
+                    response = self.handleRequest(request)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # the client went away, or sent a line longer than the limit
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        """
+        Starts listening and returns the asyncio Server.
+        """
+        return await asyncio.start_server(self.handleConnection, host, port,
+                                          limit=1 << 16)
+
+
+async def _main(host, port, lexiconName, storeName):
+    store = BoardStore(storeName) if storeName else None
+    server = BoggleServer(lexiconName, store)
+    listener = await server.serve(host, port)
+    print("serving Boggle on {}:{}".format(host, port))
+    async with listener:
+        await listener.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--lexicon', default='bogwords.txt')
+    parser.add_argument('--store', metavar='DB',
+                        help='BoardStore to record solved boards in')
+    args = parser.parse_args()
+    try:
+        asyncio.run(_main(args.host, args.port, args.lexicon, args.store))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,114 @@
+"""
+Implements a solver that finds every word on a Boggle board.
+"""
+
+from lexicon import Lexicon
+from solverkernel import findWords, findTokenWords, cellToPosition
+from tilealphabet import getTokenLexicon
+
+# points awarded for a word of a given length; longer words are worth
+# LONG_WORD_SCORE (matches BoggleGame._scoreDict)
+SCORE_DICT = {3: 1, 4: 1, 5: 2, 6: 3, 7: 5}
+LONG_WORD_SCORE = 11
+
+
+def scoreWord(word, scoreDict=SCORE_DICT):
+    """
+    Returns the score of word (str) under scoreDict.
+
+    >>> scoreWord("CAT"), scoreWord("QUITE"), scoreWord("BOGGLERS")
+    (1, 2, 11)
+    """
+    return scoreDict.get(len(word), LONG_WORD_SCORE)
+
+
+class BoggleSolver:
+    """A BoggleSolver finds all the words in a lexicon that can be spelled
+    on a grid of letters by a prefix-pruned depth first search:
+       *  _lexicon is the Lexicon words are looked up in
+       *  _scoreDict maps word lengths to points
+       *  _minWordLength is the length of the shortest word that counts
+       *  _alphabet is the TileAlphabet of the dice, or None
+       *  _tokenLexicon is _lexicon compiled against _alphabet, or None
+          until the first solve with an alphabet
+
+    Grids are lists of columns, so letters[col][row] is the face at
+    (col, row), which is the same layout as BoggleBoard._grid.  A face may
+    hold more than one letter (the "Qu" cube).  Given the alphabet of the
+    dice, the solver walks the lexicon one tile (token) at a time; without
+    one it walks it letter by letter.
+
+    >>> solver = BoggleSolver(Lexicon(["QUIT", "TIN", "NIT", "TINT"]))
+    >>> words = solver.solve([["Qu", "T"], ["I", "N"]])
+    >>> sorted(words)
+    ['NIT', 'QUIT', 'TIN']
+    >>> words["QUIT"]
+    (1, [(0, 0), (1, 0), (0, 1)])
+    >>> from tilealphabet import TileAlphabet
+    >>> tiles = BoggleSolver(Lexicon(["QUIT", "TIN", "NIT", "TINT"]),
+    ...                      alphabet=TileAlphabet(["Qu", "T", "I", "N"]))
+    >>> tiles.solve([["Qu", "T"], ["I", "N"]]) == words
+    True
+    """
+
+    __slots__ = ['_lexicon', '_scoreDict', '_minWordLength', '_alphabet',
+                 '_tokenLexicon']
+
+    def __init__(self, lexicon, scoreDict=SCORE_DICT, minWordLength=1,
+                 alphabet=None):
+        self._lexicon = lexicon
+        self._scoreDict = scoreDict
+        self._minWordLength = minWordLength
+        self._alphabet = alphabet
+        # compiled on the first solve, so making a solver is cheap and
+        # the compile happens on whichever thread solves
+        self._tokenLexicon = None
+
+    def getLexicon(self):
+        return self._lexicon
+
+    def solve(self, letters, cancelled=None):
+        """
+        Returns a dictionary mapping each word (upper case str) that can be
+        spelled on letters to a (score, path) tuple, where path is a list of
+        (col, row) positions spelling the word.  Returns None if the
+        threading.Event cancelled is set before the search finishes.
+        """
+        cols = len(letters)
+        rows = len(letters[0]) if cols else 0
+        if self._alphabet is not None:
+            if self._tokenLexicon is None:
+                self._tokenLexicon = getTokenLexicon(self._lexicon,
+                                                     self._alphabet)
+            getToken = self._alphabet.getToken
+            tokens = [getToken(face) for column in letters for face in column]
+            found = findTokenWords(tokens, rows, cols, self._tokenLexicon,
+                                   cancelled, self._minWordLength)
+        else:
+            faces = [face.upper() for column in letters for face in column]
+            found = findWords(faces, rows, cols, self._lexicon, cancelled,
+                              self._minWordLength)
+        if found is None:
+            return None
+        scoreDict = self._scoreDict
+        return {word: (scoreWord(word, scoreDict),
+                       [cellToPosition(cell, rows) for cell in cells])
+                for word, cells in found.items()}
+
+    def solveBoard(self, board):
+        """
+        Returns every word on a BoggleBoard, as described in solve.
+        """
+        return self.solve(board.getLetters())
+
+
+def totalScore(words):
+    """
+    Returns the total score of the words returned by BoggleSolver.solve.
+    """
+    return sum(score for score, path in words.values())
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,261 @@
+"""
+Recording of the clicks and key presses of a game in a compact binary
+file, so a session can be replayed exactly (see replay.py).
+
+A click stream starts with a header, then holds one record per click or key
+press and, once the game is over, an end record with the final score and
+found words:
+
+    header   magic b'BOGCLK', version (uint16), seed (int64), board size (uint8)
+    click    b'C', microseconds since the previous click (uint32),
+             x and y in eighths of a pixel (int16 each)        9 bytes
+    key      b'K', microseconds since the previous click or key (uint32),
+             length (uint8) of the keysym, which follows as UTF-8
+    end      b'E', score (uint32), length (uint32) of the found words,
+             which follow as UTF-8 separated by newlines
+
+All numbers are little endian.  The seed is what randomize was called with
+before the game was created, so replaying it shows the same boards.
+"""
+
+import random
+import struct
+import time
+
+from solverkernel import neighborTable
+
+MAGIC = b'BOGCLK'
+VERSION = 1
+
+_HEADER = struct.Struct('<6sHqB')
+_CLICK = struct.Struct('<Ihh')
+_KEY = struct.Struct('<IB')
+_END = struct.Struct('<II')
+
+# coordinates are stored in fixed point with this many steps per pixel
+_SCALE = 8
+
+
+def newSeed():
+    """
+    Returns a fresh seed for randomize, to be recorded with a game.
+    """
+    return random.SystemRandom().getrandbits(63)
+
+
+class ClickRecorder:
+    """A ClickRecorder writes a click stream to an open binary file:
+       *  _f is the file the stream is written to
+       *  _last is the perf_counter time of the last click or key (or of
+          the start)
+       *  _clicks is the number of clicks written
+       *  _keys is the number of key presses written
+
+    >>> import io
+    >>> from backend import Point
+    >>> f = io.BytesIO()
+    >>> recorder = ClickRecorder(f, seed=42)
+    >>> recorder.record(Point(75.5, 80))
+    >>> recorder.recordKey("Return")
+    >>> recorder.finish(3, ["TIN", "NIT"])
+    >>> stream = readClickStream(io.BytesIO(f.getvalue()))
+    >>> stream.getSeed(), stream.getPoints(), stream.getKeys()
+    (42, [(75.5, 80.0)], ['Return'])
+    >>> stream.getScore(), stream.getWords()
+    (3, ['TIN', 'NIT'])
+    """
+
+    __slots__ = ['_f', '_last', '_clicks', '_keys']
+
+    def __init__(self, f, seed, boardSize=4):
+        self._f = f
+        f.write(_HEADER.pack(MAGIC, VERSION, seed, boardSize))
+        self._last = time.perf_counter()
+        self._clicks = 0
+        self._keys = 0
+
+    def getClicks(self):
+        return self._clicks
+
+    def getKeys(self):
+        return self._keys
+
+    def __elapsed(self):
+        """
+        Returns the microseconds since the last record, as stored.
+        """
+        now = time.perf_counter()
+        micros = min(int((now - self._last) * 1e6), 0xFFFFFFFF)
+        self._last = now
+        return micros
+
+    def record(self, point):
+        """
+        Writes a click at point (a Point), timed from the previous click.
+        """
+        self._f.write(b'C' + _CLICK.pack(self.__elapsed(),
+                                         round(point.getX() * _SCALE),
+                                         round(point.getY() * _SCALE)))
+        self._clicks += 1
+
+    def recordKey(self, key):
+        """
+        Writes a press of key (a Tk keysym such as 'a' or 'Return'), timed
+        from the previous click or key.
+        """
+        data = key.encode('utf-8')
+        self._f.write(b'K' + _KEY.pack(self.__elapsed(), len(data)) + data)
+        self._keys += 1
+
+    def wrap(self, onClick):
+        """
+        Returns a click handler that records each click and then passes it
+        to onClick (such as BoggleGame.doOneClick), returning its result.
+        """
+        def recordAndClick(point):
+            self.record(point)
+            return onClick(point)
+        return recordAndClick
+
+    def wrapKeys(self, onKey):
+        """
+        Returns a key handler that records each key press and then passes
+        it to onKey (such as BoggleGame.doOneKey), returning its result.
+        """
+        def recordAndPress(key):
+            self.recordKey(key)
+            return onKey(key)
+        return recordAndPress
+
+    def finish(self, score, words):
+        """
+        Writes the end record with the game's final score and found words.
+        """
+        data = '\n'.join(words).encode('utf-8')
+        self._f.write(b'E' + _END.pack(score, len(data)) + data)
+        self._f.flush()
+
+
+class ClickStream:
+    """A ClickStream is a recorded (or synthetic) game:
+       *  _seed is the seed to randomize with before creating the game
+       *  _boardSize is the size of the board
+       *  _events is the list of clicks and key presses in the order they
+          happened, each (seconds since the previous one, x, y, key): key
+          is None for a click, and x and y are None for a key press
+       *  _score, _words are the final score and found words, or None if
+          the stream has no end record
+    """
+
+    __slots__ = ['_seed', '_boardSize', '_events', '_score', '_words']
+
+    def __init__(self, seed, boardSize, events, score=None, words=None):
+        self._seed = seed
+        self._boardSize = boardSize
+        self._events = events
+        self._score = score
+        self._words = words
+
+    def getSeed(self):
+        return self._seed
+
+    def getBoardSize(self):
+        return self._boardSize
+
+    def getEvents(self):
+        return self._events
+
+    def getPoints(self):
+        return [(x, y) for delay, x, y, key in self._events if key is None]
+
+    def getKeys(self):
+        return [key for delay, x, y, key in self._events if key is not None]
+
+    def getScore(self):
+        return self._score
+
+    def getWords(self):
+        return self._words
+
+
+def readClickStream(f):
+    """
+    Reads a click stream from an open binary file and returns the
+    ClickStream.  A stream cut off by a crash is read up to its last
+    complete click or key.
+    """
+    header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError("not a click stream: file is too short")
+    magic, version, seed, boardSize = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("not a click stream: bad magic {!r}".format(magic))
+    if version != VERSION:
+        raise ValueError("unsupported click stream version {}".format(version))
+    data = f.read()
+    events = []
+    score = words = None
+    offset = 0
+    while offset < len(data):
+        tag = data[offset:offset + 1]
+        offset += 1
+        if tag == b'C':
+            if offset + _CLICK.size > len(data):
+                break
+            micros, x, y = _CLICK.unpack_from(data, offset)
+            offset += _CLICK.size
+            events.append((micros / 1e6, x / _SCALE, y / _SCALE, None))
+        elif tag == b'K':
+            if offset + _KEY.size > len(data):
+                break
+            micros, length = _KEY.unpack_from(data, offset)
+            offset += _KEY.size
+            if offset + length > len(data):
+                break
+            key = data[offset:offset + length].decode('utf-8')
+            offset += length
+            events.append((micros / 1e6, None, None, key))
+        elif tag == b'E':
+            score, length = _END.unpack_from(data, offset)
+            offset += _END.size
+            text = data[offset:offset + length].decode('utf-8')
+            words = text.split('\n') if text else []
+            break
+        else:
+            raise ValueError("bad record {!r} at byte {}".format(
+                tag, _HEADER.size + offset - 1))
+    return ClickStream(seed, boardSize, events, score, words)
+
+
+def syntheticClicks(board, clicks, seed=0):
+    """
+    Returns a list of clicks (Points) on the grid of board that play like a
+    person would: mostly steps to a neighboring letter, sometimes clicking
+    the last letter again to end the word, sometimes a letter anywhere.
+
+    >>> from backend import GraphWin
+    >>> from boggleboard import BoggleBoard
+    >>> len(syntheticClicks(BoggleBoard(GraphWin("Boggle", 400, 400)), 10))
+    10
+    """
+    rng = random.Random(seed)
+    rows, cols = board.getRows(), board.getCols()
+    neighbors = neighborTable(rows, cols)
+    cell = rng.randrange(rows * cols)
+    points = []
+    for i in range(clicks):
+        choice = rng.random()
+        if choice < 0.15:
+            pass
+        elif choice < 0.25:
+            cell = rng.randrange(rows * cols)
+        else:
+            cell = rng.choice(neighbors[cell])
+        col, row = divmod(cell, rows)
+        points.append(board.getCellCenter(col, row))
+    return points
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
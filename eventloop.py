@@ -0,0 +1,119 @@
+"""
+An event-driven game loop.  Instead of polling GraphWin.getMouse (which
+sleeps up to 100 ms between checks), clicks and key presses are delivered by
+the window's handlers the moment they arrive, and timers are scheduled with the
+window's after() so the process sleeps while nothing happens.
+"""
+
+
+class GameLoop:
+    """A GameLoop dispatches clicks in a window to a handler until the
+    handler returns False or stop is called:
+       *  _win is the GraphWin events come from
+       *  _onClick is called with a Point for every click
+       *  _onKey, if not None, is called with the keysym of every key
+          pressed and ends the loop like _onClick when it returns False
+       *  _timers maps the ids of pending timers to the window's after() ids
+
+    >>> from headless import GraphWin, Point
+    >>> win = GraphWin()
+    >>> seen = []
+    >>> def onClick(point):
+    ...     seen.append(point.getX())
+    ...     return point.getX() < 3
+    >>> loop = GameLoop(win, onClick)
+    >>> _ = loop.schedule(20, lambda: win.click(5, 0))
+    >>> _ = loop.schedule(10, lambda: win.click(1, 0))
+    >>> loop.run()
+    >>> seen, win.isClosed()
+    ([1.0, 5.0], True)
+    >>> win = GraphWin()
+    >>> loop = GameLoop(win, onClick, lambda key: seen.append(key) or key != 'q')
+    >>> for key in "abqc":
+    ...     win.pressKey(key)
+    >>> loop.run()
+    >>> seen[2:]
+    ['a', 'b', 'q']
+    """
+
+    __slots__ = ['_win', '_onClick', '_onKey', '_timers', '_nextTimer',
+                 '_running']
+
+    def __init__(self, win, onClick, onKey=None):
+        self._win = win
+        self._onClick = onClick
+        self._onKey = onKey
+        self._timers = {}
+        self._nextTimer = 0
+        self._running = False
+
+    def getWin(self):
+        return self._win
+
+    def __click(self, point):
+        if self._running and not self._onClick(point):
+            self.stop()
+
+    def __key(self, key):
+        if self._running and not self._onKey(key):
+            self.stop()
+
+    def run(self):
+        """
+        Dispatches events until a handler returns False or stop is called,
+        then closes the window.
+        """
+        self._running = True
+        self._win.setMouseHandler(self.__click)
+        if self._onKey is not None:
+            self._win.setKeyHandler(self.__key)
+        try:
+            self._win.mainloop()
+        finally:
+            self._running = False
+            self._win.setMouseHandler(None)
+            if self._onKey is not None:
+                self._win.setKeyHandler(None)
+            for afterId in self._timers.values():
+                self._win.after_cancel(afterId)
+            self._timers.clear()
+            self._win.close()
+
+    def stop(self):
+        """
+        Makes run return once the current event has been handled.
+        """
+        self._running = False
+        self._win.quit()
+
+    def schedule(self, delayMs, callback, repeat=False):
+        """
+        Calls callback (with no arguments) after delayMs milliseconds, and
+        then every delayMs milliseconds if repeat is True.  Returns a timer
+        id that can be passed to cancel.
+        """
+        timer = self._nextTimer
+        self._nextTimer += 1
+
+        def fire():
+            if repeat:
+                self._timers[timer] = self._win.after(delayMs, fire)
+            else:
+                del self._timers[timer]
+            callback()
+
+        self._timers[timer] = self._win.after(delayMs, fire)
+        return timer
+
+    def cancel(self, timer):
+        """
+        Cancels a timer returned by schedule, if it has not fired yet.
+        """
+        afterId = self._timers.pop(timer, None)
+        if afterId is not None:
+            self._win.after_cancel(afterId)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
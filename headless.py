@@ -0,0 +1,449 @@
+"""
+A headless stand-in for the parts of graphics.py that the Boggle classes use
+(GraphWin, Point, Text, Rectangle).  Nothing is drawn and Tk is never
+imported, so boards and games can be built on a server, in a benchmark or in
+CI without a display, and clicks can be fed to BoggleGame.doOneClick as
+ordinary Points.
+
+Objects keep the same configuration state as their graphics.py
+counterparts, so getters like getText and getFillColor behave the same.
+A GraphWin created with record=True also keeps a log of every draw and
+reconfiguration, and every GraphWin counts the flushes (repaints) the Tk
+backend would have made.
+"""
+
+import heapq
+from collections import deque
+from contextlib import contextmanager
+
+from instrument import count
+
+
+class GraphicsError(Exception):
+    """Generic error class for graphics module exceptions."""
+    pass
+
+
+OBJ_ALREADY_DRAWN = "Object currently drawn"
+UNSUPPORTED_METHOD = "Object doesn't support operation"
+BAD_OPTION = "Illegal option value"
+
+DEFAULT_CONFIG = {"fill": "",
+                  "outline": "black",
+                  "width": "1",
+                  "text": "",
+                  "justify": "center",
+                  "font": ("helvetica", 20, "bold")}
+
+
+def update(rate=None):
+    pass
+
+
+class GraphWin:
+    """A GraphWin that never opens a window.  Clicks and key presses can be
+    queued with click and pressKey and are then returned by getMouse,
+    checkMouse, getKey and checkKey (or passed to the mouse and key
+    handlers).
+    Timers set with after run on a virtual clock (clock, in ms) during
+    mainloop, which never sleeps; update runs the timers that are due.
+
+    >>> win = GraphWin("Boggle", 400, 400, record=True)
+    >>> t = Text(Point(10, 10), "hi").draw(win)
+    >>> t.setText("bye")
+    >>> win.log
+    [('draw', Text(Point(10.0, 10.0), 'bye')), ('config', Text(Point(10.0, 10.0), 'bye'), 'text', 'bye')]
+    >>> win.flushes
+    2
+    >>> with win.batch():
+    ...     t.setText("a"); t.setText("b"); t.setFill("red")
+    >>> win.log[2:], win.flushes
+    ([('config', Text(Point(10.0, 10.0), 'b'), 'text', 'b'), ('config', Text(Point(10.0, 10.0), 'b'), 'fill', 'red')], 3)
+    >>> win.click(5, 6); win.getMouse()
+    Point(5.0, 6.0)
+    >>> win.close(); win.isClosed()
+    True
+    """
+
+    __slots__ = ['title', 'width', 'height', 'autoflush', 'closed', 'items',
+                 'log', 'flushes', 'batching', '_batchDepth', '_pending',
+                 '_clicks', '_keys', '_mouseCallback', '_keyCallback',
+                 'background',
+                 'clock', '_timers', '_timerQueue', '_nextTimer', '_quit']
+
+    def __init__(self, title="Graphics Window", width=200, height=200,
+                 autoflush=True, record=False):
+        self.title = title
+        self.width = int(width)
+        self.height = int(height)
+        self.autoflush = autoflush
+        self.closed = False
+        self.items = []
+        self.log = [] if record else None
+        self.background = ""
+        self.flushes = 0
+        self.batching = True
+        self._batchDepth = 0
+        self._pending = {}
+        self._clicks = deque()
+        self._keys = deque()
+        self._mouseCallback = None
+        self._keyCallback = None
+        self.clock = 0
+        self._timers = {}
+        self._timerQueue = []
+        self._nextTimer = 0
+        self._quit = False
+
+    def __repr__(self):
+        if self.isClosed():
+            return "<Closed GraphWin>"
+        return "GraphWin('{}', {}, {})".format(self.title, self.width,
+                                              self.height)
+
+    def __checkOpen(self):
+        if self.closed:
+            raise GraphicsError("window is closed")
+
+    def setBackground(self, color):
+        self.__checkOpen()
+        self.background = color
+
+    def close(self):
+        self.closed = True
+
+    def isClosed(self):
+        return self.closed
+
+    def isOpen(self):
+        return not self.closed
+
+    def flush(self):
+        self.__checkOpen()
+
+    def update(self):
+        while self._timerQueue and self._timerQueue[0][0] <= self.clock:
+            self.__runNextTimer()
+
+    # timers and the event loop, mirroring Tk's after/mainloop/quit
+    def after(self, ms, func):
+        self._nextTimer += 1
+        self._timers[self._nextTimer] = func
+        heapq.heappush(self._timerQueue, (self.clock + ms, self._nextTimer))
+        return self._nextTimer
+
+    def after_cancel(self, afterId):
+        self._timers.pop(afterId, None)
+
+    def __runNextTimer(self):
+        due, afterId = heapq.heappop(self._timerQueue)
+        func = self._timers.pop(afterId, None)
+        if func is not None:
+            self.clock = max(self.clock, due)
+            func()
+
+    def mainloop(self):
+        """
+        Dispatches queued clicks and keys to the handlers and runs timers in
+        order of their due time, until quit is called, the window is
+        closed, or there is nothing left to do.
+        """
+        self._quit = False
+        while not self._quit and not self.closed:
+            if self._clicks and self._mouseCallback:
+                self._mouseCallback(self._clicks.popleft())
+            elif self._keys and self._keyCallback:
+                self._keyCallback(self._keys.popleft())
+            elif self._timerQueue:
+                self.__runNextTimer()
+            else:
+                break
+
+    def quit(self):
+        self._quit = True
+
+    def getHeight(self):
+        return self.height
+
+    def getWidth(self):
+        return self.width
+
+    def toScreen(self, x, y):
+        return x, y
+
+    def toWorld(self, x, y):
+        return x, y
+
+    def addItem(self, item):
+        self.items.append(item)
+        if self.log is not None:
+            self.log.append(('draw', item))
+        self.__autoflush()
+
+    def delItem(self, item):
+        self.items.remove(item)
+        if self.log is not None:
+            self.log.append(('undraw', item))
+        self.__autoflush()
+
+    def _itemconfig(self, item, option, setting):
+        if self._batchDepth:
+            self._pending[(item, option)] = setting
+            return
+        if self.log is not None:
+            self.log.append(('config', item, option, setting))
+        self.__autoflush()
+
+    def __autoflush(self):
+        if self.autoflush and not self._batchDepth:
+            self.flushes += 1
+            count('graphics.flush')
+
+    @contextmanager
+    def batch(self):
+        """
+        Defers and coalesces reconfigurations until the block ends, like
+        tkbackend.GraphWin.batch.
+        """
+        if not self.batching:
+            yield self
+            return
+        self._batchDepth += 1
+        try:
+            yield self
+        finally:
+            self._batchDepth -= 1
+            if self._batchDepth == 0:
+                pending = self._pending
+                self._pending = {}
+                if self.log is not None:
+                    for (item, option), setting in pending.items():
+                        self.log.append(('config', item, option, setting))
+                if self.autoflush:
+                    self.flushes += 1
+                    count('graphics.flush')
+
+    # input: queued synthetic events stand in for the user
+    def click(self, x, y):
+        """
+        Simulates a mouse click at (x, y).
+        """
+        if self._mouseCallback:
+            self._mouseCallback(Point(x, y))
+        else:
+            self._clicks.append(Point(x, y))
+
+    def pressKey(self, key):
+        """
+        Simulates pressing the key named key (a Tk keysym such as 'a').
+        """
+        if self._keyCallback:
+            self._keyCallback(key)
+        else:
+            self._keys.append(key)
+
+    def getMouse(self):
+        self.__checkOpen()
+        if not self._clicks:
+            raise GraphicsError("getMouse with no queued clicks")
+        return self._clicks.popleft()
+
+    def checkMouse(self):
+        if self.isClosed():
+            raise GraphicsError("checkMouse in closed window")
+        return self._clicks.popleft() if self._clicks else None
+
+    def getKey(self):
+        self.__checkOpen()
+        if not self._keys:
+            raise GraphicsError("getKey with no queued keys")
+        return self._keys.popleft()
+
+    def checkKey(self):
+        if self.isClosed():
+            raise GraphicsError("checkKey in closed window")
+        return self._keys.popleft() if self._keys else ""
+
+    def setMouseHandler(self, func):
+        self._mouseCallback = func
+
+    def setKeyHandler(self, func):
+        self._keyCallback = func
+
+
+class GraphicsObject:
+    """Base class of the headless drawable objects."""
+
+    __slots__ = ['canvas', 'config']
+
+    def __init__(self, options):
+        self.canvas = None
+        self.config = {option: DEFAULT_CONFIG[option] for option in options}
+
+    def setFill(self, color):
+        self._reconfig("fill", color)
+
+    def setOutline(self, color):
+        self._reconfig("outline", color)
+
+    def setWidth(self, width):
+        self._reconfig("width", width)
+
+    def draw(self, graphwin):
+        if self.canvas and not self.canvas.isClosed():
+            raise GraphicsError(OBJ_ALREADY_DRAWN)
+        if graphwin.isClosed():
+            raise GraphicsError("Can't draw to closed window")
+        self.canvas = graphwin
+        graphwin.addItem(self)
+        return self
+
+    def undraw(self):
+        if not self.canvas:
+            return
+        if not self.canvas.isClosed():
+            self.canvas.delItem(self)
+        self.canvas = None
+
+    def move(self, dx, dy):
+        self._move(dx, dy)
+
+    def _reconfig(self, option, setting):
+        if option not in self.config:
+            raise GraphicsError(UNSUPPORTED_METHOD)
+        self.config[option] = setting
+        if self.canvas and not self.canvas.isClosed():
+            self.canvas._itemconfig(self, option, setting)
+
+    def _move(self, dx, dy):
+        pass
+
+
+class Point(GraphicsObject):
+
+    __slots__ = ['x', 'y']
+
+    def __init__(self, x, y):
+        GraphicsObject.__init__(self, ["outline", "fill"])
+        self.x = float(x)
+        self.y = float(y)
+
+    def __repr__(self):
+        return "Point({}, {})".format(self.x, self.y)
+
+    def _move(self, dx, dy):
+        self.x = self.x + dx
+        self.y = self.y + dy
+
+    def clone(self):
+        other = Point(self.x, self.y)
+        other.config = self.config.copy()
+        return other
+
+    def getX(self): return self.x
+    def getY(self): return self.y
+
+
+class Rectangle(GraphicsObject):
+
+    __slots__ = ['p1', 'p2']
+
+    def __init__(self, p1, p2, color=""):
+        GraphicsObject.__init__(self, ["outline", "width", "fill"])
+        self.p1 = p1.clone()
+        self.p2 = p2.clone()
+        if color != "":
+            self.setFill(color)
+
+    def __repr__(self):
+        return "Rectangle({}, {})".format(str(self.p1), str(self.p2))
+
+    def _move(self, dx, dy):
+        self.p1._move(dx, dy)
+        self.p2._move(dx, dy)
+
+    def clone(self):
+        other = Rectangle(self.p1, self.p2)
+        other.config = self.config.copy()
+        return other
+
+    def getP1(self): return self.p1.clone()
+
+    def getP2(self): return self.p2.clone()
+
+    def getCenter(self):
+        p1 = self.p1
+        p2 = self.p2
+        return Point((p1.x + p2.x) / 2.0, (p1.y + p2.y) / 2.0)
+
+    def getFillColor(self):
+        return self.config["fill"]
+
+    def setFillColor(self, color):
+        self.setFill(color)
+
+
+class Text(GraphicsObject):
+
+    __slots__ = ['anchor']
+
+    def __init__(self, p, text):
+        GraphicsObject.__init__(self, ["justify", "fill", "text", "font"])
+        self.setText(text)
+        self.anchor = p.clone()
+        self.setFill(DEFAULT_CONFIG['outline'])
+
+    def __repr__(self):
+        return "Text({}, '{}')".format(self.anchor, self.getText())
+
+    def _move(self, dx, dy):
+        self.anchor._move(dx, dy)
+
+    def clone(self):
+        other = Text(self.anchor, self.config['text'])
+        other.config = self.config.copy()
+        return other
+
+    def setOutline(self, color):
+        self.setFill(color)
+
+    def setText(self, text):
+        self._reconfig("text", text)
+
+    def getText(self):
+        return self.config["text"]
+
+    def getTextColor(self):
+        return self.config["fill"]
+
+    def getAnchor(self):
+        return self.anchor.clone()
+
+    def setFace(self, face):
+        if face in ['helvetica', 'arial', 'courier', 'times roman']:
+            f, s, b = self.config['font']
+            self._reconfig("font", (face, s, b))
+        else:
+            raise GraphicsError(BAD_OPTION)
+
+    def setSize(self, size):
+        if 5 <= size <= 36:
+            f, s, b = self.config['font']
+            self._reconfig("font", (f, size, b))
+        else:
+            raise GraphicsError(BAD_OPTION)
+
+    def setStyle(self, style):
+        if style in ['bold', 'normal', 'italic', 'bold italic']:
+            f, s, b = self.config['font']
+            self._reconfig("font", (f, s, style))
+        else:
+            raise GraphicsError(BAD_OPTION)
+
+    def setTextColor(self, color):
+        self.setFill(color)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,172 @@
+"""
+Opt-in instrumentation of the game's hot paths: timing spans and counters,
+recorded only while enabled.
+
+    BOGGLE_INSTRUMENT=1 python3 bogglegameEC.py       # report on exit
+    BOGGLE_PROFILE=game.prof python3 bogglegameEC.py  # cProfile the session
+
+Code marks a region with `with span("name"):` and an event with
+count("name").  While disabled (the default) span returns a shared no-op
+context manager and count returns at once, so the marks cost one function
+call each.  Enabled spans keep every duration, so getStats can report
+percentiles; call reset between runs of a long session.
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+_enabled = False
+_spans = {}      # name -> list of durations (seconds)
+_counters = {}   # name -> int
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    """Times one run of a region and adds it to _spans[name]."""
+
+    __slots__ = ['_name', '_start']
+
+    def __init__(self, name):
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self._start
+        durations = _spans.get(self._name)
+        if durations is None:
+            durations = _spans[self._name] = []
+        durations.append(elapsed)
+        return False
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def isEnabled():
+    return _enabled
+
+
+def reset():
+    """
+    Forgets every span and counter recorded so far.
+    """
+    _spans.clear()
+    _counters.clear()
+
+
+def span(name):
+    """
+    Returns a context manager that times the block it guards under name,
+    if instrumentation is enabled.
+
+    >>> enable()
+    >>> with span("example"):
+    ...     pass
+    >>> getStats()["example"]["count"]
+    1
+    >>> disable(); reset()
+    >>> with span("example"):
+    ...     pass
+    >>> getStats()
+    {}
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def count(name, n=1):
+    """
+    Adds n to the counter name, if instrumentation is enabled.
+
+    >>> enable(); count("clicks"); count("clicks", 2)
+    >>> getStats()["clicks"]
+    {'count': 3}
+    >>> disable(); reset()
+    """
+    if _enabled:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def _percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def getStats():
+    """
+    Returns a dictionary mapping each span name to its count and its total,
+    median (p50) and 99th percentile (p99) durations in milliseconds, and
+    each counter name to its count.
+    """
+    stats = {}
+    for name, durations in _spans.items():
+        ordered = sorted(durations)
+        stats[name] = {"count": len(ordered),
+                       "totalMs": sum(ordered) * 1000,
+                       "p50Ms": _percentile(ordered, 0.5) * 1000,
+                       "p99Ms": _percentile(ordered, 0.99) * 1000}
+    for name, total in _counters.items():
+        stats[name] = {"count": total}
+    return stats
+
+
+def report(file=None):
+    """
+    Prints getStats as a table, spans by total time first, then counters.
+    """
+    file = file or sys.stderr
+    stats = getStats()
+    timed = sorted((name for name in stats if "totalMs" in stats[name]),
+                   key=lambda name: -stats[name]["totalMs"])
+    print("{:<32} {:>8} {:>10} {:>9} {:>9}".format(
+        "span", "count", "total ms", "p50 ms", "p99 ms"), file=file)
+    for name in timed:
+        s = stats[name]
+        print("{:<32} {:>8} {:>10.2f} {:>9.4f} {:>9.4f}".format(
+            name, s["count"], s["totalMs"], s["p50Ms"], s["p99Ms"]), file=file)
+    for name in sorted(_counters):
+        print("{:<32} {:>8}".format(name, stats[name]["count"]), file=file)
+
+
+@contextmanager
+def profiled(path=None, top=25):
+    """
+    Runs the block under cProfile if path is given: the raw profile is
+    saved to path (for pstats or snakeviz) and the top functions by
+    cumulative time are printed.  With no path the block just runs.
+    """
+    if path is None:
+        yield None
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        profile.dump_stats(path)
+        pstats.Stats(profile, stream=sys.stderr).sort_stats(
+            'cumulative').print_stats(top)
+
+
+if os.environ.get('BOGGLE_INSTRUMENT', '') not in ('', '0'):
+    enable()
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,301 @@
+"""
+Implements a trie-backed lexicon that answers exact-match, prefix and
+completion-count queries in time proportional to the length of the query.
+"""
+
+import unicodedata
+
+
+class TrieNode:
+    """A TrieNode is a single node of the lexicon trie:
+       *  _children maps the next character (str) to the child TrieNode
+       *  _isWord is True if the path from the root to this node spells a word
+       *  _count is the number of words that pass through (or end at) this node
+    """
+
+    __slots__ = ['_children', '_isWord', '_count']
+
+    def __init__(self):
+        self._children = {}
+        self._isWord = False
+        self._count = 0
+
+
+class Lexicon:
+    """A Lexicon stores a set of words in a trie so that, besides asking
+    whether a string is a word, we can ask whether it is the start of a
+    word and how many words start with it.
+
+    >>> lex = Lexicon(["CAT", "CATS", "COT"])
+    >>> "CAT" in lex
+    True
+    >>> lex.contains("CA")
+    False
+    >>> lex.isPrefix("CA")
+    True
+    >>> lex.countCompletions("CA")
+    2
+    >>> len(lex)
+    3
+    """
+
+    __slots__ = ['_root', '__weakref__']
+
+    def __init__(self, words=()):
+        """
+        Construct a new Lexicon holding the given (optional) words.
+        """
+        self._root = TrieNode()
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        """
+        Adds word (str) to the lexicon.  Adding a word twice has no effect.
+
+        >>> lex = Lexicon()
+        >>> lex.add("DOG"); lex.add("DOG")
+        >>> lex.countCompletions("")
+        1
+        """
+        if self.contains(word):
+            return
+        node = self._root
+        node._count += 1
+        for char in word:
+            child = node._children.get(char)
+            if child is None:
+                child = TrieNode()
+                node._children[char] = child
+            child._count += 1
+            node = child
+        node._isWord = True
+
+    def __findNode(self, prefix):
+        """
+        Returns the TrieNode reached by following prefix (str) from the root,
+        or None if no word starts with prefix.
+        """
+        node = self._root
+        for char in prefix:
+            node = node._children.get(char)
+            if node is None:
+                return None
+        return node
+
+    def contains(self, word):
+        """
+        Returns True if word (str) is in the lexicon, and False otherwise.
+        """
+        node = self.__findNode(word)
+        return node is not None and node._isWord
+
+    def __contains__(self, word):
+        return self.contains(word)
+
+    def isPrefix(self, prefix):
+        """
+        Returns True if at least one word in the lexicon starts with
+        prefix (str).  Every word is a prefix of itself.
+
+        >>> lex = Lexicon(["BOG", "BOGGLE"])
+        >>> lex.isPrefix("BOGG"), lex.isPrefix("BOG"), lex.isPrefix("BOX")
+        (True, True, False)
+        """
+        return self.__findNode(prefix) is not None
+
+    def countCompletions(self, prefix):
+        """
+        Returns the number of words in the lexicon that start with prefix
+        (str), including prefix itself if it is a word.
+
+        >>> lex = Lexicon(["BOG", "BOGGLE", "BOGS"])
+        >>> lex.countCompletions("BOG"), lex.countCompletions("BOGG")
+        (3, 1)
+        >>> lex.countCompletions("X")
+        0
+        """
+        node = self.__findNode(prefix)
+        if node is None:
+            return 0
+        return node._count
+
+    def __len__(self):
+        return self._root._count
+
+    # node-level access, used by callers that walk the trie one
+    # character at a time instead of restarting from the root
+    def getRoot(self):
+        """
+        Returns the root node of the trie.
+        """
+        return self._root
+
+    def getChild(self, node, char):
+        """
+        Returns the child of node reached by char (str), or None if
+        no word continues that way.
+
+        >>> lex = Lexicon(["AB"])
+        >>> node = lex.getChild(lex.getRoot(), "A")
+        >>> lex.isWordNode(node), lex.isWordNode(lex.getChild(node, "B"))
+        (False, True)
+        >>> lex.getChild(node, "C") is None
+        True
+        """
+        return node._children.get(char)
+
+    def getEdges(self, node):
+        """
+        Returns the list of (char, child) pairs leaving node, sorted by char.
+        """
+        return sorted(node._children.items())
+
+    def isWordNode(self, node):
+        """
+        Returns True if node marks the end of a word.
+        """
+        return node._isWord
+
+    def getCount(self, node):
+        """
+        Returns the number of words that pass through (or end at) node.
+        """
+        return node._count
+
+
+class LexiconCursor:
+    """A LexiconCursor remembers where a word under construction is in a
+    lexicon's trie, so adding or removing a tile costs only the tile's
+    letters instead of a lookup of the whole word:
+       *  _lexicon is the Lexicon (or MappedLexicon) being walked
+       *  _nodes is a stack holding the node reached after each tile, or
+          None once the word can no longer be completed
+
+    >>> cursor = LexiconCursor(Lexicon(["QUIT", "QUITE", "QUOTA"]))
+    >>> cursor.advance("QU"); cursor.countCompletions()
+    3
+    >>> cursor.advance("I"); cursor.advance("T"); cursor.isWord()
+    True
+    >>> cursor.advance("X"); cursor.isPrefix(), cursor.countCompletions()
+    (False, 0)
+    >>> cursor.back(); cursor.isPrefix(), cursor.getDepth()
+    (True, 3)
+    >>> cursor.reset(); cursor.getDepth()
+    0
+    """
+
+    __slots__ = ['_lexicon', '_nodes']
+
+    def __init__(self, lexicon):
+        self._lexicon = lexicon
+        self._nodes = [lexicon.getRoot()]
+
+    def reset(self):
+        """
+        Moves the cursor back to the empty word.
+        """
+        del self._nodes[1:]
+
+    def advance(self, tile):
+        """
+        Moves the cursor forward over the letters of one tile (str).
+        """
+        node = self._nodes[-1]
+        if node is not None:
+            getChild = self._lexicon.getChild
+            for char in tile:
+                node = getChild(node, char)
+                if node is None:
+                    break
+        self._nodes.append(node)
+
+    def advanceToken(self, token):
+        """
+        Moves the cursor forward over one tile given by its token id, for a
+        cursor on a TokenLexicon (see tilealphabet).
+        """
+        node = self._nodes[-1]
+        if node is not None and token is not None:
+            node = self._lexicon.getChild(node, token)
+        else:
+            node = None
+        self._nodes.append(node)
+
+    def back(self):
+        """
+        Moves the cursor back over the last tile added.
+        """
+        if len(self._nodes) > 1:
+            self._nodes.pop()
+
+    def getDepth(self):
+        """
+        Returns the number of tiles the cursor has moved over.
+        """
+        return len(self._nodes) - 1
+
+    def isPrefix(self):
+        """
+        Returns True if some word starts with the tiles so far.
+        """
+        return self._nodes[-1] is not None
+
+    def isWord(self):
+        """
+        Returns True if the tiles so far spell a word.
+        """
+        node = self._nodes[-1]
+        return node is not None and self._lexicon.isWordNode(node)
+
+    def countCompletions(self):
+        """
+        Returns the number of words that start with the tiles so far.
+        """
+        node = self._nodes[-1]
+        return 0 if node is None else self._lexicon.getCount(node)
+
+    def getWord(self):
+        """
+        Returns the word the tiles so far spell, for a cursor on a
+        TokenLexicon, or None if they do not spell one.
+        """
+        node = self._nodes[-1]
+        return None if node is None else self._lexicon.getWord(node)
+
+
+def lexiconWords(lexicon):
+    """
+    Yields every word of lexicon (a Lexicon or MappedLexicon) in sorted
+    order, by walking its trie.
+
+    >>> list(lexiconWords(Lexicon(["CATS", "CAT", "ANT"])))
+    ['ANT', 'CAT', 'CATS']
+    """
+    stack = [(lexicon.getRoot(), '')]
+    while stack:
+        node, word = stack.pop()
+        if word and lexicon.isWordNode(node):
+            yield word
+        for char, child in reversed(lexicon.getEdges(node)):
+            stack.append((child, word + char))
+
+
+def readLexicon(lexiconName='bogwords.txt'):
+    """
+    Reads the word list in lexiconName (UTF-8, one word per line) and
+    returns it as a Lexicon of upper case words, with accented letters in
+    composed form (NFC) so they match the faces of the dice.
+    """
+    lexicon = Lexicon()
+    with open(lexiconName, encoding='utf-8') as f:
+        for line in f:
+            word = unicodedata.normalize('NFC', line.strip()).upper()
+            if word:
+                lexicon.add(word)
+    return lexicon
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
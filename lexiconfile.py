@@ -0,0 +1,228 @@
+"""
+A compact binary lexicon format that can be memory mapped and queried in
+place, without building a Python object for every word.
+
+    python3 lexiconfile.py bogwords.txt bogwords.lex
+
+The file is a packed DAWG: a trie in which identical sub-tries are stored
+once.  All integers are little endian:
+
+    header   magic b'BOGLEX', version (uint16), node count (uint32),
+             edge count (uint32)
+    nodes    per node: first edge (uint32), edge count (uint8),
+             is word (uint8), words through this node (uint32)
+    labels   per edge: the edge's character (one byte), with the edges of
+             each node stored together
+    children per edge: the index of the child node (uint32)
+
+Node 0 is the root.
+"""
+
+import mmap
+import struct
+import sys
+
+from lexicon import Lexicon, readLexicon
+
+MAGIC = b'BOGLEX'
+VERSION = 1
+_HEADER = struct.Struct('<6sHII')
+_NODE = struct.Struct('<IBBI')
+_CHILD = struct.Struct('<I')
+# a node's edge count is stored in one byte
+MAX_EDGES = 255
+
+
+def compileLexicon(words, lexiconFileName):
+    """
+    Writes words (an iterable of str, or a Lexicon) to lexiconFileName in
+    the binary format.  Characters must fit in one byte (latin-1), and
+    no node may have more than MAX_EDGES children; otherwise ValueError is
+    raised and nothing is written.
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), "test.lex")
+    >>> compileLexicon(["NA\u00cfVE"], path)
+    >>> compileLexicon(["\u0141\u00d3D\u0179"], path)
+    Traceback (most recent call last):
+    ...
+    ValueError: can't compile '\u0141': characters must be latin-1
+    >>> compileLexicon([chr(code) for code in range(256)], path)
+    Traceback (most recent call last):
+    ...
+    ValueError: a node has 256 edges; the format allows at most 255
+    """
+    lexicon = words if isinstance(words, Lexicon) else Lexicon(words)
+    # share identical sub-tries (which also have identical word counts), so
+    # the trie becomes a DAWG; nodes are numbered in post order
+    signatures = {}
+    unique = []
+
+    def intern(node):
+        edges = tuple((char, intern(child))
+                      for char, child in lexicon.getEdges(node))
+        signature = (lexicon.isWordNode(node), edges)
+        nodeId = signatures.get(signature)
+        if nodeId is None:
+            nodeId = signatures[signature] = len(unique)
+            unique.append((lexicon.isWordNode(node), lexicon.getCount(node),
+                           edges))
+        return nodeId
+
+    intern(lexicon.getRoot())
+    # reverse the numbering so the root (last in post order) is node 0
+    last = len(unique) - 1
+    labels = bytearray()
+    children = []
+    records = []
+    for isWord, count, edges in reversed(unique):
+        if len(edges) > MAX_EDGES:
+            raise ValueError("a node has {} edges; the format allows at most {}"
+                             .format(len(edges), MAX_EDGES))
+        records.append(_NODE.pack(len(labels), len(edges), isWord, count))
+        for char, child in edges:
+            try:
+                labels += char.encode('latin-1')
+            except UnicodeEncodeError:
+                raise ValueError("can't compile {!r}: characters must be latin-1"
+                                 .format(char)) from None
+            children.append(last - child)
+
+    with open(lexiconFileName, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(records), len(labels)))
+        f.write(b''.join(records))
+        f.write(labels)
+        f.write(struct.pack('<{}I'.format(len(children)), *children))
+
+
+class MappedLexicon:
+    """A MappedLexicon answers the same queries as a Lexicon straight from a
+    memory mapped file written by compileLexicon.  Nodes are ints (offsets
+    into the node table), so walking the trie allocates nothing but ints:
+       *  _file and _map are the open file and its read-only mapping
+       *  _nodes, _labels, _children are the offsets of the three tables
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), "test.lex")
+    >>> compileLexicon(["CAT", "CATS", "COT"], path)
+    >>> lex = MappedLexicon(path)
+    >>> "CATS" in lex, lex.contains("CA"), lex.isPrefix("CA")
+    (True, False, True)
+    >>> lex.countCompletions("C"), len(lex)
+    (3, 3)
+    >>> lex.getChild(lex.getRoot(), "\u010c"), lex.isPrefix("\u010cAT")
+    (None, False)
+    >>> lex.close()
+    """
+
+    __slots__ = ['_file', '_map', '_nodes', '_labels', '_children',
+                 '__weakref__']
+
+    def __init__(self, lexiconFileName):
+        self._file = open(lexiconFileName, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, nodeCount, edgeCount = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("{} is not a compiled lexicon".format(lexiconFileName))
+        if version != VERSION:
+            self.close()
+            raise ValueError("{} has lexicon format version {}, expected {}"
+                             .format(lexiconFileName, version, VERSION))
+        self._nodes = _HEADER.size
+        self._labels = self._nodes + nodeCount * _NODE.size
+        self._children = self._labels + edgeCount
+
+    def close(self):
+        """
+        Unmaps the file.  The lexicon can't be used afterwards.
+        """
+        self._map.close()
+        self._file.close()
+
+    def getRoot(self):
+        return self._nodes
+
+    def getChild(self, node, char):
+        try:
+            label = char.encode('latin-1')
+        except UnicodeEncodeError:
+            # no edge can be labelled with a character outside latin-1
+            return None
+        first, count, isWord, words = _NODE.unpack_from(self._map, node)
+        start = self._labels + first
+        edge = self._map.find(label, start, start + count)
+        if edge < 0:
+            return None
+        child = _CHILD.unpack_from(self._map,
+                                   self._children + 4 * (edge - self._labels))[0]
+        return self._nodes + child * _NODE.size
+
+    def getEdges(self, node):
+        """
+        Returns the list of (char, child) pairs leaving node, sorted by char.
+        """
+        first, count, isWord, words = _NODE.unpack_from(self._map, node)
+        start = self._labels + first
+        labels = self._map[start:start + count].decode('latin-1')
+        children = struct.unpack_from('<{}I'.format(count), self._map,
+                                      self._children + 4 * first)
+        return sorted((char, self._nodes + child * _NODE.size)
+                      for char, child in zip(labels, children))
+
+    def isWordNode(self, node):
+        return self._map[node + 5] == 1
+
+    def getCount(self, node):
+        return _NODE.unpack_from(self._map, node)[3]
+
+    def __findNode(self, prefix):
+        node = self._nodes
+        for char in prefix:
+            node = self.getChild(node, char)
+            if node is None:
+                return None
+        return node
+
+    def contains(self, word):
+        node = self.__findNode(word)
+        return node is not None and self.isWordNode(node)
+
+    def __contains__(self, word):
+        return self.contains(word)
+
+    def isPrefix(self, prefix):
+        return self.__findNode(prefix) is not None
+
+    def countCompletions(self, prefix):
+        node = self.__findNode(prefix)
+        return 0 if node is None else self.getCount(node)
+
+    def __len__(self):
+        return self.getCount(self._nodes)
+
+
+def isCompiledLexicon(lexiconFileName):
+    """
+    Returns True if lexiconFileName starts with the compiled lexicon magic.
+    """
+    with open(lexiconFileName, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def loadLexicon(lexiconFileName):
+    """
+    Opens lexiconFileName as a MappedLexicon if it is a compiled lexicon,
+    and otherwise reads it as a word list (see lexicon.readLexicon).
+    """
+    if isCompiledLexicon(lexiconFileName):
+        return MappedLexicon(lexiconFileName)
+    return readLexicon(lexiconFileName)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        compileLexicon(readLexicon(sys.argv[1]), sys.argv[2])
+    else:
+        from doctest import testmod
+        testmod()
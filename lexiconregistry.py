@@ -0,0 +1,116 @@
+"""
+A process-wide registry of loaded lexicons, so every game in a process shares
+one read-only copy of each word list instead of reading it again.
+"""
+
+import os
+import threading
+from concurrent.futures import Future
+
+from lexiconfile import loadLexicon
+
+
+class LexiconRegistry:
+    """A LexiconRegistry loads each lexicon file once and hands the same
+    object to every caller until the file changes on disk:
+       *  _entries maps an absolute path to (mtime, Future of the lexicon)
+       *  _lock guards _entries
+
+    Lexicons from the registry are shared, so callers must not modify them.
+
+    >>> import os, tempfile
+    >>> path = os.path.join(tempfile.mkdtemp(), "words.txt")
+    >>> with open(path, "w") as f: _ = f.write("cat\\ndog\\n")
+    >>> registry = LexiconRegistry()
+    >>> lex = registry.get(path)
+    >>> "DOG" in lex, registry.get(path) is lex
+    (True, True)
+    >>> registry.getAsync(path).result() is lex
+    True
+    >>> with open(path, "w") as f: _ = f.write("cow\\n")
+    >>> os.utime(path, ns=(0, 0))
+    >>> "COW" in registry.get(path)
+    True
+    """
+
+    __slots__ = ['_entries', '_lock']
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def __entry(self, lexiconName):
+        """
+        Returns (future, isNew) for lexiconName, where isNew is True if the
+        caller is responsible for loading the lexicon into the future.
+        """
+        path = os.path.abspath(lexiconName)
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == mtime:
+                return entry[1], False
+            future = Future()
+            self._entries[path] = (mtime, future)
+            return future, True
+
+    def __load(self, lexiconName, future):
+        try:
+            future.set_result(loadLexicon(lexiconName))
+        except BaseException as e:
+            future.set_exception(e)
+            with self._lock:
+                self._entries.pop(os.path.abspath(lexiconName), None)
+
+    def get(self, lexiconName='bogwords.txt'):
+        """
+        Returns the lexicon in lexiconName, loading it first if it has not
+        been loaded or the file was modified since.
+        """
+        future, isNew = self.__entry(lexiconName)
+        if isNew:
+            self.__load(lexiconName, future)
+        return future.result()
+
+    def getAsync(self, lexiconName='bogwords.txt'):
+        """
+        Returns a Future of the lexicon in lexiconName.  If the lexicon must
+        be (re)loaded, that happens on a background thread, so the caller
+        can do other work (like building the window) in the meantime.
+        """
+        future, isNew = self.__entry(lexiconName)
+        if isNew:
+            threading.Thread(target=self.__load, args=(lexiconName, future),
+                             daemon=True).start()
+        return future
+
+    def clear(self):
+        """
+        Forgets every loaded lexicon.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+# the registry shared by the whole process
+_registry = LexiconRegistry()
+
+
+def getLexicon(lexiconName='bogwords.txt'):
+    """
+    Returns the shared lexicon in lexiconName (see LexiconRegistry.get).
+    """
+    return _registry.get(lexiconName)
+
+
+def loadLexiconAsync(lexiconName='bogwords.txt'):
+    """
+    Returns a Future of the shared lexicon in lexiconName
+    (see LexiconRegistry.getAsync).
+    """
+    return _registry.getAsync(lexiconName)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
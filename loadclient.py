@@ -0,0 +1,137 @@
+"""
+A load-test client for boggleserver.py.  It opens many sessions spread over
+a number of connections, has every session play concurrently (new board,
+letter selections, word submissions, score) and reports requests per second
+and latency percentiles.
+
+    python3 boggleserver.py &
+    python3 loadclient.py --sessions 1000 --connections 50 --rounds 5
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+
+class Connection:
+    """A Connection multiplexes requests from many sessions over one TCP
+    connection, matching responses to requests by their id:
+       *  _reader, _writer are the asyncio streams
+       *  _pending maps request ids to the Futures waiting for them
+       *  _nextId is the next request id
+       *  _latencies collects the seconds taken by each request
+    """
+
+    __slots__ = ['_reader', '_writer', '_pending', '_nextId', '_latencies',
+                 '_readTask']
+
+    def __init__(self, reader, writer, latencies):
+        self._reader = reader
+        self._writer = writer
+        self._pending = {}
+        self._nextId = 0
+        self._latencies = latencies
+        self._readTask = asyncio.ensure_future(self.__readResponses())
+
+    async def __readResponses(self):
+        while True:
+            line = await self._reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            future = self._pending.pop(response.get("id"), None)
+            if future is not None:
+                future.set_result(response)
+        for future in self._pending.values():
+            future.set_exception(ConnectionError("server closed the connection"))
+
+    async def request(self, **request):
+        """
+        Sends one request and returns its response (dict).
+        """
+        self._nextId += 1
+        request["id"] = self._nextId
+        future = asyncio.get_running_loop().create_future()
+        self._pending[self._nextId] = future
+        start = time.perf_counter()
+        self._writer.write(json.dumps(request).encode() + b'\n')
+        await self._writer.drain()
+        response = await future
+        self._latencies.append(time.perf_counter() - start)
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response
+
+    async def close(self):
+        self._writer.close()
+        await self._readTask
+
+
+async def playSession(connection, rounds, rng):
+    """
+    Plays rounds boards in one session: clicks a short random path,
+    submits a few words and asks for the score.
+    """
+    session = (await connection.request(op="open"))["session"]
+    for i in range(rounds):
+        await connection.request(op="new", session=session)
+        col, row = rng.randrange(4), rng.randrange(4)
+        for step in range(4):
+            await connection.request(op="select", session=session, col=col,
+                                     row=row)
+            col = min(max(col + rng.choice((-1, 0, 1)), 0), 3)
+            row = min(max(row + rng.choice((-1, 0, 1)), 0), 3)
+        for word in ("TEA", "RATE", "STONE"):
+            await connection.request(op="submit", session=session, word=word)
+        await connection.request(op="score", session=session)
+    await connection.request(op="close", session=session)
+
+
+def percentile(sortedValues, fraction):
+    return sortedValues[min(int(len(sortedValues) * fraction),
+                            len(sortedValues) - 1)]
+
+
+async def runLoad(host, port, sessions, connections, rounds, seed=0):
+    """
+    Runs the load test and returns (requests, seconds, sorted latencies).
+    """
+    latencies = []
+    conns = []
+    for i in range(connections):
+        reader, writer = await asyncio.open_connection(host, port,
+                                                       limit=1 << 16)
+        conns.append(Connection(reader, writer, latencies))
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    await asyncio.gather(*[playSession(conns[i % connections], rounds,
+                                       random.Random(rng.random()))
+                           for i in range(sessions)])
+    elapsed = time.perf_counter() - start
+    for conn in conns:
+        await conn.close()
+    return len(latencies), elapsed, sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--connections', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    requests, seconds, latencies = asyncio.run(runLoad(
+        args.host, args.port, args.sessions, args.connections, args.rounds))
+    print("{} sessions, {} requests in {:.2f}s: {:.0f} requests/s".format(
+        args.sessions, requests, seconds, requests / seconds))
+    print("latency ms: p50 {:.2f}  p99 {:.2f}  max {:.2f}".format(
+        percentile(latencies, 0.5) * 1000, percentile(latencies, 0.99) * 1000,
+        latencies[-1] * 1000))
+
+
+if __name__ == "__main__":
+    main()
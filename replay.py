@@ -0,0 +1,200 @@
+"""
+Replays click streams (see clickstream.py) into headless games, either as
+fast as possible or at the pace they were recorded, and reports the clicks
+and keys per second and the latency of each one.  Recorded streams end with the
+game's score and found words, and the replay must reproduce them.
+
+    BOGGLE_RECORD=game.clk python3 bogglegameEC.py     # record a game
+    python3 replay.py game.clk [--paced] [--repeat 10]
+    python3 replay.py --synthetic 100000 [--seed 3] [--size 5]
+
+The exit status is 1 if a replay ends with a different score or words.
+"""
+
+import os
+os.environ.setdefault('BOGGLE_BACKEND', 'headless')
+
+import argparse
+import sys
+import time
+
+from backend import GraphWin, Point
+from boggleboard import BoggleBoard
+from bogglegameEC import BoggleGame
+from brandom import randomize
+from clickstream import ClickStream, readClickStream, syntheticClicks
+
+
+class ReplayResult:
+    """What a replay did: the clicks and keys it played, the seconds they
+    took, the seconds each doOneClick or doOneKey took, and the game's final
+    score and words."""
+
+    __slots__ = ['_clicks', '_keys', '_seconds', '_latencies', '_score',
+                 '_words']
+
+    def __init__(self, clicks, keys, seconds, latencies, score, words):
+        self._clicks = clicks
+        self._keys = keys
+        self._seconds = seconds
+        self._latencies = latencies
+        self._score = score
+        self._words = words
+
+    def getClicks(self):
+        return self._clicks
+
+    def getKeys(self):
+        return self._keys
+
+    def getScore(self):
+        return self._score
+
+    def getWords(self):
+        return self._words
+
+    def getEventsPerSecond(self):
+        """
+        Returns the clicks and keys played per second.
+        """
+        events = self._clicks + self._keys
+        return events / self._seconds if self._seconds else 0.0
+
+    def getLatencyMs(self, fraction):
+        """
+        Returns the given percentile (0.5 for the median) of the click and
+        key latencies, in milliseconds.
+        """
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] * 1000
+
+    def matches(self, stream):
+        """
+        Returns True if the replay ended like the recorded game, False if
+        not, and None if stream has no recorded ending.
+        """
+        if stream.getScore() is None:
+            return None
+        return (self._score == stream.getScore()
+                and self._words == stream.getWords())
+
+    def __str__(self):
+        return ("{} clicks and {} keys in {:.3f}s ({:.0f}/s), latency p50 "
+                "{:.4f} ms p99 {:.4f} ms, score {}, {} words").format(
+                    self._clicks, self._keys, self._seconds,
+                    self.getEventsPerSecond(),
+                    self.getLatencyMs(0.5), self.getLatencyMs(0.99),
+                    self._score, len(self._words))
+
+
+def syntheticStream(clicks, seed=0, boardSize=4):
+    """
+    Returns a ClickStream of clicks synthetic clicks (see
+    clickstream.syntheticClicks) on a board of the given size.  It has no
+    recorded ending to check.
+    """
+    board = BoggleBoard(GraphWin("Boggle", 400, 400), boardSize)
+    points = syntheticClicks(board, clicks, seed)
+    return ClickStream(seed, boardSize,
+                       [(0.0, point.getX(), point.getY(), None)
+                        for point in points])
+
+
+def replay(stream, paced=False, lexiconName='bogwords.txt'):
+    """
+    Plays stream into a new headless game and returns the ReplayResult:
+    clicks go to doOneClick and key presses to doOneKey.  The game is
+    created right after randomize(seed), as a recorded game is, so it sees
+    the same boards.  With paced, clicks and keys are spaced as they were
+    recorded; otherwise they are played back to back.  Replay stops early
+    if a click ends the game.
+
+    >>> stream = syntheticStream(200, seed=1)
+    >>> first, second = replay(stream), replay(stream)
+    >>> first.getClicks(), first.getScore() == second.getScore()
+    (200, True)
+
+    A word typed during a recorded game is replayed too:
+
+    >>> import io
+    >>> from clickstream import ClickRecorder
+    >>> randomize(7)
+    >>> game = BoggleGame(GraphWin("Boggle", 400, 400), backgroundSolve=False)
+    >>> solver = game.getBoard().getBoardSize().makeSolver(game._validWords)
+    >>> word = min(solver.solveBoard(game.getBoard()))
+    >>> f = io.BytesIO()
+    >>> recorder = ClickRecorder(f, seed=7)
+    >>> onKey = recorder.wrapKeys(game.doOneKey)
+    >>> for key in list(word.lower()) + ["Return"]:
+    ...     _ = onKey(key)
+    >>> game.getFoundWords() == [word]
+    True
+    >>> recorder.finish(game.getScore(), game.getFoundWords())
+    >>> stream = readClickStream(io.BytesIO(f.getvalue()))
+    >>> result = replay(stream)
+    >>> result.getKeys() == len(word) + 1, result.matches(stream)
+    (True, True)
+    """
+    randomize(stream.getSeed())
+    game = BoggleGame(GraphWin("Boggle", 400, 400), lexiconName,
+                      backgroundSolve=False, boardSize=stream.getBoardSize())
+    latencies = []
+    clicks = keys = 0
+    start = due = time.perf_counter()
+    for delay, x, y, key in stream.getEvents():
+        if paced:
+            due += delay
+            wait = due - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+        if key is None:
+            point = Point(x, y)
+            eventStart = time.perf_counter()
+            keepGoing = game.doOneClick(point)
+            clicks += 1
+        else:
+            eventStart = time.perf_counter()
+            keepGoing = game.doOneKey(key)
+            keys += 1
+        latencies.append(time.perf_counter() - eventStart)
+        if not keepGoing:
+            break
+    return ReplayResult(clicks, keys, time.perf_counter() - start,
+                        latencies, game.getScore(), game.getFoundWords())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('stream', nargs='?', help='recorded click stream')
+    source.add_argument('--synthetic', type=int, metavar='CLICKS',
+                        help='replay this many synthetic clicks instead')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--size', type=int, default=4)
+    parser.add_argument('--paced', action='store_true',
+                        help='replay at the recorded pace')
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--lexicon', default='bogwords.txt')
+    args = parser.parse_args()
+
+    if args.stream:
+        with open(args.stream, 'rb') as f:
+            stream = readClickStream(f)
+    else:
+        stream = syntheticStream(args.synthetic, args.seed, args.size)
+
+    status = 0
+    for i in range(args.repeat):
+        result = replay(stream, args.paced, args.lexicon)
+        matched = result.matches(stream)
+        print(result, '' if matched is None
+              else '(matches recording)' if matched else '(DIFFERS FROM RECORDING)')
+        if matched is False:
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
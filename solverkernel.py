@@ -0,0 +1,179 @@
+"""
+The inner search loop shared by the Boggle solvers.  Cells of a rows x cols
+grid are numbered column by column (cell = col * rows + row), adjacency
+comes from a precomputed neighbor table and the cells used by the current
+path are tracked as bits of an int.
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def neighborTable(rows, cols):
+    """
+    Returns a tuple holding, for each cell of a rows x cols grid, the tuple
+    of cells adjacent to it.  Tables are built once per grid size.
+
+    >>> table = neighborTable(4, 4)
+    >>> len(table), table[0], len(table[5])
+    (16, (1, 4, 5), 8)
+    >>> neighborTable(4, 4) is table
+    True
+    >>> neighborTable(2, 3)[2]
+    (0, 1, 3, 4, 5)
+    """
+    table = []
+    for col in range(cols):
+        for row in range(rows):
+            cells = []
+            for c in range(max(col - 1, 0), min(col + 2, cols)):
+                for r in range(max(row - 1, 0), min(row + 2, rows)):
+                    if c != col or r != row:
+                        cells.append(c * rows + r)
+            table.append(tuple(cells))
+    return tuple(table)
+
+
+def cellToPosition(cell, rows):
+    """
+    Converts a cell number to a (col, row) tuple.
+
+    >>> cellToPosition(6, 4)
+    (1, 2)
+    """
+    return divmod(cell, rows)
+
+
+def findWords(faces, rows, cols, lexicon, cancelled=None, minLength=1):
+    """
+    Returns a dictionary mapping each word that can be spelled on the grid
+    to a tuple of the cells spelling it.  faces is the list of (upper case)
+    faces in cell order; lexicon is walked through its node interface
+    (getRoot, getChild, isWordNode).  Words shorter than minLength letters
+    are skipped.  If cancelled (a threading.Event) is given, it is checked
+    before each starting cell and the search returns None as soon as it is
+    set.
+
+    >>> from lexicon import Lexicon
+    >>> findWords(["QU", "T", "I", "N"], 2, 2, Lexicon(["QUIT", "TIN"]))
+    {'QUIT': (0, 2, 1), 'TIN': (1, 2, 3)}
+    >>> findWords(["QU", "T", "I", "N"], 2, 2, Lexicon(["QUIT", "TIN"]),
+    ...           minLength=4)
+    {'QUIT': (0, 2, 1)}
+    """
+    neighbors = neighborTable(rows, cols)
+    getChild = lexicon.getChild
+    isWordNode = lexicon.isWordNode
+    found = {}
+    path = []
+
+    def search(cell, node, word, visited):
+        face = faces[cell]
+        for char in face:
+            node = getChild(node, char)
+            if node is None:
+                return
+        word += face
+        path.append(cell)
+        if isWordNode(node) and len(word) >= minLength and word not in found:
+            found[word] = tuple(path)
+        visited |= 1 << cell
+        for nextCell in neighbors[cell]:
+            if not visited >> nextCell & 1:
+                search(nextCell, node, word, visited)
+        path.pop()
+
+    root = lexicon.getRoot()
+    for cell in range(rows * cols):
+        if cancelled is not None and cancelled.is_set():
+            return None
+        search(cell, root, '', 0)
+    return found
+
+
+def findTokenWords(tokens, rows, cols, lexicon, cancelled=None, minLength=1):
+    """
+    Like findWords, for a lexicon compiled against a tile alphabet (a
+    tilealphabet.TokenLexicon): tokens is the list of the faces' token ids
+    in cell order (None for a face outside the alphabet), each cell moves
+    the search one step through the trie, and words are read off the nodes
+    they end at.
+
+    >>> from tilealphabet import TileAlphabet, TokenLexicon
+    >>> alphabet = TileAlphabet(["Qu", "T", "I", "N"])
+    >>> lexicon = TokenLexicon(["QUIT", "TIN"], alphabet)
+    >>> findTokenWords([0, 1, 2, 3], 2, 2, lexicon)
+    {'QUIT': (0, 2, 1), 'TIN': (1, 2, 3)}
+    """
+    neighbors = neighborTable(rows, cols)
+    getChild = lexicon.getChild
+    getWord = lexicon.getWord
+    found = {}
+    path = []
+
+    def search(cell, node, visited):
+        node = getChild(node, tokens[cell])
+        if node is None:
+            return
+        path.append(cell)
+        word = getWord(node)
+        if word is not None and len(word) >= minLength and word not in found:
+            found[word] = tuple(path)
+        visited |= 1 << cell
+        for nextCell in neighbors[cell]:
+            if not visited >> nextCell & 1:
+                search(nextCell, node, visited)
+        path.pop()
+
+    root = lexicon.getRoot()
+    for cell in range(rows * cols):
+        if cancelled is not None and cancelled.is_set():
+            return None
+        search(cell, root, 0)
+    return found
+
+
+def findPath(faces, rows, cols, text, limit=None):
+    """
+    Returns a tuple of the cells of one path spelling text (upper case str)
+    on the grid, or None if there is none.  A face matches when text
+    continues with all of its letters.  If limit is given, the search gives
+    up (returning None) after trying that many cells.
+
+    >>> findPath(["QU", "T", "I", "N"], 2, 2, "QUIT")
+    (0, 2, 1)
+    >>> findPath(["QU", "T", "I", "N"], 2, 2, "QUITQU") is None
+    True
+    """
+    neighbors = neighborTable(rows, cols)
+    path = []
+    budget = [limit]
+
+    def search(cell, offset, visited):
+        if budget[0] is not None:
+            if budget[0] <= 0:
+                return False
+            budget[0] -= 1
+        face = faces[cell]
+        if not text.startswith(face, offset):
+            return False
+        offset += len(face)
+        path.append(cell)
+        if offset == len(text):
+            return True
+        visited |= 1 << cell
+        for nextCell in neighbors[cell]:
+            if not visited >> nextCell & 1 and search(nextCell, offset, visited):
+                return True
+        path.pop()
+        return False
+
+    for cell in range(rows * cols):
+        if search(cell, 0, 0):
+            return tuple(path)
+    return None
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,191 @@
+"""
+Finds boards of a chosen difficulty by rejection sampling: boards are rolled
+from the standard dice, solved, and kept only if they meet the criteria.
+Sampling runs on a process pool and stops as soon as enough boards match.
+
+    python3 targetboards.py --count 20 --min-words 60 --max-score 200
+
+Matching boards are streamed as JSONL (see batchsolver.JsonlWriter), keyed
+by the seed that rolls them (see batchsolver.seedBoards).
+"""
+
+import argparse
+import sys
+import time
+
+from batchsolver import (JsonlWriter, encodeBoard, initWorker, runPool,
+                         seedBoards, workerSolve)
+
+
+class BoardCriteria:
+    """BoardCriteria accept boards whose word count and total score lie in
+    the given (inclusive) bounds; a bound of None is not checked.  predicate
+    may be a further test, called with (count, score, words); it must be a
+    module level function so it can be sent to worker processes.
+
+    >>> criteria = BoardCriteria(minWords=60, maxScore=200)
+    >>> criteria.accepts(75, 150, []), criteria.accepts(40, 50, [])
+    (True, False)
+    >>> BoardCriteria(predicate=hasLongWord).accepts(1, 11, ["BOGGLERS"])
+    True
+    """
+
+    __slots__ = ['_minWords', '_maxWords', '_minScore', '_maxScore',
+                 '_predicate']
+
+    def __init__(self, minWords=None, maxWords=None, minScore=None,
+                 maxScore=None, predicate=None):
+        self._minWords = minWords
+        self._maxWords = maxWords
+        self._minScore = minScore
+        self._maxScore = maxScore
+        self._predicate = predicate
+
+    def accepts(self, count, score, words):
+        """
+        Returns True if a board with count words scoring score in total
+        meets the criteria.
+        """
+        if self._minWords is not None and count < self._minWords:
+            return False
+        if self._maxWords is not None and count > self._maxWords:
+            return False
+        if self._minScore is not None and score < self._minScore:
+            return False
+        if self._maxScore is not None and score > self._maxScore:
+            return False
+        return self._predicate is None or self._predicate(count, score, words)
+
+
+def hasLongWord(count, score, words, length=8):
+    """
+    An example predicate: accepts boards with a word of at least length
+    letters.
+    """
+    return any(len(word) >= length for word in words)
+
+
+def _sampleSeeds(start, stop, criteria):
+    """
+    Solves the boards rolled by seeds start..stop-1 in a worker process and
+    returns (boards sampled, list of matching results).
+    """
+    matches = []
+    for seed, faces in seedBoards(start, stop):
+        count, score, words = workerSolve(faces)
+        if criteria.accepts(count, score, words):
+            matches.append((seed, encodeBoard(faces), count, score, words))
+    return stop - start, matches
+
+
+class SamplingStats:
+    """How a sampling run went: the boards sampled, how many of them matched
+    the criteria, how many of those were kept (at most the number asked
+    for), and the seconds it took."""
+
+    __slots__ = ['_sampled', '_matched', '_kept', '_seconds']
+
+    def __init__(self, sampled, matched, kept, seconds):
+        self._sampled = sampled
+        self._matched = matched
+        self._kept = kept
+        self._seconds = seconds
+
+    def getSampled(self):
+        return self._sampled
+
+    def getMatched(self):
+        return self._matched
+
+    def getKept(self):
+        return self._kept
+
+    def getAcceptanceRate(self):
+        return self._matched / self._sampled if self._sampled else 0.0
+
+    def __str__(self):
+        return ("kept {} boards; {} of {} sampled boards matched ({:.2%}) "
+                "in {:.2f}s ({:.0f} boards/s)").format(
+                    self._kept, self._matched, self._sampled,
+                    self.getAcceptanceRate(), self._seconds,
+                    self._sampled / self._seconds if self._seconds else 0.0)
+
+
+def findBoards(criteria, count, writer, workers=None, chunkSize=256,
+               startSeed=0, maxBoards=None, lexiconName='bogwords.txt'):
+    """
+    Samples boards from seed startSeed upwards until count of them meet
+    criteria (or maxBoards have been sampled), passing each match to
+    writer.write as soon as it is found.  Returns the SamplingStats.
+    workers=0 samples in this process.
+
+    >>> import io
+    >>> out = io.StringIO()
+    >>> stats = findBoards(BoardCriteria(minWords=80), 2, JsonlWriter(out),
+    ...                    workers=0, chunkSize=16)
+    >>> stats.getKept(), len(out.getvalue().splitlines())
+    (2, 2)
+    """
+    start = time.perf_counter()
+    sampled = matched = kept = 0
+    stopSeed = None if maxBoards is None else startSeed + maxBoards
+
+    def chunks():
+        nextSeed = startSeed
+        while stopSeed is None or nextSeed < stopSeed:
+            stop = nextSeed + chunkSize
+            if stopSeed is not None:
+                stop = min(stop, stopSeed)
+            yield nextSeed, stop, criteria
+            nextSeed = stop
+
+    def report(result):
+        nonlocal sampled, matched, kept
+        boards, matches = result
+        sampled += boards
+        matched += len(matches)
+        for match in matches[:count - kept]:
+            writer.write(*match)
+            kept += 1
+
+    runPool(chunks(), _sampleSeeds, report, workers, initWorker,
+            (lexiconName, 4), stop=lambda: kept >= count)
+    return SamplingStats(sampled, matched, kept,
+                         time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, required=True,
+                        help='number of matching boards to find')
+    parser.add_argument('--min-words', type=int)
+    parser.add_argument('--max-words', type=int)
+    parser.add_argument('--min-score', type=int)
+    parser.add_argument('--max-score', type=int)
+    parser.add_argument('--long-word', action='store_true',
+                        help='also require a word of 8 or more letters')
+    parser.add_argument('--max-boards', type=int,
+                        help='give up after sampling this many boards')
+    parser.add_argument('--start-seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk', type=int, default=256)
+    parser.add_argument('--out', default='-')
+    parser.add_argument('--lexicon', default='bogwords.txt')
+    args = parser.parse_args()
+
+    criteria = BoardCriteria(args.min_words, args.max_words, args.min_score,
+                             args.max_score,
+                             hasLongWord if args.long_word else None)
+    out = sys.stdout if args.out == '-' else open(args.out, 'w')
+    try:
+        stats = findBoards(criteria, args.count, JsonlWriter(out), args.workers,
+                           args.chunk, args.start_seed, args.max_boards,
+                           args.lexicon)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(stats, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
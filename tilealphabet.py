@@ -0,0 +1,423 @@
+"""
+Tile alphabets: the faces a set of dice can show, each numbered by a token
+id, and lexicons compiled into sequences of those tokens.
+
+A face is one letter ("A", "É") or several ("Qu", "Th", "In").  Once a
+lexicon is compiled against an alphabet, a tile moves a search through the
+trie in one step, whatever the length of its face, and a word is found by
+the node it ends at rather than by joining and re-slicing strings.  A word
+that the dice can spell in more than one way ("THE" from "Th" "E" or from
+"T" "H" "E") is stored under every spelling; a word they cannot spell at
+all (any word with a Q, for dice whose only Q face is "Qu") is left out.
+"""
+
+import threading
+import unicodedata
+import weakref
+from concurrent.futures import Future
+
+from lexicon import lexiconWords
+
+
+def normalizeFace(text):
+    """
+    Returns text (a face or a word) in the form faces and words are
+    compared in: composed Unicode (NFC), upper case.
+
+    >>> normalizeFace("Qu"), normalizeFace("e\\u0301") == "\\u00c9"
+    ('QU', True)
+    """
+    return unicodedata.normalize('NFC', text).upper()
+
+
+class TileAlphabet:
+    """A TileAlphabet numbers the faces of a set of dice:
+       *  _faces is the tuple of normalized faces, indexed by token id
+       *  _names is the tuple of the faces as first written ("Qu" rather
+          than "QU"), indexed by token id, for showing them
+       *  _tokens maps a normalized face to its token id
+       *  _lengths are the distinct lengths of the faces, shortest first
+       *  _multi are the faces of more than one letter
+
+    Alphabets with the same faces are equal, so they can key caches.
+
+    >>> alphabet = TileAlphabet(["A", "Qu", "T", "I", "Th", "H", "E"])
+    >>> len(alphabet), alphabet.getToken("qu"), alphabet.getFace(1), alphabet.getName(1)
+    (7, 1, 'QU', 'Qu')
+    >>> alphabet.getToken("Z") is None
+    True
+    >>> [alphabet.spell(tokens) for tokens in alphabet.tokenize("the")]
+    [['T', 'H', 'E'], ['TH', 'E']]
+    >>> alphabet.tokenize("QAT")
+    []
+    """
+
+    __slots__ = ['_faces', '_names', '_tokens', '_lengths', '_multi']
+
+    def __init__(self, faces):
+        self._faces = ()
+        self._names = ()
+        self._tokens = {}
+        for name in faces:
+            face = normalizeFace(name)
+            if face and face not in self._tokens:
+                self._tokens[face] = len(self._faces)
+                self._faces += (face,)
+                self._names += (unicodedata.normalize('NFC', name),)
+        self._lengths = tuple(sorted({len(face) for face in self._faces}))
+        self._multi = tuple(face for face in self._faces if len(face) > 1)
+
+    @classmethod
+    def fromCubes(cls, cubes):
+        """
+        Returns the alphabet of every face of cubes (a list of dice, each
+        a list of faces), numbered in the order the faces first appear.
+        """
+        return cls(face for cube in cubes for face in cube)
+
+    def __len__(self):
+        return len(self._faces)
+
+    def __eq__(self, other):
+        return isinstance(other, TileAlphabet) and self._faces == other._faces
+
+    def __hash__(self):
+        return hash(self._faces)
+
+    def __contains__(self, face):
+        return normalizeFace(face) in self._tokens
+
+    def getFaces(self):
+        return self._faces
+
+    def getLengths(self):
+        return self._lengths
+
+    def getToken(self, face):
+        """
+        Returns the token id of face (any case), or None if no die shows it.
+        """
+        token = self._tokens.get(face)
+        if token is None:
+            token = self._tokens.get(normalizeFace(face))
+        return token
+
+    def getFace(self, token):
+        return self._faces[token]
+
+    def getName(self, token):
+        return self._names[token]
+
+    def spell(self, tokens):
+        """
+        Returns the list of faces of a sequence of token ids.
+        """
+        return [self._faces[token] for token in tokens]
+
+    def tokenize(self, word):
+        """
+        Returns every way of spelling word (any case) with the alphabet's
+        faces, as a list of tuples of token ids; the list is empty if there
+        is none.
+        """
+        word = normalizeFace(word)
+        tokens = self._tokens
+        # spellings[i] holds the spellings of word[i:]
+        spellings = [[] for i in range(len(word))] + [[()]]
+        for start in range(len(word) - 1, -1, -1):
+            for length in self._lengths:
+                token = tokens.get(word[start:start + length])
+                if token is not None and start + length <= len(word):
+                    spellings[start].extend((token,) + rest
+                                            for rest in spellings[start + length])
+        return spellings[0]
+
+    def simpleSpelling(self, word):
+        """
+        Returns the list of token ids spelling word (a normalized str) one
+        letter per tile, if that is its only spelling: none of the
+        multi-letter faces occur in it and every letter is a face.  Returns
+        None otherwise.  Most words of most lexicons are spelled this way,
+        and it is much quicker to check than tokenize.
+        """
+        for face in self._multi:
+            if face in word:
+                return None
+        tokens = self._tokens
+        spelling = [tokens.get(char) for char in word]
+        return None if None in spelling else spelling
+
+    def spellable(self, word):
+        """
+        Returns a list of bools saying, for each position i in word (a
+        normalized str) and for its end, whether word[i:] can be spelled.
+        """
+        tokens = self._tokens
+        spellable = [False] * len(word) + [True]
+        for start in range(len(word) - 1, -1, -1):
+            for length in self._lengths:
+                if (spellable[start + length] if start + length <= len(word)
+                        else False) and word[start:start + length] in tokens:
+                    spellable[start] = True
+                    break
+        return spellable
+
+
+class TokenNode:
+    """A TokenNode is a single node of a token trie:
+       *  _children maps the next token id (int) to the child TokenNode
+       *  _word is the word spelled by the path from the root to this node,
+          or None if it does not spell a word
+       *  _count is the number of words that pass through (or end at) this
+          node
+    """
+
+    __slots__ = ['_children', '_word', '_count']
+
+    def __init__(self):
+        self._children = {}
+        self._word = None
+        self._count = 0
+
+
+class TokenLexicon:
+    """A TokenLexicon is a lexicon compiled against a TileAlphabet: a trie
+    whose edges are token ids.  It has the node interface of a Lexicon
+    (getRoot, getChild, isWordNode, getCount), with getChild taking a token
+    id, so solvers and LexiconCursor walk it one tile at a time:
+       *  _alphabet is the TileAlphabet the words were compiled against
+       *  _root is the root TokenNode
+       *  _size is the number of words the alphabet can spell
+
+    >>> alphabet = TileAlphabet(["Qu", "I", "T", "E", "S"])
+    >>> lex = TokenLexicon(["quit", "quite", "QAT", "its"], alphabet)
+    >>> len(lex), "QUITE" in lex, "QAT" in lex
+    (3, True, False)
+    >>> node = lex.getRoot()
+    >>> for face in ["Qu", "I", "T"]:
+    ...     node = lex.getChild(node, alphabet.getToken(face))
+    >>> lex.getWord(node), lex.getCount(node)
+    ('QUIT', 2)
+    """
+
+    __slots__ = ['_alphabet', '_root', '_size']
+
+    def __init__(self, words, alphabet):
+        """
+        Compiles words (an iterable of str, in any case) against alphabet.
+        Words the alphabet can't spell are skipped.
+        """
+        self._alphabet = alphabet
+        self._root = TokenNode()
+        self._size = 0
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        """
+        Adds word (str) under every spelling the alphabet has for it.
+        Returns True if it was added, False if it can't be spelled or was
+        already there.
+        """
+        word = normalizeFace(word)
+        alphabet = self._alphabet
+        spelling = alphabet.simpleSpelling(word)
+        if spelling is not None:
+            node = self._root
+            for token in spelling:
+                child = node._children.get(token)
+                if child is None:
+                    child = node._children[token] = TokenNode()
+                node = child
+            if node._word is not None:
+                return False
+            node._word = word
+            node = self._root
+            node._count += 1
+            for token in spelling:
+                node = node._children[token]
+                node._count += 1
+            self._size += 1
+            return True
+        spellable = alphabet.spellable(word)
+        if not spellable[0]:
+            return False
+        # walk every spelling at once, only along positions from which the
+        # rest of the word can still be spelled, so no dead nodes are made
+        tokens = alphabet._tokens
+        lengths = alphabet.getLengths()
+        end = len(word)
+        passed = {}
+        stack = [(self._root, 0)]
+        while stack:
+            node, start = stack.pop()
+            passed[id(node)] = node
+            if start == end:
+                if node._word is not None:
+                    return False
+                node._word = word
+                continue
+            for length in lengths:
+                if start + length <= end and spellable[start + length]:
+                    token = tokens.get(word[start:start + length])
+                    if token is not None:
+                        child = node._children.get(token)
+                        if child is None:
+                            child = node._children[token] = TokenNode()
+                        stack.append((child, start + length))
+        # a node shared by two spellings still counts the word once
+        for node in passed.values():
+            node._count += 1
+        self._size += 1
+        return True
+
+    def getAlphabet(self):
+        return self._alphabet
+
+    def contains(self, word):
+        """
+        Returns True if word (str, any case) is in the lexicon.
+        """
+        for tokens in self._alphabet.tokenize(word):
+            node = self._root
+            for token in tokens:
+                node = node._children.get(token)
+                if node is None:
+                    break
+            else:
+                if node._word is not None:
+                    return True
+        return False
+
+    def __contains__(self, word):
+        return self.contains(word)
+
+    def __len__(self):
+        return self._size
+
+    def getRoot(self):
+        return self._root
+
+    def getChild(self, node, token):
+        """
+        Returns the child of node reached by the tile token (a token id),
+        or None if no word continues that way.
+        """
+        return node._children.get(token)
+
+    def isWordNode(self, node):
+        return node._word is not None
+
+    def getWord(self, node):
+        """
+        Returns the word (normalized str) node spells, or None.
+        """
+        return node._word
+
+    def getCount(self, node):
+        return node._count
+
+
+class _CompiledLexicons:
+    """Compiled TokenLexicons shared by every solver and game in a process,
+    so each lexicon is compiled once per alphabet:
+       *  _entries maps a lexicon to a dictionary mapping each alphabet to
+          the Future of the TokenLexicon; it holds the lexicons weakly, so
+          a lexicon replaced in the registry is freed with its compiles
+       *  _lock guards _entries
+
+    >>> import gc
+    >>> from lexicon import Lexicon
+    >>> cache, words = _CompiledLexicons(), Lexicon(["TIN"])
+    >>> len(cache.get(words, TileAlphabet(["T", "I", "N"]))), len(cache)
+    (1, 1)
+    >>> del words; _ = gc.collect(); len(cache)
+    0
+    """
+
+    __slots__ = ['_entries', '_lock']
+
+    def __init__(self):
+        self._entries = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __entry(self, lexicon, alphabet):
+        """
+        Returns (future, isNew) for lexicon and alphabet, where isNew is
+        True if the caller is responsible for compiling into the future.
+        """
+        with self._lock:
+            compiled = self._entries.get(lexicon)
+            if compiled is None:
+                compiled = self._entries[lexicon] = {}
+            future = compiled.get(alphabet)
+            if future is not None:
+                return future, False
+            future = compiled[alphabet] = Future()
+            return future, True
+
+    def __compile(self, lexicon, alphabet, future):
+        try:
+            future.set_result(TokenLexicon(lexiconWords(lexicon), alphabet))
+        except BaseException as e:
+            future.set_exception(e)
+            with self._lock:
+                self._entries.get(lexicon, {}).pop(alphabet, None)
+
+    def get(self, lexicon, alphabet):
+        future, isNew = self.__entry(lexicon, alphabet)
+        if isNew:
+            self.__compile(lexicon, alphabet, future)
+        return future.result()
+
+    def getAsync(self, lexicon, alphabet):
+        future, isNew = self.__entry(lexicon, alphabet)
+        if isNew:
+            threading.Thread(target=self.__compile,
+                             args=(lexicon, alphabet, future),
+                             daemon=True).start()
+        return future
+
+
+_compiled = _CompiledLexicons()
+
+
+def getTokenLexicon(lexicon, alphabet):
+    """
+    Returns lexicon (a Lexicon or MappedLexicon) compiled against alphabet,
+    compiling it only the first time it is asked for.
+
+    >>> from lexicon import Lexicon
+    >>> words = Lexicon(["QUIT", "TIN"])
+    >>> alphabet = TileAlphabet(["Qu", "I", "T", "N"])
+    >>> tokens = getTokenLexicon(words, alphabet)
+    >>> len(tokens), getTokenLexicon(words, TileAlphabet(["Qu", "I", "T", "N"])) is tokens
+    (2, True)
+    """
+    return _compiled.get(lexicon, alphabet)
+
+
+def getTokenLexiconAsync(lexicon, alphabet):
+    """
+    Returns a Future of lexicon compiled against alphabet (see
+    getTokenLexicon).  If it has not been compiled yet, that happens on a
+    background thread, so a game can draw its window and take input while
+    the trie is built.
+
+    >>> from lexicon import Lexicon
+    >>> words = Lexicon(["QUIT", "TIN"])
+    >>> alphabet = TileAlphabet(["Qu", "I", "T", "N"])
+    >>> future = getTokenLexiconAsync(words, alphabet)
+    >>> future.result() is getTokenLexicon(words, alphabet)
+    True
+    """
+    return _compiled.getAsync(lexicon, alphabet)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,100 @@
+"""
+The Tk backend: graphics.py with a GraphWin that supports batched drawing.
+
+With autoflush on, every setText, setFill or other reconfiguration in
+graphics.py calls _root.update(), so changing 16 letters repaints the window
+16 times.  Inside a `with win.batch():` block reconfigurations are queued
+instead; repeated changes to the same item are coalesced into one
+itemconfig call, and the window is flushed once when the outermost batch
+ends.
+"""
+
+from contextlib import contextmanager
+
+import graphics
+from graphics import *
+from instrument import count, span
+
+
+class GraphWin(graphics.GraphWin):
+    """A graphics.GraphWin with a batch() drawing transaction.  Adds:
+       *  batching, which can be set to False to make batch() a no-op
+          (handy for before/after timings)
+       *  _batchDepth, the number of batch() blocks currently open
+       *  _pending, maps a Tk item id to its queued configuration
+       *  _savedAutoflush, the autoflush setting to restore after a batch
+       *  _keyCallback, called with the keysym of every key pressed, like
+          the mouse handler is with every click
+    """
+
+    def __init__(self, title="Graphics Window", width=200, height=200,
+                 autoflush=True):
+        self.batching = True
+        self._batchDepth = 0
+        self._pending = {}
+        self._savedAutoflush = autoflush
+        self._keyCallback = None
+        super().__init__(title, width, height, autoflush)
+
+    @contextmanager
+    def batch(self):
+        """
+        Defers and coalesces drawing updates until the block ends.  Batches
+        may be nested; only the outermost one flushes.
+        """
+        if not self.batching:
+            yield self
+            return
+        if self._batchDepth == 0:
+            self._savedAutoflush = self.autoflush
+            self.autoflush = False
+        self._batchDepth += 1
+        try:
+            yield self
+        finally:
+            self._batchDepth -= 1
+            if self._batchDepth == 0:
+                self.autoflush = self._savedAutoflush
+                self.__commit()
+
+    def __commit(self):
+        """
+        Applies every queued configuration and flushes the window once.
+        """
+        pending = self._pending
+        self._pending = {}
+        if self.isClosed():
+            return
+        with span('graphics.batchCommit'):
+            for itemId, options in pending.items():
+                graphics.tk.Canvas.itemconfigure(self, itemId, options)
+            if self.autoflush:
+                count('graphics.flush')
+                with span('graphics.update'):
+                    graphics.update()
+
+    def setKeyHandler(self, func):
+        self._keyCallback = func
+
+    def _onKey(self, evnt):
+        if self._keyCallback:
+            self._keyCallback(evnt.keysym)
+        else:
+            super()._onKey(evnt)
+
+    def close(self):
+        """
+        Closes the window and leaves any running mainloop, so an event
+        loop ends when the user closes the window.
+        """
+        super().close()
+        self.quit()
+
+    def itemconfig(self, tagOrId, cnf=None, **kw):
+        if self._batchDepth and cnf is not None and not kw:
+            self._pending[tagOrId] = dict(cnf)
+            return None
+        if self.autoflush:
+            # graphics.py repaints the window after every reconfiguration
+            count('graphics.flush')
+        return graphics.tk.Canvas.itemconfigure(self, tagOrId, cnf, **kw)
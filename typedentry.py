@@ -0,0 +1,193 @@
+"""
+Incremental tracking of the board paths that spell a word as it is typed.
+
+Every path spelling the typed text is summed up by the state it ends in:
+the cell it ends on, the cells it has used (a bitmask) and how many letters
+of that cell's face have been typed so far (a "Qu" face takes two
+keystrokes).  Paths ending in the same state can be continued in exactly
+the same ways, so only one is kept.  Each keystroke extends the current
+states by one letter instead of searching the board again.
+"""
+
+from collections import Counter
+
+from solverkernel import findPath, neighborTable
+
+# the most states kept per keystroke; boards of one repeated letter can
+# have many thousands of paths, and the cap keeps each keystroke cheap
+MAX_STATES = 2048
+
+# the most cells the fallback search may try; a search that runs out
+# counts as finding nothing
+SEARCH_LIMIT = 5000
+
+
+class PathTracker:
+    """A PathTracker follows the typed text across a board:
+       *  _faces are the board's upper case faces, in cell order
+       *  _rows, _cols are the size of the grid
+       *  _neighbors is the grid's neighbor table
+       *  _text is the text typed so far (upper case)
+       *  _levels holds, for each typed letter, a dictionary mapping every
+          live state (cell, used cells, letters of the face typed) to the
+          state it came from (None for the first letter)
+       *  _truncated is True once a level was cut to MAX_STATES states;
+          from then on, answers that depend on the dropped states are
+          checked with a fresh search of at most SEARCH_LIMIT steps
+       *  _searches caches the result of those searches by typed text
+       *  _letterCounts counts each letter on the board, to rule out text
+          that needs more of a letter than the board has without a search
+
+    >>> tracker = PathTracker([["Qu", "T"], ["I", "N"]])
+    >>> for char in "QUI":
+    ...     tracker.type(char)
+    >>> tracker.getText(), tracker.isLive(), tracker.isComplete()
+    ('QUI', True, True)
+    >>> tracker.type("T"); tracker.getPath()
+    [(0, 0), (1, 0), (0, 1)]
+    >>> tracker.type("Q"); tracker.isLive()
+    False
+    >>> tracker.back(); tracker.getText()
+    'QUIT'
+    """
+
+    __slots__ = ['_faces', '_rows', '_cols', '_neighbors', '_text',
+                 '_levels', '_truncated', '_searches', '_letterCounts']
+
+    def __init__(self, letters):
+        self._cols = len(letters)
+        self._rows = len(letters[0]) if self._cols else 0
+        self._faces = [face.upper() for column in letters for face in column]
+        self._neighbors = neighborTable(self._rows, self._cols)
+        self._letterCounts = Counter(''.join(self._faces))
+        self.reset()
+
+    def reset(self):
+        """
+        Clears the typed text.
+        """
+        self._text = ''
+        self._levels = []
+        self._truncated = False
+        self._searches = {}
+
+    def getText(self):
+        return self._text
+
+    def type(self, char):
+        """
+        Adds char (one letter, any case) to the typed text and moves every
+        live state on by it.
+        """
+        char = char.upper()
+        faces = self._faces
+        states = {}
+        if not self._levels:
+            for cell, face in enumerate(faces):
+                if face[0] == char:
+                    states[(cell, 1 << cell, 1)] = None
+        else:
+            neighbors = self._neighbors
+            for state in self._levels[-1]:
+                cell, used, typed = state
+                face = faces[cell]
+                if typed < len(face):
+                    if face[typed] == char:
+                        states.setdefault((cell, used, typed + 1), state)
+                    continue
+                for nextCell in neighbors[cell]:
+                    if not used >> nextCell & 1 and faces[nextCell][0] == char:
+                        states.setdefault((nextCell, used | 1 << nextCell, 1),
+                                          state)
+                if len(states) >= MAX_STATES:
+                    self._truncated = True
+                    break
+        self._text += char
+        self._levels.append(states)
+
+    def back(self):
+        """
+        Removes the last typed letter.
+        """
+        if self._levels:
+            self._levels.pop()
+            self._text = self._text[:-1]
+            if not self._levels:
+                self._truncated = False
+                self._searches = {}
+
+    def isLive(self):
+        """
+        Returns True if some path on the board spells the typed text,
+        possibly ending part way through a face.
+        """
+        if not self._levels:
+            return True
+        if self._levels[-1]:
+            return True
+        return self._truncated and self.__search(partial=True) is not None
+
+    def isComplete(self):
+        """
+        Returns True if some path on the board spells exactly the typed text.
+        """
+        return self.getPath() is not None
+
+    def getPath(self):
+        """
+        Returns a list of (col, row) positions spelling exactly the typed
+        text, or None if there is none.
+        """
+        if not self._levels:
+            return None
+        faces = self._faces
+        for state in self._levels[-1]:
+            if state[2] == len(faces[state[0]]):
+                return self.__pathTo(state)
+        if self._truncated:
+            cells = self.__search(partial=False)
+            if cells is not None:
+                return [divmod(cell, self._rows) for cell in cells]
+        return None
+
+    def __pathTo(self, state):
+        cells = []
+        for level in range(len(self._levels) - 1, -1, -1):
+            cell, used, typed = state
+            if typed == 1:
+                cells.append(cell)
+            state = self._levels[level][state]
+        cells.reverse()
+        return [divmod(cell, self._rows) for cell in cells]
+
+    def __search(self, partial):
+        """
+        Searches the board from scratch for the typed text; with partial,
+        the text may end part way through a face.
+        """
+        key = (self._text, partial)
+        if key not in self._searches:
+            self._searches[key] = self.__searchText(partial)
+        return self._searches[key]
+
+    def __searchText(self, partial):
+        needed = Counter(self._text)
+        if any(needed[char] > self._letterCounts[char] for char in needed):
+            return None
+        cells = findPath(self._faces, self._rows, self._cols, self._text,
+                         SEARCH_LIMIT)
+        if cells is not None or not partial:
+            return cells
+        for face in set(self._faces):
+            for cut in range(1, len(face)):
+                if self._text.endswith(face[:cut]):
+                    cells = findPath(self._faces, self._rows, self._cols,
+                                     self._text[:-cut] + face, SEARCH_LIMIT)
+                    if cells is not None:
+                        return cells
+        return None
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
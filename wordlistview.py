@@ -0,0 +1,113 @@
+"""
+A column of found words beside the grid that is updated one line at a time,
+so showing a new word costs the same however many words were found before.
+"""
+
+from backend import Point, Text
+from instrument import span
+
+
+class WordListView:
+    """A WordListView shows a list of words a page at a time:
+       *  _lines are the Text objects of the visible rows, top to bottom
+       *  _status is the Text below the rows naming the page shown, once
+          there is more than one page
+       *  _words are all the words added, in order
+       *  _page is the index of the page shown
+
+    Adding a word sets the text of one line.  When the page shown is full,
+    the next word turns to a new page (one redraw of every line, once per
+    page).  Earlier pages can be shown with showPage; while one is, new words
+    are only counted in the status line.
+
+    >>> from backend import GraphWin
+    >>> win = GraphWin("Boggle", 400, 400)
+    >>> view = WordListView(win, 300, 50, 130)
+    >>> view.getRows()
+    3
+    >>> for word in ["ONE", "TWO", "THREE", "FOUR"]:
+    ...     view.append(word)
+    >>> [line.getText() for line in view._lines], view._status.getText()
+    (['FOUR', '', ''], 'page 2 of 2')
+    >>> view.showPage(0); view.append("FIVE")
+    >>> [line.getText() for line in view._lines], view._status.getText()
+    (['ONE', 'TWO', 'THREE'], 'page 1 of 2')
+    >>> win.close()
+    """
+
+    __slots__ = ['_lines', '_status', '_words', '_page']
+
+    def __init__(self, win, x, top, bottom, lineHeight=20, fontSize=14):
+        rows = max(1, int((bottom - top) // lineHeight) - 1)
+        self._lines = []
+        for row in range(rows):
+            line = Text(Point(x, top + lineHeight * (row + 0.5)), "")
+            line.setSize(fontSize)
+            line.setStyle("normal")
+            line.draw(win)
+            self._lines.append(line)
+        self._status = Text(Point(x, top + lineHeight * (rows + 0.5)), "")
+        self._status.setSize(max(5, fontSize - 4))
+        self._status.setTextColor("gray")
+        self._status.draw(win)
+        self._words = []
+        self._page = 0
+
+    def getRows(self):
+        return len(self._lines)
+
+    def getPage(self):
+        return self._page
+
+    def getPageCount(self):
+        return max(1, -(-len(self._words) // len(self._lines)))
+
+    def append(self, word):
+        """
+        Adds word (str) to the end of the list and shows it, turning to a
+        new page if the last page was shown and is full.
+        """
+        with span('WordListView.append'):
+            rows = len(self._lines)
+            index = len(self._words)
+            self._words.append(word)
+            page = index // rows
+            if page == self._page:
+                self._lines[index % rows].setText(word)
+            elif page == self._page + 1 and index % rows == 0:
+                self.showPage(page)
+            elif index % rows == 0:
+                self.__showStatus()
+
+    def showPage(self, page):
+        """
+        Shows the words of page (an index, from 0), redrawing only the
+        lines that change.
+        """
+        rows = len(self._lines)
+        self._page = max(0, min(page, self.getPageCount() - 1))
+        start = self._page * rows
+        for row, line in enumerate(self._lines):
+            index = start + row
+            text = self._words[index] if index < len(self._words) else ''
+            if line.getText() != text:
+                line.setText(text)
+        self.__showStatus()
+
+    def __showStatus(self):
+        pages = self.getPageCount()
+        text = 'page {} of {}'.format(self._page + 1, pages) if pages > 1 else ''
+        if self._status.getText() != text:
+            self._status.setText(text)
+
+    def clear(self):
+        """
+        Removes every word.
+        """
+        self._words = []
+        self.showPage(0)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
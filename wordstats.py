@@ -0,0 +1,444 @@
+"""
+Monte Carlo statistics of random boards: how often each word of the lexicon
+can be spelled on a board rolled from the dice, and how total board scores
+are distributed.
+
+    python3 wordstats.py --boards 1000000 --checkpoint stats.npz --out words.csv
+    python3 wordstats.py --boards 1000000 --checkpoint stats.npz   # resume
+
+Boards are the ones batchsolver.seedBoards rolls for a range of seeds, so a
+run is reproducible and can be split into chunks of seeds solved on a
+process pool.  Each worker counts the words it finds in a NumPy array
+indexed by word id (the word's position in the sorted list of words the
+dice can spell), and the counts of all chunks are summed.  With
+--checkpoint the totals are saved every --every seconds and when the run
+ends or is interrupted; running the same command again skips the chunks
+already counted.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from batchsolver import runPool, seedBoards
+from boardsizes import getBoardSize
+from lexicon import lexiconWords
+from lexiconregistry import getLexicon
+from solverkernel import findTokenWords
+from tilealphabet import getTokenLexicon
+
+# z of a two-sided 95% confidence interval
+Z95 = 1.959964
+
+
+def spellableWords(lexicon, boardSize):
+    """
+    Returns the sorted list of words of lexicon that the dice of boardSize
+    can spell and that are long enough to score; a word's id is its index.
+
+    >>> from lexicon import Lexicon
+    >>> spellableWords(Lexicon(["QUIT", "QAT", "TIN", "AT"]), getBoardSize(4))
+    ['QUIT', 'TIN']
+    """
+    tokenLexicon = getTokenLexicon(lexicon, boardSize.getAlphabet())
+    minLength = boardSize.getMinWordLength()
+    return [word for word in lexiconWords(lexicon)
+            if len(word) >= minLength and word in tokenLexicon]
+
+
+def wilsonInterval(hits, trials, z=Z95):
+    """
+    Returns arrays (low, high) of the Wilson score interval of the
+    probability of each count in hits (an array) out of trials.
+
+    >>> low, high = wilsonInterval(np.array([0, 50]), 100)
+    >>> low.round(3).tolist(), high.round(3).tolist()
+    ([0.0, 0.404], [0.037, 0.596])
+    """
+    if trials == 0:
+        return np.zeros(len(hits)), np.ones(len(hits))
+    p = hits / trials
+    z2 = z * z
+    center = (p + z2 / (2 * trials)) / (1 + z2 / trials)
+    spread = (z / (1 + z2 / trials)) * np.sqrt(p * (1 - p) / trials
+                                               + z2 / (4 * trials * trials))
+    return np.clip(center - spread, 0, 1), np.clip(center + spread, 0, 1)
+
+
+class WordStats:
+    """WordStats are the totals of a sampling run:
+       *  _words is the list of words counted; a word's id is its index
+       *  _hits is an int64 array: _hits[id] is the number of boards the
+          word could be spelled on
+       *  _scores is an int64 array: _scores[s] is the number of boards
+          whose words scored s in total
+       *  _boardSize, _lexiconName, _startSeed and _chunkSize say which
+          boards are sampled; chunk k holds the seeds
+          _startSeed + k * _chunkSize up to (not including) the next chunk's
+       *  _counted maps the index of each chunk sampled so far to the
+          number of its seeds counted, from its first; a chunk is done once
+          all _chunkSize are, and a run of a number of boards that is not a
+          multiple of the chunk size leaves its last chunk part counted
+
+    >>> stats = WordStats(["CAT", "DOG"], 4, "words.txt", chunkSize=10)
+    >>> stats.add(0, np.array([3, 0]), np.array([0, 0, 1, 0, 9]))
+    >>> stats.getBoards(), stats.getProbabilities().tolist()
+    (10, [0.3, 0.0])
+    >>> stats.isDone(0), stats.getUncounted(1, 15)
+    (True, (10, 15))
+    >>> stats.getMeanScore(), stats.getScoreHistogram(3)
+    (3.8, ([0, 3], [1, 9]))
+    """
+
+    __slots__ = ['_words', '_hits', '_scores', '_boardSize', '_lexiconName',
+                 '_startSeed', '_chunkSize', '_counted']
+
+    def __init__(self, words, boardSize, lexiconName, startSeed=0,
+                 chunkSize=500):
+        self._words = words
+        self._hits = np.zeros(len(words), dtype=np.int64)
+        self._scores = np.zeros(1, dtype=np.int64)
+        self._boardSize = boardSize
+        self._lexiconName = lexiconName
+        self._startSeed = startSeed
+        self._chunkSize = chunkSize
+        self._counted = {}
+
+    def getWords(self):
+        return self._words
+
+    def getHits(self):
+        return self._hits
+
+    def getScoreCounts(self):
+        return self._scores
+
+    def getBoardSize(self):
+        return self._boardSize
+
+    def getLexiconName(self):
+        return self._lexiconName
+
+    def getStartSeed(self):
+        return self._startSeed
+
+    def getChunkSize(self):
+        return self._chunkSize
+
+    def getBoards(self):
+        return int(self._scores.sum())
+
+    def isDone(self, chunk):
+        return self._counted.get(chunk, 0) >= self._chunkSize
+
+    def getChunkSeeds(self, chunk):
+        """
+        Returns (start, stop) of the seeds of chunk (an index).
+        """
+        start = self._startSeed + chunk * self._chunkSize
+        return start, start + self._chunkSize
+
+    def getUncounted(self, chunk, limit):
+        """
+        Returns (start, stop) of the seeds of chunk below limit (a seed)
+        that have not been counted yet, or None if there are none.
+        """
+        start, stop = self.getChunkSeeds(chunk)
+        start += self._counted.get(chunk, 0)
+        stop = min(stop, limit)
+        return (start, stop) if start < stop else None
+
+    def add(self, chunk, hits, scores, stop=None):
+        """
+        Adds the counts of the seeds of chunk up to stop (default: the end
+        of the chunk), which follow those already counted: hits is an array
+        of word counts by id, scores an array of board counts by total
+        score.
+        """
+        self._hits += hits
+        if len(scores) > len(self._scores):
+            self._scores = np.pad(self._scores, (0, len(scores) - len(self._scores)))
+        self._scores[:len(scores)] += scores
+        start, end = self.getChunkSeeds(chunk)
+        self._counted[chunk] = (end if stop is None else stop) - start
+
+    def getProbabilities(self):
+        """
+        Returns an array of the fraction of boards each word is on.
+        """
+        boards = self.getBoards()
+        return self._hits / boards if boards else np.zeros(len(self._hits))
+
+    def getIntervals(self, z=Z95):
+        """
+        Returns arrays (low, high) bounding each word's probability (see
+        wilsonInterval).
+        """
+        return wilsonInterval(self._hits, self.getBoards(), z)
+
+    def getMeanScore(self):
+        boards = self.getBoards()
+        if not boards:
+            return 0.0
+        return float(np.arange(len(self._scores)) @ self._scores) / boards
+
+    def getScorePercentile(self, fraction):
+        """
+        Returns the total score below which fraction of the boards lie.
+        """
+        cumulative = np.cumsum(self._scores)
+        if not cumulative[-1]:
+            return 0
+        return int(np.searchsorted(cumulative, fraction * cumulative[-1]))
+
+    def getScoreHistogram(self, binWidth=10):
+        """
+        Returns (lows, counts): the lowest score of each bin of binWidth
+        scores, up to the last bin with a board in it, and the number of
+        boards in each bin.
+        """
+        bins = -(-len(self._scores) // binWidth)
+        padded = np.pad(self._scores, (0, bins * binWidth - len(self._scores)))
+        counts = padded.reshape(bins, binWidth).sum(axis=1)
+        last = int(np.flatnonzero(counts)[-1]) + 1 if counts.any() else 0
+        return ([low * binWidth for low in range(last)],
+                counts[:last].tolist())
+
+    def save(self, path):
+        """
+        Writes the totals to path (a .npz file) so a run can be resumed.
+        The file is replaced in one step, so an interrupted save leaves the
+        previous checkpoint intact.
+        """
+        temporary = path + '.tmp'
+        with open(temporary, 'wb') as f:
+            counted = sorted(self._counted.items())
+            np.savez(f, words=np.array(self._words, dtype=str), hits=self._hits,
+                     scores=self._scores,
+                     counted=np.array(counted, dtype=np.int64).reshape(-1, 2),
+                     settings=np.array([self._boardSize, self._startSeed,
+                                        self._chunkSize], dtype=np.int64),
+                     lexiconName=np.array(self._lexiconName))
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads totals written by save.
+
+        >>> import os, tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), "stats.npz")
+        >>> stats = WordStats(["CAT"], 5, "words.txt", 100, 10)
+        >>> stats.add(3, np.array([4]), np.array([6, 4]))
+        >>> stats.save(path)
+        >>> loaded = WordStats.load(path)
+        >>> loaded.getWords(), loaded.getBoards(), loaded.isDone(3), loaded.getChunkSeeds(3)
+        (['CAT'], 10, True, (130, 140))
+        >>> stats.add(4, np.array([1]), np.array([2]), stop=144); stats.save(path)
+        >>> WordStats.load(path).getUncounted(4, 150)
+        (144, 150)
+        """
+        with np.load(path) as data:
+            boardSize, startSeed, chunkSize = data['settings'].tolist()
+            stats = cls(data['words'].tolist(), boardSize,
+                        str(data['lexiconName']), startSeed, chunkSize)
+            stats._hits = data['hits'].astype(np.int64)
+            stats._scores = data['scores'].astype(np.int64)
+            stats._counted = dict(map(tuple, data['counted'].tolist()))
+        return stats
+
+
+# the compiled lexicon and word ids _sampleChunk counts with in a worker
+_workerBoardSize = None
+_workerTokens = None
+_workerIds = None
+
+
+def initWorker(lexiconName, size):
+    """
+    Compiles the lexicon for the dice of size x size boards and numbers its
+    words; runs once in each worker process.
+    """
+    global _workerBoardSize, _workerTokens, _workerIds
+    lexicon = getLexicon(lexiconName)
+    _workerBoardSize = getBoardSize(size)
+    _workerTokens = getTokenLexicon(lexicon, _workerBoardSize.getAlphabet())
+    _workerIds = {word: i for i, word in
+                  enumerate(spellableWords(lexicon, _workerBoardSize))}
+
+
+def _sampleChunk(chunk, start, stop):
+    """
+    Solves the boards of seeds start..stop-1 in a worker process and
+    returns (chunk, stop, word counts by id, board counts by total score).
+    """
+    boardSize = _workerBoardSize
+    size = boardSize.getSize()
+    getToken = boardSize.getAlphabet().getToken
+    minLength = boardSize.getMinWordLength()
+    scoreWord = boardSize.scoreWord
+    ids = _workerIds
+    hits = np.zeros(len(ids), dtype=np.int64)
+    totals = []
+    for seed, faces in seedBoards(start, stop, boardSize.getCubes()):
+        found = findTokenWords([getToken(face) for face in faces], size, size,
+                               _workerTokens, minLength=minLength)
+        # every word is found at most once per board, so the ids are unique
+        hits[[ids[word] for word in found]] += 1
+        totals.append(sum(scoreWord(word) for word in found))
+    return chunk, stop, hits, np.bincount(np.array(totals, dtype=np.int64))
+
+
+def sampleBoards(stats, boards, workers=None, checkpoint=None, every=60.0,
+                 progress=None):
+    """
+    Counts the seeds among the first boards of stats (a WordStats) that it
+    has not counted yet, chunk by chunk, adding each to stats as it
+    finishes; a chunk cut short by an earlier, smaller run is finished.  With
+    checkpoint (a path), stats are saved every every seconds and when
+    sampling ends, even by an exception or KeyboardInterrupt.  progress, if
+    given, is called with stats after each chunk.  workers=0 samples in
+    this process.  Returns stats.
+
+    >>> stats = WordStats(spellableWords(getLexicon(), getBoardSize(4)), 4,
+    ...                   "bogwords.txt", chunkSize=5)
+    >>> stats = sampleBoards(stats, 10, workers=0)
+    >>> stats.getBoards(), stats.isDone(1), bool(stats.getHits().any())
+    (10, True, True)
+
+    A run resumed with more boards counts the rest of the chunk an earlier
+    run stopped part way through:
+
+    >>> resumed = WordStats(stats.getWords(), 4, "bogwords.txt", chunkSize=5)
+    >>> resumed = sampleBoards(resumed, 7, workers=0)
+    >>> resumed.getBoards(), resumed.isDone(1)
+    (7, False)
+    >>> resumed = sampleBoards(resumed, 10, workers=0)
+    >>> resumed.getBoards(), resumed.getHits().tolist() == stats.getHits().tolist()
+    (10, True)
+    """
+    limit = stats.getStartSeed() + boards
+    chunks = []
+    for chunk in range(-(-boards // stats.getChunkSize())):
+        seeds = stats.getUncounted(chunk, limit)
+        if seeds is not None:
+            chunks.append((chunk,) + seeds)
+    lastSave = time.perf_counter()
+
+    def report(result):
+        nonlocal lastSave
+        chunk, stop, hits, scores = result
+        stats.add(chunk, hits, scores, stop)
+        if checkpoint is not None and time.perf_counter() - lastSave >= every:
+            stats.save(checkpoint)
+            lastSave = time.perf_counter()
+        if progress is not None:
+            progress(stats)
+
+    try:
+        runPool(chunks, _sampleChunk, report, workers, initWorker,
+                (stats.getLexiconName(), stats.getBoardSize()))
+        return stats
+    finally:
+        if checkpoint is not None:
+            stats.save(checkpoint)
+
+
+def writeWords(stats, f):
+    """
+    Writes one CSV line per word (word, boards, probability and its 95%
+    interval), most likely words first.
+    """
+    probabilities = stats.getProbabilities()
+    low, high = stats.getIntervals()
+    f.write("word,boards,probability,low,high\n")
+    words = stats.getWords()
+    hits = stats.getHits()
+    for i in np.argsort(-probabilities, kind='stable'):
+        f.write("{},{},{:.6g},{:.6g},{:.6g}\n".format(
+            words[i], hits[i], probabilities[i], low[i], high[i]))
+
+
+def writeSummary(stats, f, binWidth=10, top=10):
+    """
+    Writes the score distribution (mean, percentiles and a histogram) and
+    the most likely words as text.
+    """
+    boards = stats.getBoards()
+    print("{} boards; total score mean {:.2f}, median {}, 5%-95% {}-{}".format(
+        boards, stats.getMeanScore(), stats.getScorePercentile(0.5),
+        stats.getScorePercentile(0.05), stats.getScorePercentile(0.95)), file=f)
+    lows, counts = stats.getScoreHistogram(binWidth)
+    widest = max(counts, default=0)
+    for low, count in zip(lows, counts):
+        bar = '#' * round(50 * count / widest) if widest else ''
+        print("{:>5}-{:<5} {:>9} {}".format(low, low + binWidth - 1, count, bar),
+              file=f)
+    probabilities = stats.getProbabilities()
+    lowBounds, highBounds = stats.getIntervals()
+    for i in np.argsort(-probabilities, kind='stable')[:top]:
+        print("{:<16} {:.4f} ({:.4f}-{:.4f})".format(
+            stats.getWords()[i], probabilities[i], lowBounds[i], highBounds[i]),
+            file=f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--boards', type=int, required=True,
+                        help='number of boards (seeds) to sample in total')
+    parser.add_argument('--size', type=int, default=4)
+    parser.add_argument('--start-seed', type=int, default=0)
+    parser.add_argument('--chunk', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--lexicon', default='bogwords.txt')
+    parser.add_argument('--checkpoint', metavar='NPZ',
+                        help='file to save totals to and resume from')
+    parser.add_argument('--every', type=float, default=60.0,
+                        help='seconds between checkpoints')
+    parser.add_argument('--out', metavar='CSV', help='per-word probabilities')
+    parser.add_argument('--bin', type=int, default=10,
+                        help='width of the score histogram bins')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    if args.checkpoint and os.path.exists(args.checkpoint):
+        stats = WordStats.load(args.checkpoint)
+        if (stats.getBoardSize(), stats.getLexiconName()) != (args.size, args.lexicon):
+            parser.error("{} samples {}x{} boards with {}".format(
+                args.checkpoint, stats.getBoardSize(), stats.getBoardSize(),
+                stats.getLexiconName()))
+        print("resuming from {} boards".format(stats.getBoards()), file=sys.stderr)
+    else:
+        words = spellableWords(getLexicon(args.lexicon), getBoardSize(args.size))
+        stats = WordStats(words, args.size, args.lexicon, args.start_seed,
+                          args.chunk)
+
+    start = time.perf_counter()
+    startBoards = stats.getBoards()
+
+    def progress(stats):
+        seconds = time.perf_counter() - start
+        print("\r{} boards ({:.0f} boards/s)".format(
+            stats.getBoards(), (stats.getBoards() - startBoards) / seconds),
+            end='', file=sys.stderr)
+
+    try:
+        sampleBoards(stats, args.boards, args.workers, args.checkpoint,
+                     args.every, progress)
+    except KeyboardInterrupt:
+        print("\ninterrupted; run again to resume" if args.checkpoint
+              else "\ninterrupted", file=sys.stderr)
+        return 1
+    print(file=sys.stderr)
+    writeSummary(stats, sys.stdout, args.bin, args.top)
+    if args.out:
+        with open(args.out, 'w') as f:
+            writeWords(stats, f)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())